@@ -9,7 +9,7 @@ import sys
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
 from app.core.database import Base
-from app.models import User, Team, Invitation, ActivityLog
+from app.models import User, Team, Invitation, ActivityLog, ActivityDailyRollup, EmailOutbox
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
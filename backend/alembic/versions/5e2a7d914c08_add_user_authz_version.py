@@ -0,0 +1,25 @@
+"""Add user authz version
+
+Revision ID: 5e2a7d914c08
+Revises: 3b1f6c2a9d47
+Create Date: 2026-10-17 14:03:27.551960
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5e2a7d914c08'
+down_revision = '3b1f6c2a9d47'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('users', sa.Column('authz_version', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('users') as batch_op:
+        batch_op.drop_column('authz_version')
@@ -0,0 +1,32 @@
+"""Add team hot path indexes
+
+Revision ID: 9c4e81b27f3a
+Revises: 5e2a7d914c08
+Create Date: 2026-10-17 18:52:06.114382
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9c4e81b27f3a'
+down_revision = '5e2a7d914c08'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_invitations_team_id_pending', 'invitations', ['team_id', 'expires_at'], unique=False,
+        sqlite_where=sa.text('is_used = 0'),
+        postgresql_where=sa.text('is_used = false')
+    )
+    op.create_index('ix_users_team_id_is_active', 'users', ['team_id', 'is_active'], unique=False)
+    op.create_index('ix_users_team_id_role_is_active', 'users', ['team_id', 'role', 'is_active'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_users_team_id_role_is_active', table_name='users')
+    op.drop_index('ix_users_team_id_is_active', table_name='users')
+    op.drop_index('ix_invitations_team_id_pending', table_name='invitations')
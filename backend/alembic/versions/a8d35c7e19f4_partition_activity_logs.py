@@ -0,0 +1,98 @@
+"""Partition activity logs and add daily rollups
+
+Revision ID: a8d35c7e19f4
+Revises: e41a5c8d2b76
+Create Date: 2026-10-17 21:12:40.318227
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a8d35c7e19f4'
+down_revision = 'e41a5c8d2b76'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('activity_daily_rollups',
+    sa.Column('team_id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('action', sa.String(length=100), nullable=False),
+    sa.Column('event_count', sa.Integer(), server_default='0', nullable=False),
+    sa.ForeignKeyConstraint(['team_id'], ['teams.id'], ),
+    sa.PrimaryKeyConstraint('team_id', 'day', 'action')
+    )
+    
+    # Raw events move to monthly partitions (activity_logs_YYYYMM), created on
+    # demand by app.services.activity_store with the same definition as below.
+    # On Postgres they are native partitions of activity_logs, which becomes a
+    # range-partitioned table; on SQLite they are plain tables and
+    # activity_logs is left empty.
+    bind = op.get_bind()
+    if bind.dialect.name == 'postgresql':
+        op.rename_table('activity_logs', 'activity_logs_legacy')
+        op.execute(
+            "CREATE TABLE activity_logs (LIKE activity_logs_legacy INCLUDING DEFAULTS) "
+            "PARTITION BY RANGE (created_at)"
+        )
+        op.execute("ALTER TABLE activity_logs ALTER COLUMN created_at SET NOT NULL")
+        # The partition key has to be part of the primary key
+        op.execute("ALTER TABLE activity_logs ADD PRIMARY KEY (id, created_at)")
+        op.execute("CREATE INDEX ix_activity_logs_team_id_created_at ON activity_logs (team_id, created_at)")
+        op.execute("ALTER SEQUENCE activity_logs_id_seq OWNED BY activity_logs.id")
+        months = bind.execute(sa.text(
+            "SELECT DISTINCT to_char(created_at, 'YYYYMM') FROM activity_logs_legacy WHERE created_at IS NOT NULL"
+        )).scalars().all()
+    else:
+        months = bind.execute(sa.text(
+            "SELECT DISTINCT strftime('%Y%m', created_at) FROM activity_logs WHERE created_at IS NOT NULL"
+        )).scalars().all()
+    
+    for month in months:
+        year, number = int(month[:4]), int(month[4:])
+        start = f"{year:04d}-{number:02d}-01"
+        end = f"{year + number // 12:04d}-{number % 12 + 1:02d}-01"
+        name = f"activity_logs_{month}"
+        if bind.dialect.name == 'postgresql':
+            op.execute(f"CREATE TABLE {name} PARTITION OF activity_logs FOR VALUES FROM ('{start}') TO ('{end}')")
+            op.execute(
+                f"INSERT INTO activity_logs SELECT * FROM activity_logs_legacy "
+                f"WHERE created_at >= '{start}' AND created_at < '{end}'"
+            )
+        else:
+            op.execute(
+                f"CREATE TABLE {name} ("
+                "id INTEGER NOT NULL, user_id INTEGER, team_id INTEGER, action VARCHAR(100) NOT NULL, "
+                "details TEXT, ip_address VARCHAR(45), user_agent TEXT, "
+                "created_at DATETIME DEFAULT (CURRENT_TIMESTAMP) NOT NULL, PRIMARY KEY (id))"
+            )
+            op.execute(f"CREATE INDEX ix_{name}_team_id_created_at ON {name} (team_id, created_at)")
+            op.execute(
+                f"INSERT INTO {name} (id, user_id, team_id, action, details, ip_address, user_agent, created_at) "
+                f"SELECT id, user_id, team_id, action, details, ip_address, user_agent, created_at "
+                f"FROM activity_logs WHERE strftime('%Y%m', created_at) = '{month}'"
+            )
+    
+    # Seed the rollups from the events written so far
+    source, day = (
+        ('activity_logs_legacy', 'CAST(created_at AS DATE)') if bind.dialect.name == 'postgresql'
+        else ('activity_logs', 'date(created_at)')
+    )
+    op.execute(
+        f"INSERT INTO activity_daily_rollups (team_id, day, action, event_count) "
+        f"SELECT team_id, {day}, action, count(*) FROM {source} "
+        f"WHERE team_id IS NOT NULL AND created_at IS NOT NULL GROUP BY team_id, {day}, action"
+    )
+    
+    if bind.dialect.name == 'postgresql':
+        op.drop_table('activity_logs_legacy')
+    else:
+        op.execute("DELETE FROM activity_logs WHERE created_at IS NOT NULL")
+
+
+def downgrade() -> None:
+    # Partitions are not folded back into activity_logs; drop them separately if needed
+    op.drop_table('activity_daily_rollups')
\ No newline at end of file
@@ -0,0 +1,39 @@
+"""Add keyset columns to team indexes
+
+Revision ID: b7d2f0a61e95
+Revises: 9c4e81b27f3a
+Create Date: 2026-10-17 19:20:41.672093
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7d2f0a61e95'
+down_revision = '9c4e81b27f3a'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Append id so paginated listings read pages in index order without a sort
+    op.drop_index('ix_users_team_id_is_active', table_name='users')
+    op.create_index('ix_users_team_id_is_active', 'users', ['team_id', 'is_active', 'id'], unique=False)
+    op.drop_index('ix_invitations_team_id_pending', table_name='invitations')
+    op.create_index(
+        'ix_invitations_team_id_pending', 'invitations', ['team_id', 'expires_at', 'id'], unique=False,
+        sqlite_where=sa.text('is_used = 0'),
+        postgresql_where=sa.text('is_used = false')
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_invitations_team_id_pending', table_name='invitations')
+    op.create_index(
+        'ix_invitations_team_id_pending', 'invitations', ['team_id', 'expires_at'], unique=False,
+        sqlite_where=sa.text('is_used = 0'),
+        postgresql_where=sa.text('is_used = false')
+    )
+    op.drop_index('ix_users_team_id_is_active', table_name='users')
+    op.create_index('ix_users_team_id_is_active', 'users', ['team_id', 'is_active'], unique=False)
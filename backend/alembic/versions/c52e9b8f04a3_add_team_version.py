@@ -0,0 +1,25 @@
+"""Add team version
+
+Revision ID: c52e9b8f04a3
+Revises: a8d35c7e19f4
+Create Date: 2026-10-17 22:31:06.742918
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c52e9b8f04a3'
+down_revision = 'a8d35c7e19f4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('teams', sa.Column('version', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('teams') as batch_op:
+        batch_op.drop_column('version')
\ No newline at end of file
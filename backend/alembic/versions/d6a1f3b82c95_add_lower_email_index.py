@@ -0,0 +1,24 @@
+"""Add lower email index
+
+Revision ID: d6a1f3b82c95
+Revises: c52e9b8f04a3
+Create Date: 2026-10-18 10:12:44.381206
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd6a1f3b82c95'
+down_revision = 'c52e9b8f04a3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_users_email_lower', 'users', [sa.text('lower(email)')], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_users_email_lower', table_name='users')
@@ -0,0 +1,36 @@
+"""Add team counters
+
+Revision ID: e41a5c8d2b76
+Revises: b7d2f0a61e95
+Create Date: 2026-10-17 19:48:15.903517
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e41a5c8d2b76'
+down_revision = 'b7d2f0a61e95'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('teams', sa.Column('member_count', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('teams', sa.Column('admin_count', sa.Integer(), server_default='0', nullable=False))
+    
+    # Backfill from the current rows
+    op.execute(
+        "UPDATE teams SET "
+        "member_count = (SELECT count(*) FROM users "
+        "WHERE users.team_id = teams.id AND users.is_active = true), "
+        "admin_count = (SELECT count(*) FROM users "
+        "WHERE users.team_id = teams.id AND users.role = 'admin' AND users.is_active = true)"
+    )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('teams') as batch_op:
+        batch_op.drop_column('admin_count')
+        batch_op.drop_column('member_count')
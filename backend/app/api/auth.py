@@ -1,11 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import ORJSONResponse
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime, timedelta
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db, replica_router
 from app.core.security import (
-    verify_password, 
-    get_password_hash, 
+    verify_password_async, 
+    get_password_hash_async, 
     create_access_token, 
     create_refresh_token,
     verify_token
@@ -13,17 +15,34 @@ from app.core.security import (
 from app.models.user import User
 from app.models.team import Team
 from app.schemas.auth import Token, UserLogin, UserRegister
-from app.schemas.user import UserResponse
+from app.schemas.user import UserResponse, user_read
 from app.api.deps import get_current_user
+from app.core.user_cache import CachedUser
+from app.core.admission import password_admission
+from app.services.activity import activity_log
 from app.core.config import settings
+from app.core.sql_stats import query_budget
 
 router = APIRouter()
 
 
+def access_token_claims(user: User) -> dict:
+    """Claims that let deps.py authorize requests without reading the user row"""
+    return {
+        "sub": str(user.id),
+        "email": user.email,
+        "role": user.role,
+        "team_id": user.team_id,
+        "av": user.authz_version or 0
+    }
+
+
 @router.post("/register", response_model=dict)
-async def register(user_data: UserRegister, db: Session = Depends(get_db)):
+async def register(user_data: UserRegister, request: Request, db: AsyncSession = Depends(get_db)):
+    password_admission.admit(request, user_data.email)
+    
     # Check if user already exists
-    existing_user = db.query(User).filter(User.email == user_data.email).first()
+    existing_user = await db.scalar(select(User).where(User.email == user_data.email))
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -31,7 +50,7 @@ async def register(user_data: UserRegister, db: Session = Depends(get_db)):
         )
     
     # Check if this is the first user in the system
-    user_count = db.query(User).count()
+    user_count = await db.scalar(select(func.count()).select_from(User))
     
     if user_count == 0:
         # First user creates a new team and becomes admin
@@ -40,11 +59,11 @@ async def register(user_data: UserRegister, db: Session = Depends(get_db)):
             created_by=1  # We'll update this after creating the user
         )
         db.add(team)
-        db.commit()
-        db.refresh(team)
+        await db.commit()
+        await db.refresh(team)
         
         # Create new user as admin
-        hashed_password = get_password_hash(user_data.password)
+        hashed_password = await get_password_hash_async(user_data.password)
         db_user = User(
             email=user_data.email,
             password_hash=hashed_password,
@@ -55,12 +74,16 @@ async def register(user_data: UserRegister, db: Session = Depends(get_db)):
         )
         
         db.add(db_user)
-        db.commit()
-        db.refresh(db_user)
+        await db.commit()
+        await db.refresh(db_user)
         
         # Update team created_by to the actual user ID
         team.created_by = db_user.id
-        db.commit()
+        team.member_count = 1
+        team.admin_count = 1
+        await db.commit()
+        replica_router.mark_write(db_user.id)
+        activity_log.log("auth.register", request, user_id=db_user.id, team_id=team.id)
     else:
         # Regular users can only join via invitation
         raise HTTPException(
@@ -71,7 +94,7 @@ async def register(user_data: UserRegister, db: Session = Depends(get_db)):
     # Create tokens
     access_token_expires = timedelta(minutes=settings.access_token_expire_minutes)
     access_token = create_access_token(
-        data={"sub": str(db_user.id), "email": db_user.email, "role": db_user.role},
+        data=access_token_claims(db_user),
         expires_delta=access_token_expires
     )
     refresh_token = create_refresh_token(
@@ -88,10 +111,19 @@ async def register(user_data: UserRegister, db: Session = Depends(get_db)):
 
 
 @router.post("/login", response_model=dict)
-async def login(user_data: UserLogin, db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.email == user_data.email).first()
+async def login(user_data: UserLogin, request: Request, db: AsyncSession = Depends(get_db)):
+    password_admission.admit(request, user_data.email)
     
-    if not user or not verify_password(user_data.password, user.password_hash):
+    user = await db.scalar(select(User).where(User.email == user_data.email))
+    
+    if not user or not await verify_password_async(user_data.password, user.password_hash):
+        activity_log.log(
+            "auth.login_failed",
+            request,
+            user_id=user.id if user else None,
+            team_id=user.team_id if user else None,
+            details={"email": user_data.email}
+        )
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -106,12 +138,13 @@ async def login(user_data: UserLogin, db: Session = Depends(get_db)):
     
     # Update last login
     user.last_login = datetime.utcnow()
-    db.commit()
+    await db.commit()
+    activity_log.log("auth.login", request, user_id=user.id, team_id=user.team_id)
     
     # Create tokens
     access_token_expires = timedelta(minutes=settings.access_token_expire_minutes)
     access_token = create_access_token(
-        data={"sub": str(user.id), "email": user.email, "role": user.role},
+        data=access_token_claims(user),
         expires_delta=access_token_expires
     )
     refresh_token = create_refresh_token(
@@ -128,7 +161,7 @@ async def login(user_data: UserLogin, db: Session = Depends(get_db)):
 
 
 @router.post("/refresh", response_model=dict)
-async def refresh_token(refresh_token: str, db: Session = Depends(get_db)):
+async def refresh_token(refresh_token: str, db: AsyncSession = Depends(get_db)):
     try:
         payload = verify_token(refresh_token, "refresh")
         user_id = payload.get("sub")
@@ -138,7 +171,7 @@ async def refresh_token(refresh_token: str, db: Session = Depends(get_db)):
                 detail="Invalid refresh token"
             )
         
-        user = db.query(User).filter(User.id == int(user_id)).first()
+        user = await db.get(User, int(user_id))
         if not user or not user.is_active:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -148,7 +181,7 @@ async def refresh_token(refresh_token: str, db: Session = Depends(get_db)):
         # Create new access token
         access_token_expires = timedelta(minutes=settings.access_token_expire_minutes)
         access_token = create_access_token(
-            data={"sub": str(user.id), "email": user.email, "role": user.role},
+            data=access_token_claims(user),
             expires_delta=access_token_expires
         )
         
@@ -165,9 +198,15 @@ async def refresh_token(refresh_token: str, db: Session = Depends(get_db)):
         )
 
 
-@router.get("/me", response_model=UserResponse)
-async def get_current_user_info(current_user: User = Depends(get_current_user)):
-    return UserResponse.model_validate(current_user)
+@router.get("/me", response_model=UserResponse, dependencies=[Depends(query_budget(3))])
+async def get_current_user_info(current_user: CachedUser = Depends(get_current_user), db: AsyncSession = Depends(get_read_db)):
+    user = await db.get(User, current_user.id)
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User not found or inactive"
+        )
+    return ORJSONResponse(user_read(user))
 
 
 @router.post("/logout")
@@ -0,0 +1,34 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import PlainTextResponse
+from app.api.deps import get_current_admin_user
+from app.core.user_cache import CachedUser
+from app.core.profiling import profile_store
+
+router = APIRouter()
+
+
+@router.get("/profiles")
+async def list_profiles(current_user: CachedUser = Depends(get_current_admin_user)):
+    """Recently stored request profiles, newest first (Admin only)"""
+    return {"profiles": profile_store.list()}
+
+
+@router.get("/profiles/{profile_id}")
+async def download_profile(profile_id: str, current_user: CachedUser = Depends(get_current_admin_user)):
+    """Download a profile (Admin only).
+
+    cpu profiles are collapsed stacks (open in speedscope or flamegraph.pl);
+    memory profiles are a tracemalloc report.
+    """
+    
+    profile = profile_store.get(profile_id)
+    if profile is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Profile not found"
+        )
+    
+    return PlainTextResponse(
+        profile["body"],
+        headers={"Content-Disposition": f'attachment; filename="{profile["filename"]}"'}
+    )
\ No newline at end of file
@@ -1,51 +1,96 @@
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPBearer
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from jose import JWTError, jwt
 from app.core.database import get_db
 from app.core.config import settings
 from app.core.security import verify_token
+from app.core.user_cache import CachedUser, user_cache
+from app.core.authz import authz_versions
+from app.services.activity import activity_log
 from app.models.user import User
 from typing import Optional
 
 security = HTTPBearer()
 
 
-async def get_current_user(token: str = Depends(security), db: Session = Depends(get_db)) -> User:
+async def get_current_user(
+    request: Request,
+    token: str = Depends(security),
+    db: AsyncSession = Depends(get_db)
+) -> CachedUser:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+    stale_token_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Token is out of date, please refresh",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
     
     try:
         payload = verify_token(token.credentials)
         user_id: str = payload.get("sub")
         if user_id is None:
             raise credentials_exception
+    except HTTPException as e:
+        # verify_token reports bad signatures, wrong types and expiry this way
+        activity_log.log("auth.token_rejected", request, details={"reason": e.detail})
+        raise
     except JWTError:
+        activity_log.log("auth.token_rejected", request, details={"reason": "invalid"})
         raise credentials_exception
     
-    user = db.query(User).filter(User.id == int(user_id)).first()
+    user_id = int(user_id)
+    request.state.user_id = user_id  # read-replica routing keys on it
+    token_version = payload.get("av")
+    known_version = authz_versions.get(user_id)
+    
+    # Authorize from claims alone when the token carries the current authz version
+    if token_version is not None and known_version is not None:
+        if token_version < known_version:
+            activity_log.log("auth.token_rejected", request, user_id=user_id, details={"reason": "stale"})
+            raise stale_token_exception
+        if token_version == known_version:
+            return CachedUser(
+                id=user_id,
+                role=payload.get("role"),
+                team_id=payload.get("team_id"),
+                is_active=True,
+                authz_version=token_version
+            )
+    
+    user = user_cache.get(user_id)
     if user is None:
-        raise credentials_exception
+        db_user = await db.get(User, user_id)
+        if db_user is None:
+            raise credentials_exception
+        user = user_cache.put(db_user)
+    authz_versions.observe(user.id, user.authz_version)
     
     if not user.is_active:
+        activity_log.log("auth.token_rejected", request, user_id=user.id, details={"reason": "inactive"})
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Inactive user"
         )
     
+    if token_version is not None and token_version < user.authz_version:
+        activity_log.log("auth.token_rejected", request, user_id=user.id, details={"reason": "stale"})
+        raise stale_token_exception
+    
     return user
 
 
-async def get_current_active_user(current_user: User = Depends(get_current_user)) -> User:
+async def get_current_active_user(current_user: CachedUser = Depends(get_current_user)) -> CachedUser:
     if not current_user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
     return current_user
 
 
-async def get_current_admin_user(current_user: User = Depends(get_current_user)) -> User:
+async def get_current_admin_user(current_user: CachedUser = Depends(get_current_user)) -> CachedUser:
     if current_user.role != "admin":
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -56,8 +101,8 @@ async def get_current_admin_user(current_user: User = Depends(get_current_user))
 
 async def get_team_member(
     team_id: int,
-    current_user: User = Depends(get_current_user)
-) -> User:
+    current_user: CachedUser = Depends(get_current_user)
+) -> CachedUser:
     if current_user.team_id != team_id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -68,8 +113,8 @@ async def get_team_member(
 
 async def get_team_admin(
     team_id: int,
-    current_user: User = Depends(get_current_user)
-) -> User:
+    current_user: CachedUser = Depends(get_current_user)
+) -> CachedUser:
     if current_user.team_id != team_id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
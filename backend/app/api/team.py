@@ -1,31 +1,316 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from datetime import datetime, timedelta
-from typing import List
-from app.core.database import get_db
-from app.core.security import create_invitation_token, verify_invitation_token, get_password_hash
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status, File, Form, UploadFile
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
+from sqlalchemy import func, insert, literal, null, select, true, tuple_, type_coerce, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+from pydantic.networks import validate_email
+from pydantic_core import PydanticCustomError
+from datetime import date, datetime, timedelta, timezone
+from typing import List, Optional, Tuple
+import asyncio
+import base64
+import csv
+import io
+import json
+from app.core.database import get_db, get_read_db, replica_router
+from app.core.security import create_invitation_token, verify_invitation_token, get_password_hash_async
 from app.models.user import User
 from app.models.team import Team
 from app.models.invitation import Invitation
-from app.schemas.invitation import InvitationCreate, InvitationResponse, AcceptInvitation
-from app.schemas.user import UserResponse
+from app.models.activity_rollup import ActivityDailyRollup
+from app.schemas.invitation import (
+    InvitationCreate,
+    InvitationResponse,
+    InvitationPage,
+    invitation_read,
+    AcceptInvitation,
+    BulkInvitationItem,
+    BulkInvitationCreate,
+    BulkInvitationResult,
+    BulkInvitationResponse
+)
+from app.schemas.user import UserResponse, UserPage, user_read
+from app.schemas.activity import ActivitySummaryItem, ActivitySummaryPage, ActivityEventResponse, ActivityEventPage
 from app.api.deps import get_current_user, get_current_admin_user
-from app.services.email import email_service
+from app.core.user_cache import CachedUser, user_cache
+from app.core.authz import authz_versions
+from app.core.admission import password_admission
+from app.services.outbox import enqueue_email, enqueue_emails, outbox_dispatcher
+from app.services.team_counters import adjust_team_counters, bump_team_version, release_admin
+from app.services.activity import activity_log
+from app.services.activity_store import partition_exists, partition_table
+from app.services.team_events import RESET_EVENT, team_events
+from app.services.roster_export import EXPORT_FORMATS, encode_export, gzip_chunks, stream_rows
 from app.core.config import settings
+from app.core.sql_stats import query_budget
 
 router = APIRouter()
 
 
-@router.post("/invite", response_model=InvitationResponse)
+# Hot-path queries, shared with the EXPLAIN QUERY PLAN check in app.core.query_plans
+
+def pending_invitations_query(team_id: int, now: datetime = None):
+    """Unused, unexpired invitations of a team (ix_invitations_team_id_pending)"""
+    return select(Invitation).where(
+        Invitation.team_id == team_id,
+        Invitation.is_used == False,
+        Invitation.expires_at > (now or datetime.utcnow())
+    )
+
+
+def active_members_query(team_id: int):
+    """Active members of a team (ix_users_team_id_is_active)"""
+    return select(User).where(
+        User.team_id == team_id,
+        User.is_active == True
+    )
+
+
+# Keyset pagination: members are ordered by id, invitations by (expires_at, id),
+# matching the trailing columns of their indexes so each page is an index range
+# read. Cursors are opaque base64url-encoded keys of the last row returned.
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+def encode_cursor(key: list) -> str:
+    return base64.urlsafe_b64encode(json.dumps(key, separators=(",", ":")).encode()).decode().rstrip("=")
+
+
+# What follows the kind tag in each cursor: member id; invitation (expires_at, id);
+# activity rollup (day, action); activity event (created_at, id)
+CURSOR_FIELDS = {
+    "m": (int,),
+    "i": (datetime.fromisoformat, int),
+    "r": (date.fromisoformat, str),
+    "e": (datetime.fromisoformat, int),
+}
+
+
+def decode_cursor(cursor: str, *kinds: str) -> list:
+    """Decode a cursor issued by a listing of one of `kinds`, or fail with 400.
+
+    Timestamps must be naive UTC like the columns they are compared with.
+    """
+    try:
+        key = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if not isinstance(key, list) or not key or key[0] not in kinds or len(key) != len(CURSOR_FIELDS[key[0]]) + 1:
+            raise ValueError
+        for parse, value in zip(CURSOR_FIELDS[key[0]], key[1:]):
+            if isinstance(value, bool) or not isinstance(value, int if parse is int else str):
+                raise ValueError
+            if getattr(parse(value), "tzinfo", None) is not None:
+                raise ValueError
+    except (TypeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+    return key
+
+
+def _naive_utc(value: datetime) -> datetime:
+    """Timezone-aware values (Postgres timestamptz columns) still yield naive-UTC cursor keys"""
+    return value.astimezone(timezone.utc).replace(tzinfo=None) if value.tzinfo else value
+
+
+def _member_key(member: User) -> list:
+    return ["m", member.id]
+
+
+def _invitation_key(invitation: Invitation) -> list:
+    return ["i", _naive_utc(invitation.expires_at).isoformat(), invitation.id]
+
+
+def members_page_query(team_id: int, key: list = None):
+    """Active members after cursor `key`, in index order"""
+    query = active_members_query(team_id).order_by(User.id)
+    if key is not None and len(key) > 1:
+        try:
+            query = query.where(User.id > int(key[1]))
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+    return query
+
+
+def pending_invitations_page_query(team_id: int, key: list = None, now: datetime = None):
+    """Pending invitations after cursor `key`, in index order"""
+    now = now or datetime.utcnow()
+    after = None
+    if key is not None and len(key) > 1:
+        try:
+            after = (datetime.fromisoformat(key[1]), int(key[2]))
+        except (IndexError, TypeError, ValueError):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+    
+    if after is None or after[0] <= now:
+        query = pending_invitations_query(team_id, now)
+    else:
+        # A future cursor already implies expires_at > now. Keeping it as the only
+        # bound on expires_at lets SQLite seek straight to the cursor; with both
+        # bounds it seeks to `now` and scans every earlier page.
+        query = select(Invitation).where(
+            Invitation.team_id == team_id,
+            Invitation.is_used == False,
+            tuple_(Invitation.expires_at, Invitation.id) > tuple_(*after)
+        )
+    return query.order_by(Invitation.expires_at, Invitation.id)
+
+
+# Conditional GET: the listings change only when the team version is bumped or
+# the soonest pending invitation expires, so one cheap lookup of both yields an
+# ETag and unchanged polls get a 304 before any listing query runs. Logins do
+# not bump the version, or every teammate's login would invalidate everyone's
+# cached pages; the ETag is weak because a cached page's last_login may lag.
+LISTING_CACHE_CONTROL = "private, no-cache"  # clients may keep the body but must revalidate
+
+
+def listing_version_query(team_id: int, now: datetime = None):
+    """Team version and next pending-invitation expiry (ix_invitations_team_id_pending)"""
+    next_expiry = select(func.min(Invitation.expires_at)).where(
+        Invitation.team_id == team_id,
+        Invitation.is_used == False,
+        Invitation.expires_at > (now or datetime.utcnow())
+    ).scalar_subquery()
+    return select(Team.version, next_expiry).where(Team.id == team_id)
+
+
+async def _listing_etag(db: AsyncSession, team_id: int) -> str:
+    row = (await db.execute(listing_version_query(team_id))).first()
+    version, next_expiry = row if row is not None else (0, None)
+    return f'W/"{team_id}-{version}-{next_expiry.strftime("%Y%m%d%H%M%S%f") if next_expiry else 0}"'
+
+
+def _not_modified(request: Request, etag: str) -> Optional[Response]:
+    """A 304 response when If-None-Match already names `etag` (weak comparison)"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return None
+    opaque = etag.removeprefix("W/")
+    if header.strip() != "*" and opaque not in (candidate.strip().removeprefix("W/") for candidate in header.split(",")):
+        return None
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag, "Cache-Control": LISTING_CACHE_CONTROL})
+
+
+def _listing_headers(etag: str) -> dict:
+    return {"ETag": etag, "Cache-Control": LISTING_CACHE_CONTROL}
+
+
+async def _fetch_page(db: AsyncSession, query, limit: int, key_of) -> Tuple[list, Optional[list]]:
+    """Read one page plus a look-ahead row; returns (rows, key of the last row or None)"""
+    rows = (await db.scalars(query.limit(limit + 1))).all()
+    if len(rows) > limit:
+        return rows[:limit], key_of(rows[limit - 1])
+    return rows, None
+
+
+MEMBER_ROW, INVITATION_ROW = 0, 1
+
+
+def members_with_invitations_query(team_id: int, key: list = None, limit: int = DEFAULT_PAGE_SIZE, now: datetime = None):
+    """One page of members then invitations, plus team totals, in a single statement.
+
+    Each branch projects only the columns the listing returns and reads at most
+    `limit + 1` rows from its index; the totals (the team's member counter and
+    an indexed count of pending invitations) are outer-joined so they come back
+    even when the page itself is empty.
+    """
+    now = now or datetime.utcnow()
+    branches = []
+    if key is None or key[0] == "m":
+        branches.append(members_page_query(team_id, key).with_only_columns(
+            literal(MEMBER_ROW).label("kind"),
+            User.id,
+            User.email,
+            User.first_name,
+            User.last_name,
+            User.role,
+            User.created_at,
+            type_coerce(null(), Invitation.expires_at.type).label("expires_at")
+        ).limit(limit + 1).subquery())
+    branches.append(pending_invitations_page_query(
+        team_id, key if key is not None and key[0] == "i" else None, now
+    ).with_only_columns(
+        literal(INVITATION_ROW).label("kind"),
+        Invitation.id,
+        Invitation.email,
+        type_coerce(null(), User.first_name.type).label("first_name"),
+        type_coerce(null(), User.last_name.type).label("last_name"),
+        Invitation.role,
+        Invitation.created_at,
+        Invitation.expires_at
+    ).limit(limit + 1).subquery())
+    
+    page = union_all(*(select(branch) for branch in branches)).subquery("page")
+    # Members only change through counted writes, but invitations also lapse by
+    # themselves, so the pending total is counted from the partial index
+    pending_total = pending_invitations_query(team_id, now).with_only_columns(func.count()).scalar_subquery()
+    totals = select(
+        Team.member_count.label("total_members"),
+        pending_total.label("pending_invitations")
+    ).where(Team.id == team_id).subquery("totals")
+    
+    return (
+        select(totals, page)
+        .select_from(totals.outerjoin(page, true()))
+        .order_by(page.c.kind, page.c.expires_at, page.c.id)
+        .limit(limit + 1)
+    )
+
+
+def listing_items(rows) -> List[dict]:
+    """Format members_with_invitations_query rows as JSON-ready listing entries"""
+    # Rows are plain tuples; an empty page is a single row of NULLs next to the totals
+    result = []
+    for _, _, kind, id, email, first_name, last_name, role, created_at, expires_at in rows:
+        if kind is None:
+            break
+        if kind == MEMBER_ROW:
+            result.append({
+                "id": id,
+                "email": email,
+                "first_name": first_name,
+                "last_name": last_name,
+                "role": role,
+                "status": "active",
+                "type": "member",
+                "joined_at": created_at.isoformat() if created_at else None,
+                "invitation_id": None
+            })
+        else:
+            result.append({
+                "id": None,
+                "email": email,
+                "first_name": None,
+                "last_name": None,
+                "role": role,
+                "status": "pending",
+                "type": "invitation",
+                "joined_at": None,
+                "invitation_id": id,
+                "invited_at": created_at.isoformat() if created_at else None,
+                "expires_at": expires_at.isoformat()
+            })
+    return result
+
+
+def invitation_link(token: str) -> str:
+    """Accept link sent in invitation emails"""
+    return f"{settings.frontend_url.rstrip('/')}/auth/accept-invitation/{token}"
+
+
+@router.post("/invite", response_model=InvitationResponse, dependencies=[Depends(query_budget(10))])
 async def invite_member(
     invitation_data: InvitationCreate,
-    current_user: User = Depends(get_current_admin_user),
-    db: Session = Depends(get_db)
+    request: Request,
+    current_user: CachedUser = Depends(get_current_admin_user),
+    db: AsyncSession = Depends(get_db)
 ):
     """Send a team invitation (Admin only)"""
     
     # Check if user already exists
-    existing_user = db.query(User).filter(User.email == invitation_data.email).first()
+    # Same mailbox whatever the case, as in the bulk path
+    folded_email = invitation_data.email.lower()
+    existing_user = await db.scalar(select(User).where(func.lower(User.email) == folded_email))
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -33,12 +318,11 @@ async def invite_member(
         )
     
     # Check if invitation already exists and is not expired
-    existing_invitation = db.query(Invitation).filter(
-        Invitation.email == invitation_data.email,
-        Invitation.team_id == invitation_data.team_id,
-        Invitation.is_used == False,
-        Invitation.expires_at > datetime.utcnow()
-    ).first()
+    existing_invitation = await db.scalar(
+        pending_invitations_query(invitation_data.team_id)
+        .where(func.lower(Invitation.email) == folded_email)
+        .limit(1)
+    )
     
     if existing_invitation:
         raise HTTPException(
@@ -47,7 +331,7 @@ async def invite_member(
         )
     
     # Get team information
-    team = db.query(Team).filter(Team.id == invitation_data.team_id).first()
+    team = await db.get(Team, invitation_data.team_id)
     if not team:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -72,56 +356,304 @@ async def invite_member(
     )
     
     db.add(db_invitation)
-    db.commit()
-    db.refresh(db_invitation)
+    await db.flush()
     
-    # Create invitation link
-    frontend_url = "http://localhost:3000"  # You can make this configurable
-    invitation_link = f"{frontend_url}/auth/accept-invitation/{invitation_token}"
+    inviter = await db.get(User, current_user.id)
     
-    # Send email invitation
-    try:
-        email_sent, message = await email_service.send_team_invitation(
-            to_email=invitation_data.email,
-            inviter_name=f"{current_user.first_name} {current_user.last_name}",
-            team_name=team.name,
-            invitation_link=invitation_link,
-            role=invitation_data.role
+    # Queue the invitation email in the same transaction; outbox workers deliver it
+    enqueue_email(
+        db,
+        kind="team_invitation",
+        to_email=invitation_data.email,
+        payload={
+            "to_email": invitation_data.email,
+            "sister_name": f"{inviter.first_name} {inviter.last_name}",
+            "team_name": team.name,
+            "invitation_link": invitation_link(invitation_token)
+        },
+        invitation_id=db_invitation.id
+    )
+    await bump_team_version(db, invitation_data.team_id)
+    
+    await db.commit()
+    await db.refresh(db_invitation)
+    outbox_dispatcher.notify()
+    activity_log.log(
+        "team.invite",
+        request,
+        user_id=current_user.id,
+        team_id=invitation_data.team_id,
+        details={"invitation_id": db_invitation.id, "email": invitation_data.email, "role": invitation_data.role}
+    )
+    await team_events.publish(invitation_data.team_id, "invitation.created", {
+        "invitation_id": db_invitation.id,
+        "email": db_invitation.email,
+        "role": db_invitation.role,
+        "expires_at": db_invitation.expires_at
+    })
+    
+    return InvitationResponse.model_validate(db_invitation)
+
+
+# Keeps IN (...) lists under SQLite's bound-parameter limit
+BULK_QUERY_CHUNK_SIZE = 500
+
+
+def _chunks(items: list, size: int = BULK_QUERY_CHUNK_SIZE):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+async def _bulk_invite(
+    db: AsyncSession,
+    team_id: int,
+    items: List[BulkInvitationItem],
+    current_user: CachedUser
+) -> BulkInvitationResponse:
+    """Validate a batch with set-based queries and insert all invitations at once"""
+    
+    if len(items) > settings.bulk_invite_max_rows:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"A bulk invitation may contain at most {settings.bulk_invite_max_rows} rows"
+        )
+    
+    if current_user.team_id != team_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to invite members to this team"
         )
+    
+    team = await db.get(Team, team_id)
+    if not team:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Team not found"
+        )
+    
+    results = [None] * len(items)
+    candidates = {}  # case-folded email -> (row index, email) of its first valid occurrence
+    
+    # Validate rows and drop duplicates within the batch
+    for row, item in enumerate(items):
+        raw_email = item.email.strip()
+        try:
+            _, email = validate_email(raw_email)
+        except PydanticCustomError as e:
+            results[row] = BulkInvitationResult(row=row, email=raw_email, status="invalid", detail=str(e))
+            continue
         
-        if email_sent:
-            print(f"✅ Email sent successfully to {invitation_data.email}: {message}")
+        if item.role not in ("admin", "member"):
+            results[row] = BulkInvitationResult(
+                row=row, email=email, status="invalid", detail="Invalid role. Must be 'admin' or 'member'"
+            )
+            continue
+        
+        # Mailboxes are matched case-insensitively; the address is stored as written
+        if email.lower() in candidates:
+            results[row] = BulkInvitationResult(
+                row=row, email=email, status="skipped", detail="Duplicate email in batch"
+            )
+            continue
+        
+        candidates[email.lower()] = (row, email)
+    
+    # Set-based lookups of existing users and active invitations
+    emails = list(candidates)
+    now = datetime.utcnow()
+    existing_users = set()
+    active_invitations = set()
+    for chunk in _chunks(emails):
+        existing_users.update(
+            await db.scalars(select(func.lower(User.email)).where(func.lower(User.email).in_(chunk)))
+        )
+        active_invitations.update(
+            await db.scalars(select(func.lower(Invitation.email)).where(
+                func.lower(Invitation.email).in_(chunk),
+                Invitation.team_id == team_id,
+                Invitation.is_used == False,
+                Invitation.expires_at > now
+            ))
+        )
+    
+    to_insert = []
+    for folded, (row, email) in candidates.items():
+        if folded in existing_users:
+            results[row] = BulkInvitationResult(
+                row=row, email=email, status="skipped", detail="User with this email already exists"
+            )
+        elif folded in active_invitations:
+            results[row] = BulkInvitationResult(
+                row=row, email=email, status="skipped", detail="An active invitation already exists for this email"
+            )
         else:
-            print(f"⚠️ Warning: Failed to send email to {invitation_data.email}: {message}")
+            to_insert.append((row, email, items[row].role))
+    
+    if to_insert:
+        expires_at = now + timedelta(days=7)
+        invitation_rows = [
+            {
+                "email": email,
+                "role": role,
+                "team_id": team_id,
+                "token": create_invitation_token(email, str(team_id), role),
+                "expires_at": expires_at,
+                "is_used": False,
+                "invited_by": current_user.id
+            }
+            for _, email, role in to_insert
+        ]
+        
+        # One batched INSERT ... RETURNING for the whole batch. Asking for the ids in
+        # parameter order would make SQLite fall back to an INSERT per row, so
+        # they are matched back through the unique token instead.
+        ids_by_token = dict((await db.execute(
+            insert(Invitation).returning(Invitation.token, Invitation.id),
+            invitation_rows
+        )).all())
+        invitation_ids = [ids_by_token[invitation["token"]] for invitation in invitation_rows]
+        
+        inviter = await db.get(User, current_user.id)
+        inviter_name = f"{inviter.first_name} {inviter.last_name}"
+        await db.run_sync(enqueue_emails, [
+            {
+                "kind": "team_invitation",
+                "to_email": invitation["email"],
+                "payload": {
+                    "to_email": invitation["email"],
+                    "sister_name": inviter_name,
+                    "team_name": team.name,
+                    "invitation_link": invitation_link(invitation["token"])
+                },
+                "invitation_id": invitation_id
+            }
+            for invitation, invitation_id in zip(invitation_rows, invitation_ids)
+        ])
+        await bump_team_version(db, team_id)
+        
+        await db.commit()
+        outbox_dispatcher.notify()
+        # One event for the batch; streams refetch the listing rather than replay thousands of rows
+        await team_events.publish(team_id, "invitations.bulk_created", {"count": len(invitation_ids)})
+        
+        for (row, email, _), invitation_id in zip(to_insert, invitation_ids):
+            results[row] = BulkInvitationResult(
+                row=row, email=email, status="invited", invitation_id=invitation_id
+            )
     
-    except Exception as e:
-        print(f"⚠️ Warning: Email service error: {str(e)}")
+    counts = {"invited": 0, "skipped": 0, "invalid": 0}
+    for result in results:
+        counts[result.status] += 1
     
-    return InvitationResponse.model_validate(db_invitation)
+    return BulkInvitationResponse(team_id=team_id, results=results, **counts)
 
 
-@router.get("/invitations", response_model=List[InvitationResponse])
+def _log_bulk_invite(request: Request, current_user: CachedUser, result: BulkInvitationResponse, source: str) -> None:
+    activity_log.log(
+        "team.bulk_invite",
+        request,
+        user_id=current_user.id,
+        team_id=result.team_id,
+        details={"source": source, "invited": result.invited, "skipped": result.skipped, "invalid": result.invalid}
+    )
+
+
+@router.post("/invite/bulk", response_model=BulkInvitationResponse)
+async def bulk_invite_members(
+    bulk_data: BulkInvitationCreate,
+    request: Request,
+    current_user: CachedUser = Depends(get_current_admin_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Invite many members at once from a JSON array (Admin only)"""
+    
+    result = await _bulk_invite(db, bulk_data.team_id, bulk_data.invitations, current_user)
+    _log_bulk_invite(request, current_user, result, "json")
+    return result
+
+
+@router.post("/invite/bulk/csv", response_model=BulkInvitationResponse)
+async def bulk_invite_members_csv(
+    request: Request,
+    team_id: int = Form(...),
+    file: UploadFile = File(...),
+    current_user: CachedUser = Depends(get_current_admin_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Invite many members at once from a CSV upload with `email` and optional `role` columns (Admin only)"""
+    
+    try:
+        content = (await file.read()).decode("utf-8-sig")
+    except UnicodeDecodeError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="CSV file must be UTF-8 encoded"
+        )
+    
+    rows = [row for row in csv.reader(io.StringIO(content)) if any(cell.strip() for cell in row)]
+    
+    # The header row is optional; without one, columns are email[,role]
+    email_column, role_column = 0, 1
+    if rows and "email" in [cell.strip().lower() for cell in rows[0]]:
+        header = [cell.strip().lower() for cell in rows.pop(0)]
+        email_column = header.index("email")
+        role_column = header.index("role") if "role" in header else None
+    
+    items = []
+    for row in rows:
+        role = row[role_column].strip() if role_column is not None and len(row) > role_column else ""
+        items.append(BulkInvitationItem(
+            email=row[email_column] if len(row) > email_column else "",
+            role=role or "member"
+        ))
+    
+    result = await _bulk_invite(db, team_id, items, current_user)
+    _log_bulk_invite(request, current_user, result, "csv")
+    return result
+
+
+@router.get("/invitations", response_model=InvitationPage, dependencies=[Depends(query_budget(3))])
 async def get_pending_invitations(
     team_id: int,
-    current_user: User = Depends(get_current_admin_user),
-    db: Session = Depends(get_db)
+    request: Request,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    current_user: CachedUser = Depends(get_current_admin_user),
+    db: AsyncSession = Depends(get_read_db)
 ):
-    """Get pending invitations for a team (Admin only)"""
+    """Get pending invitations for a team, soonest-expiring first (Admin only)"""
     
-    invitations = db.query(Invitation).filter(
-        Invitation.team_id == team_id,
-        Invitation.is_used == False,
-        Invitation.expires_at > datetime.utcnow()
-    ).all()
+    # Verify user is part of the team
+    if current_user.team_id != team_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to view this team's invitations"
+        )
+    
+    key = decode_cursor(cursor, "i") if cursor else None
     
-    return [InvitationResponse.model_validate(inv) for inv in invitations]
+    etag = await _listing_etag(db, team_id)
+    not_modified = _not_modified(request, etag)
+    if not_modified is not None:
+        return not_modified
+    
+    invitations, next_key = await _fetch_page(
+        db, pending_invitations_page_query(team_id, key), limit, _invitation_key
+    )
+    
+    # Skips response_model validation; the declared model still documents the shape
+    return ORJSONResponse({
+        "items": [invitation_read(inv) for inv in invitations],
+        "next_cursor": encode_cursor(next_key) if next_key else None
+    }, headers=_listing_headers(etag))
 
 
 @router.post("/accept-invitation/{token}")
 async def accept_invitation(
     token: str,
     acceptance_data: AcceptInvitation,
-    db: Session = Depends(get_db)
+    request: Request,
+    db: AsyncSession = Depends(get_db)
 ):
     """Accept a team invitation and create user account"""
     
@@ -137,12 +669,14 @@ async def accept_invitation(
             detail="Invalid or expired invitation token"
         )
     
+    password_admission.admit(request, email)
+    
     # Check if invitation exists and is still valid
-    invitation = db.query(Invitation).filter(
+    invitation = await db.scalar(select(Invitation).where(
         Invitation.token == token,
         Invitation.is_used == False,
         Invitation.expires_at > datetime.utcnow()
-    ).first()
+    ))
     
     if not invitation:
         raise HTTPException(
@@ -151,7 +685,7 @@ async def accept_invitation(
         )
     
     # Check if user already exists
-    existing_user = db.query(User).filter(User.email == email).first()
+    existing_user = await db.scalar(select(User).where(User.email == email))
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -159,7 +693,7 @@ async def accept_invitation(
         )
     
     # Create new user
-    hashed_password = get_password_hash(acceptance_data.password)
+    hashed_password = await get_password_hash_async(acceptance_data.password)
     new_user = User(
         email=email,
         password_hash=hashed_password,
@@ -174,9 +708,27 @@ async def accept_invitation(
     # Mark invitation as used
     invitation.is_used = True
     invitation.accepted_at = datetime.utcnow()
+    await adjust_team_counters(
+        db,
+        int(team_id),
+        members=1,
+        admins=1 if role == "admin" else 0
+    )
     
-    db.commit()
-    db.refresh(new_user)
+    await db.commit()
+    await db.refresh(new_user)
+    replica_router.mark_write(new_user.id)
+    activity_log.log(
+        "team.invitation_accepted",
+        request,
+        user_id=new_user.id,
+        team_id=new_user.team_id,
+        details={"invitation_id": invitation.id, "role": role}
+    )
+    await team_events.publish(new_user.team_id, "invitation.accepted", {
+        "invitation_id": invitation.id,
+        "member": user_read(new_user)
+    })
     
     return {
         "message": "Invitation accepted successfully",
@@ -184,11 +736,14 @@ async def accept_invitation(
     }
 
 
-@router.get("/members", response_model=List[UserResponse])
+@router.get("/members", response_model=UserPage, dependencies=[Depends(query_budget(3))])
 async def get_team_members(
     team_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    request: Request,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    current_user: CachedUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get team members"""
     
@@ -199,21 +754,35 @@ async def get_team_members(
             detail="Not authorized to view this team's members"
         )
     
-    members = db.query(User).filter(
-        User.team_id == team_id,
-        User.is_active == True
-    ).all()
+    key = decode_cursor(cursor, "m") if cursor else None
+    
+    etag = await _listing_etag(db, team_id)
+    not_modified = _not_modified(request, etag)
+    if not_modified is not None:
+        return not_modified
     
-    return [UserResponse.model_validate(member) for member in members]
+    members, next_key = await _fetch_page(db, members_page_query(team_id, key), limit, _member_key)
+    
+    # Skips response_model validation; the declared model still documents the shape
+    return ORJSONResponse({
+        "items": [user_read(member) for member in members],
+        "next_cursor": encode_cursor(next_key) if next_key else None
+    }, headers=_listing_headers(etag))
 
 
-@router.get("/members-with-invitations")
+@router.get("/members-with-invitations", dependencies=[Depends(query_budget(3))])
 async def get_team_members_with_invitations(
     team_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    request: Request,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    current_user: CachedUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db)
 ):
-    """Get team members and pending invitations with status"""
+    """Get team members and pending invitations with status.
+
+    Pages walk the active members first, then the pending invitations.
+    """
     
     # Verify user is part of the team
     if current_user.team_id != team_id:
@@ -222,66 +791,38 @@ async def get_team_members_with_invitations(
             detail="Not authorized to view this team's members"
         )
     
-    # Get active members
-    members = db.query(User).filter(
-        User.team_id == team_id,
-        User.is_active == True
-    ).all()
+    key = decode_cursor(cursor, "m", "i") if cursor else None
+    etag = await _listing_etag(db, team_id)
+    not_modified = _not_modified(request, etag)
+    if not_modified is not None:
+        return not_modified
     
-    # Get pending invitations
-    pending_invitations = db.query(Invitation).filter(
-        Invitation.team_id == team_id,
-        Invitation.is_used == False,
-        Invitation.expires_at > datetime.utcnow()
-    ).all()
+    rows = (await db.execute(members_with_invitations_query(team_id, key, limit))).all()
     
-    # Format response
-    result = []
+    result = listing_items(rows[:limit])
     
-    # Add active members
-    for member in members:
-        result.append({
-            "id": member.id,
-            "email": member.email,
-            "first_name": member.first_name,
-            "last_name": member.last_name,
-            "role": member.role,
-            "status": "active",
-            "type": "member",
-            "joined_at": member.created_at,
-            "invitation_id": None
-        })
-    
-    # Add pending invitations
-    for invitation in pending_invitations:
-        result.append({
-            "id": None,
-            "email": invitation.email,
-            "first_name": None,
-            "last_name": None,
-            "role": invitation.role,
-            "status": "pending",
-            "type": "invitation",
-            "joined_at": None,
-            "invitation_id": invitation.id,
-            "invited_at": invitation.created_at,
-            "expires_at": invitation.expires_at
-        })
+    next_key = None
+    if len(rows) > limit:
+        last = rows[limit - 1]
+        next_key = ["m", last.id] if last.kind == MEMBER_ROW else ["i", _naive_utc(last.expires_at).isoformat(), last.id]
     
-    return {
+    # Every value is already JSON-native, so skip FastAPI's jsonable_encoder pass
+    return ORJSONResponse({
         "team_id": team_id,
         "members_and_invitations": result,
-        "total_members": len(members),
-        "pending_invitations": len(pending_invitations)
-    }
+        "total_members": rows[0].total_members,
+        "pending_invitations": rows[0].pending_invitations,
+        "next_cursor": encode_cursor(next_key) if next_key else None
+    }, headers=_listing_headers(etag))
 
 
 @router.put("/members/{member_id}/role", response_model=UserResponse)
 async def update_member_role(
     member_id: int,
     role_data: dict,
-    current_user: User = Depends(get_current_admin_user),
-    db: Session = Depends(get_db)
+    request: Request,
+    current_user: CachedUser = Depends(get_current_admin_user),
+    db: AsyncSession = Depends(get_db)
 ):
     """Update a team member's role (Admin only)"""
     
@@ -292,7 +833,7 @@ async def update_member_role(
             detail="Invalid role. Must be 'admin' or 'member'"
         )
     
-    member = db.query(User).filter(User.id == member_id).first()
+    member = await db.get(User, member_id)
     if not member:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -306,23 +847,35 @@ async def update_member_role(
             detail="Not authorized to modify this member"
         )
     
-    # Prevent self-demotion if user is the only admin
-    if member.id == current_user.id and new_role != "admin":
-        admin_count = db.query(User).filter(
-            User.team_id == current_user.team_id,
-            User.role == "admin",
-            User.is_active == True
-        ).count()
-        
-        if admin_count <= 1:
+    # Keep admin_count in step; demoting the team's last admin is refused
+    if member.role != "admin" and new_role == "admin":
+        await adjust_team_counters(db, member.team_id, admins=1)
+    elif member.role == "admin" and new_role != "admin":
+        if not await release_admin(db, member.team_id):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Cannot demote the last admin of the team"
             )
     
+    previous_role = member.role
     member.role = new_role
-    db.commit()
-    db.refresh(member)
+    member.authz_version = (member.authz_version or 0) + 1
+    await db.commit()
+    await db.refresh(member)
+    user_cache.invalidate(member.id)
+    await authz_versions.bump(member.id, member.authz_version)
+    activity_log.log(
+        "team.role_changed",
+        request,
+        user_id=current_user.id,
+        team_id=member.team_id,
+        details={"member_id": member.id, "from": previous_role, "to": new_role}
+    )
+    await team_events.publish(member.team_id, "member.role_changed", {
+        "member_id": member.id,
+        "role": new_role,
+        "previous_role": previous_role
+    })
     
     return UserResponse.model_validate(member)
 
@@ -330,12 +883,13 @@ async def update_member_role(
 @router.delete("/members/{member_id}")
 async def remove_member(
     member_id: int,
-    current_user: User = Depends(get_current_admin_user),
-    db: Session = Depends(get_db)
+    request: Request,
+    current_user: CachedUser = Depends(get_current_admin_user),
+    db: AsyncSession = Depends(get_db)
 ):
     """Remove a team member (Admin only)"""
     
-    member = db.query(User).filter(User.id == member_id).first()
+    member = await db.get(User, member_id)
     if not member:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -349,23 +903,268 @@ async def remove_member(
             detail="Not authorized to remove this member"
         )
     
-    # Prevent self-removal if user is the only admin
-    if member.id == current_user.id:
-        admin_count = db.query(User).filter(
-            User.team_id == current_user.team_id,
-            User.role == "admin",
-            User.is_active == True
-        ).count()
-        
-        if admin_count <= 1:
+    # Keep the counters in step; removing the team's last admin is refused
+    if member.role == "admin":
+        if not await release_admin(db, member.team_id, members=-1):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Cannot remove the last admin of the team"
             )
+    else:
+        await adjust_team_counters(db, member.team_id, members=-1)
     
     # Instead of deleting, deactivate the user
     member.is_active = False
     member.team_id = None
-    db.commit()
+    member.authz_version = (member.authz_version or 0) + 1
+    await db.commit()
+    user_cache.invalidate(member.id)
+    await authz_versions.bump(member.id, member.authz_version)
+    activity_log.log(
+        "team.member_removed",
+        request,
+        user_id=current_user.id,
+        team_id=current_user.team_id,
+        details={"member_id": member.id, "email": member.email}
+    )
+    await team_events.publish(current_user.team_id, "member.removed", {"member_id": member.id})
+    
+    return {"message": "Member removed successfully"}
+
+
+def _require_team_admin(current_user: CachedUser, team_id: int) -> None:
+    if current_user.team_id != team_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to view this team's activity"
+        )
+
+
+@router.get("/activity", response_model=ActivitySummaryPage, dependencies=[Depends(query_budget(3))])
+async def get_team_activity(
+    team_id: int,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    action: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    current_user: CachedUser = Depends(get_current_admin_user),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Daily event counts per action, newest day first (Admin only).
+
+    Served from the daily rollups; use /activity/events for the raw events of a day.
+    Defaults to the last 30 days.
+    """
+    
+    _require_team_admin(current_user, team_id)
+    end = end or datetime.utcnow().date()
+    start = start or end - timedelta(days=29)
+    
+    query = select(ActivityDailyRollup).where(
+        ActivityDailyRollup.team_id == team_id,
+        ActivityDailyRollup.day >= start,
+        ActivityDailyRollup.day <= end
+    )
+    if action:
+        query = query.where(ActivityDailyRollup.action == action)
+    
+    key = decode_cursor(cursor, "r") if cursor else None
+    if key is not None:
+        after = (date.fromisoformat(key[1]), key[2])
+        query = query.where(tuple_(ActivityDailyRollup.day, ActivityDailyRollup.action) < tuple_(*after))
+    
+    # Primary key order (team_id, day, action), read backwards
+    rollups, next_key = await _fetch_page(
+        db,
+        query.order_by(ActivityDailyRollup.day.desc(), ActivityDailyRollup.action.desc()),
+        limit,
+        lambda rollup: ["r", rollup.day.isoformat(), rollup.action]
+    )
+    
+    return ActivitySummaryPage(
+        team_id=team_id,
+        items=[
+            ActivitySummaryItem(day=rollup.day, action=rollup.action, count=rollup.event_count)
+            for rollup in rollups
+        ],
+        next_cursor=encode_cursor(next_key) if next_key else None
+    )
+
+
+@router.get("/activity/events", response_model=ActivityEventPage, dependencies=[Depends(query_budget(4))])
+async def get_team_activity_events(
+    team_id: int,
+    day: date,
+    action: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    current_user: CachedUser = Depends(get_current_admin_user),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Raw events of one day, newest first (Admin only).
+
+    Reads only the monthly partition holding `day`; days past the retention
+    period return an empty page.
+    """
+    
+    _require_team_admin(current_user, team_id)
+    
+    key = decode_cursor(cursor, "e") if cursor else None
+    after = (datetime.fromisoformat(key[1]), key[2]) if key is not None else None
+    
+    if not await db.run_sync(lambda session: partition_exists(session.connection(), day)):
+        return ActivityEventPage(team_id=team_id, day=day, items=[])
+    
+    events = partition_table(day)
+    day_start = datetime.combine(day, datetime.min.time())
+    query = select(events).where(
+        events.c.team_id == team_id,
+        events.c.created_at >= day_start,
+        events.c.created_at < day_start + timedelta(days=1)
+    )
+    if action:
+        query = query.where(events.c.action == action)
+    if after is not None:
+        query = query.where(tuple_(events.c.created_at, events.c.id) < tuple_(*after))
+    
+    rows = (await db.execute(
+        query.order_by(events.c.created_at.desc(), events.c.id.desc()).limit(limit + 1)
+    )).all()
+    next_key = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_key = ["e", _naive_utc(rows[-1].created_at).isoformat(), rows[-1].id]
+    
+    return ORJSONResponse({
+        "team_id": team_id,
+        "day": day,
+        "items": [{name: getattr(row, name) for name in ActivityEventResponse.model_fields} for row in rows],
+        "next_cursor": encode_cursor(next_key) if next_key else None
+    })
+
+
+async def _roster_batches(db: AsyncSession, team_id: int, include: str):
+    if include in ("all", "members"):
+        members = members_page_query(team_id).with_only_columns(
+            User.id, User.email, User.first_name, User.last_name, User.role, User.created_at, User.last_login,
+            literal("active").label("status")
+        )
+        async for rows in stream_rows(db, members, "member"):
+            yield rows
+    if include in ("all", "invitations"):
+        invitations = pending_invitations_page_query(team_id).with_only_columns(
+            Invitation.id, Invitation.email, Invitation.role, Invitation.created_at, Invitation.expires_at,
+            literal("pending").label("status")
+        )
+        async for rows in stream_rows(db, invitations, "invitation"):
+            yield rows
+
+
+@router.get("/export")
+async def export_team_roster(
+    team_id: int,
+    request: Request,
+    format: str = Query("csv", pattern="^(csv|ndjson)$"),
+    include: str = Query("all", pattern="^(all|members|invitations)$"),
+    current_user: CachedUser = Depends(get_current_admin_user),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Stream every active member and pending invitation as CSV or NDJSON (Admin only)
+    
+    Rows are read through a server-side cursor and written a batch at a time,
+    so memory stays flat regardless of team size. Gzipped on the fly when the
+    client sends `Accept-Encoding: gzip`.
+    """
+    
+    if current_user.team_id != team_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to export this team"
+        )
+    
+    # The session stays open until the body is sent: FastAPI closes yield dependencies after the response
+    body = encode_export(_roster_batches(db, team_id, include), format)
+    headers = {
+        "Content-Disposition": f'attachment; filename="team-{team_id}-{include}-{datetime.utcnow():%Y%m%d}.{format}"',
+        "Cache-Control": "no-store",
+        "Vary": "Accept-Encoding"
+    }
+    accepted = {
+        encoding.split(";")[0].strip().lower() for encoding in request.headers.get("accept-encoding", "").split(",")
+    }
+    if "gzip" in accepted:
+        body = gzip_chunks(body)
+        headers["Content-Encoding"] = "gzip"
+    
+    activity_log.log(
+        "team.roster_exported",
+        request,
+        user_id=current_user.id,
+        team_id=team_id,
+        details={"format": format, "include": include}
+    )
+    return StreamingResponse(body, media_type=EXPORT_FORMATS[format], headers=headers)
+
+
+async def _team_event_stream(team_id: int, user_id: int, last_event_id: Optional[str]):
+    subscription, replay, reset = team_events.subscribe(team_id, last_event_id)
+    try:
+        yield f"retry: {settings.team_events_retry_ms}\n\n".encode()
+        if reset:
+            yield _reset_frame()
+        for event in replay:
+            yield event.frame
+        while True:
+            if subscription.overflowed:
+                # Fell too far behind; the client refetches and reconnects
+                yield _reset_frame()
+                return
+            try:
+                event = await asyncio.wait_for(subscription.queue.get(), settings.team_events_heartbeat_seconds)
+            except asyncio.TimeoutError:
+                yield b": keep-alive\n\n"
+                continue
+            yield event.frame
+            if event.type == "member.removed" and event.data.get("member_id") == user_id:
+                return
+    finally:
+        team_events.unsubscribe(subscription)
+
+
+def _reset_frame() -> bytes:
+    return f"event: {RESET_EVENT}\ndata: {{}}\n\n".encode()
+
+
+# Declared last so /activity/events is matched before this route
+@router.get("/{team_id}/events")
+async def stream_team_events(
+    team_id: int,
+    request: Request,
+    current_user: CachedUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Server-sent events for membership changes in a team.
+    
+    Emits invitation.created, invitations.bulk_created, invitation.accepted,
+    member.role_changed and member.removed as they are committed, plus a
+    keep-alive comment every team_events_heartbeat_seconds. Reconnects with
+    Last-Event-ID resume after the last event seen; `stream.reset` means
+    events were missed and the listings should be refetched.
+    """
+    
+    # Verify user is part of the team
+    if current_user.team_id != team_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to view this team's events"
+        )
+    
+    # Hand the pooled connection back; the stream may stay open for hours
+    await db.close()
     
-    return {"message": "Member removed successfully"}
\ No newline at end of file
+    return StreamingResponse(
+        _team_event_stream(team_id, current_user.id, request.headers.get("last-event-id")),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
\ No newline at end of file
@@ -0,0 +1,155 @@
+import ipaddress
+import math
+import time
+from collections import OrderedDict
+from typing import List, Optional, Union
+
+from fastapi import HTTPException, Request, status
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.core.security import admission_rejected, pending_hash_count, hash_capacity
+
+Network = Union[ipaddress.IPv4Network, ipaddress.IPv6Network]
+
+hash_queue_depth = metrics.gauge(
+    "password_hash_queue_depth",
+    "bcrypt jobs running or waiting for a worker"
+)
+hash_queue_depth.set_function(pending_hash_count)
+
+
+class TokenBucket:
+    __slots__ = ("tokens", "updated")
+
+    def __init__(self, capacity: float, now: float):
+        self.tokens = capacity
+        self.updated = now
+
+
+class KeyedRateLimiter:
+    """Token buckets per key (IP, email), bounded to `max_keys` via LRU eviction.
+
+    A rate of 0 per minute disables the limiter.
+    """
+
+    def __init__(self, per_minute: int, burst: int, max_keys: int):
+        self.rate = per_minute / 60.0
+        self.capacity = float(burst)
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, TokenBucket]" = OrderedDict()
+
+    def take(self, key: str) -> Optional[float]:
+        """Consume a token for `key`; returns None if allowed, else seconds until retry"""
+        if self.rate <= 0:
+            return None
+        now = time.monotonic()
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = TokenBucket(self.capacity, now)
+            self._buckets[key] = bucket
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+            bucket.tokens = min(self.capacity, bucket.tokens + (now - bucket.updated) * self.rate)
+            bucket.updated = now
+
+        if bucket.tokens >= 1.0:
+            bucket.tokens -= 1.0
+            return None
+        return (1.0 - bucket.tokens) / self.rate
+
+
+def _parse_networks(proxies: List[str]) -> List[Network]:
+    return [ipaddress.ip_network(proxy, strict=False) for proxy in proxies]
+
+
+def _is_trusted(address: str, networks: List[Network]) -> bool:
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(ip in network for network in networks)
+
+
+def client_ip(request: Request, trusted_proxies: List[Network]) -> str:
+    """The caller's address, looking through X-Forwarded-For appended by trusted proxies.
+
+    Walks the header right to left and returns the first hop that is not a
+    trusted proxy; entries further left are client-supplied and could be forged.
+    """
+    peer = request.client.host if request.client else "unknown"
+    if not trusted_proxies or not _is_trusted(peer, trusted_proxies):
+        return peer
+    hops = [hop.strip() for header in request.headers.getlist("x-forwarded-for") for hop in header.split(",")]
+    for hop in reversed(hops):
+        if hop and not _is_trusted(hop, trusted_proxies):
+            return hop
+    return peer
+
+
+def _reject(status_code: int, detail: str, reason: str, retry_after: float) -> HTTPException:
+    admission_rejected.inc(reason=reason)
+    return HTTPException(
+        status_code=status_code,
+        detail=detail,
+        headers={"Retry-After": str(max(1, math.ceil(retry_after)))}
+    )
+
+
+class PasswordAdmission:
+    """Admission control for endpoints that run bcrypt.
+
+    Rejects before any DB or hashing work when the hash pool is saturated
+    (503) or the caller's IP or target email is over its rate (429), so a
+    credential-stuffing burst degrades into fast rejections instead of an
+    unbounded bcrypt backlog. Behind a reverse proxy, list it in
+    auth_trusted_proxies so the per-IP limit keys on the forwarded client
+    address rather than the proxy's.
+    """
+
+    def __init__(self):
+        self.by_ip = KeyedRateLimiter(
+            settings.auth_rate_limit_ip_per_minute,
+            settings.auth_rate_limit_ip_burst,
+            settings.auth_rate_limit_max_keys
+        )
+        self.by_email = KeyedRateLimiter(
+            settings.auth_rate_limit_email_per_minute,
+            settings.auth_rate_limit_email_burst,
+            settings.auth_rate_limit_max_keys
+        )
+        self.trusted_proxies = _parse_networks(settings.trusted_proxies)
+
+    def admit(self, request: Request, email: Optional[str] = None) -> None:
+        if pending_hash_count() >= hash_capacity():
+            raise _reject(
+                status.HTTP_503_SERVICE_UNAVAILABLE,
+                "Server is busy, please try again shortly",
+                "queue_full",
+                settings.password_hash_retry_after_seconds
+            )
+
+        retry_after = self.by_ip.take(client_ip(request, self.trusted_proxies))
+        if retry_after is not None:
+            raise _reject(
+                status.HTTP_429_TOO_MANY_REQUESTS,
+                "Too many attempts, please try again later",
+                "ip_rate",
+                retry_after
+            )
+
+        if email:
+            retry_after = self.by_email.take(email.strip().lower())
+            if retry_after is not None:
+                raise _reject(
+                    status.HTTP_429_TOO_MANY_REQUESTS,
+                    "Too many attempts for this account, please try again later",
+                    "email_rate",
+                    retry_after
+                )
+
+
+# Global admission controller for password endpoints
+password_admission = PasswordAdmission()
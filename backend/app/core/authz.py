@@ -0,0 +1,90 @@
+import logging
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from app.core.config import settings
+from app.core.pubsub import RedisFanout
+from app.core.user_cache import user_cache
+
+logger = logging.getLogger(__name__)
+
+
+class AuthzVersionMap:
+    """Latest known authorization version per user.
+
+    Access tokens carry the user's `authz_version` ("av" claim). A token whose
+    version matches the map can be authorized from its claims alone; a lower
+    version means the role or membership changed since it was issued. Role
+    changes and removals bump the version locally and, when Redis fan-out is
+    enabled, publish it so every worker sees the change within milliseconds.
+    Entries expire after `ttl_seconds` and are re-read from the database
+    either way: without fan-out that bounds how long another worker can
+    trust old claims, with it that is the backstop for a lost publish. The
+    map keeps at most `max_entries` users, least recently used first out.
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int, redis_url: Optional[str], channel: str):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._versions: "OrderedDict[int, Tuple[int, float]]" = OrderedDict()
+        self._fanout = RedisFanout(
+            redis_url, channel, "authz-version", self._on_message, self.forget_all
+        ) if redis_url else None
+
+    def get(self, user_id: int) -> Optional[int]:
+        entry = self._versions.get(user_id)
+        if entry is None:
+            return None
+        version, seen_at = entry
+        if time.monotonic() - seen_at > self.ttl_seconds:
+            del self._versions[user_id]
+            return None
+        self._versions.move_to_end(user_id)
+        return version
+
+    def observe(self, user_id: int, version: int) -> None:
+        """Record a version read from the database or received from another worker"""
+        entry = self._versions.get(user_id)
+        if entry is None or version >= entry[0]:
+            self._versions[user_id] = (version, time.monotonic())
+            self._versions.move_to_end(user_id)
+            if len(self._versions) > self.max_entries:
+                self._versions.popitem(last=False)
+
+    async def bump(self, user_id: int, version: int) -> None:
+        """Record a version this worker just committed and fan it out"""
+        self.observe(user_id, version)
+        if self._fanout is not None and self._fanout.connected:
+            try:
+                await self._fanout.publish(f"{user_id}:{version}")
+            except Exception as e:
+                logger.warning(f"Failed to publish authz version for user {user_id}: {e}")
+
+    def forget_all(self) -> None:
+        """Force every user to be re-read from the database on their next request"""
+        self._versions.clear()
+        # Cached users would otherwise re-seed the map with versions from before the gap
+        user_cache.clear()
+
+    def _on_message(self, data: bytes) -> None:
+        user_id, _, version = data.decode().partition(":")
+        user_cache.invalidate(int(user_id))
+        self.observe(int(user_id), int(version))
+
+    async def start(self) -> None:
+        if self._fanout is not None:
+            await self._fanout.start()
+
+    async def stop(self) -> None:
+        if self._fanout is not None:
+            await self._fanout.stop()
+
+
+# Global version map; entries expire like the user cache, with or without Redis fan-out
+authz_versions = AuthzVersionMap(
+    ttl_seconds=settings.user_cache_ttl_seconds,
+    max_entries=settings.user_cache_max_entries,
+    redis_url=settings.redis_url if settings.authz_redis_fanout else None,
+    channel=settings.authz_redis_channel
+)
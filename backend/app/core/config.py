@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import List, Optional
 
 
 class Settings(BaseSettings):
@@ -10,16 +10,74 @@ class Settings(BaseSettings):
     
     # Database
     database_url: str = "sqlite:///./team_management.db"
+    # Async driver URL for the request path; derived from database_url when unset
+    async_database_url: Optional[str] = None
+    # Connection pool, per engine (sync and async each get their own)
+    db_pool_size: int = 10
+    db_max_overflow: int = 20
+    db_pool_timeout: float = 30.0  # seconds to wait for a connection before erroring
+    db_pool_recycle: int = 1800  # seconds; server-side databases only
+    db_pool_pre_ping: bool = True  # server-side databases only
+    # Read replicas for GET routes: comma-separated URLs; empty sends every read to the primary
+    database_replica_urls: str = ""
+    db_replica_sticky_seconds: float = 10.0  # reads stay on the primary this long after a user's own write
+    db_replica_max_lag_seconds: float = 5.0  # replicas further behind are skipped
+    db_replica_lag_check_interval: float = 2.0  # seconds between lag measurements
+    # SQL instrumentation: per-request query counts in Server-Timing headers and metrics
+    sql_slow_query_ms: float = 200.0  # log slower statements with their query plan; 0 disables
+    sql_repeated_statement_threshold: int = 10  # warn when one statement runs this often in a request (N+1)
+    sql_query_budget_strict: bool = False  # raise instead of warn when a route exceeds its query budget (tests/CI)
+    # On-demand profiling: admins send `X-Profile: cpu|memory` to profile one request
+    profiling_enabled: bool = False
+    profiling_sample_interval: float = 0.005  # seconds between stack samples in cpu mode
+    profiling_tracemalloc_frames: int = 1  # traceback depth recorded in memory mode
+    profiling_tracemalloc_top: int = 30  # allocation sites listed in a memory profile
+    profiling_max_stored: int = 20  # most recent profiles kept for download
+    profiling_dir: Optional[str] = None  # also write profiles here when set
+    # SQLite pragmas applied to every new connection
+    sqlite_journal_mode: str = "wal"
+    sqlite_synchronous: str = "normal"
+    sqlite_busy_timeout_ms: int = 5000
+    sqlite_mmap_size: int = 268435456  # 256 MiB; 0 disables memory-mapped I/O
     
     # Security
     secret_key: str
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 15
     refresh_token_expire_days: int = 7
+    token_cache_max_entries: int = 10000  # verified-JWT cache size; 0 disables it
+    password_hash_executor: str = "thread"  # thread or process
+    password_hash_workers: int = 0  # 0 means one per CPU core
+    password_hash_queue_depth: int = 64  # hashes allowed to wait for a worker before 503
+    password_hash_retry_after_seconds: int = 1
+    
+    # Password endpoint rate limits (token buckets)
+    auth_rate_limit_ip_per_minute: int = 30
+    auth_rate_limit_ip_burst: int = 10
+    auth_rate_limit_email_per_minute: int = 10
+    auth_rate_limit_email_burst: int = 5
+    auth_rate_limit_max_keys: int = 100000
+    # Reverse proxies / load balancers (comma-separated IPs or CIDRs) whose X-Forwarded-For
+    # is trusted for the per-IP limit. Empty keys on the socket peer, so behind a proxy
+    # every client would share the proxy's bucket (uvicorn --proxy-headers with
+    # --forwarded-allow-ips, which rewrites the peer address, works as well)
+    auth_trusted_proxies: str = ""
+    
+    # Authenticated-user cache
+    user_cache_ttl_seconds: float = 30.0
+    user_cache_max_entries: int = 10000
+    
+    # Authorization versions; fan-out publishes role changes to every worker via Redis.
+    # Versions still expire after user_cache_ttl_seconds, bounding the damage of a lost publish
+    authz_redis_fanout: bool = False
+    authz_redis_channel: str = "authz-versions"
     
     # CORS
     allowed_origins: str = "http://localhost:3000,http://127.0.0.1:3000"
     
+    # Base URL of the web app; links in emails point here
+    frontend_url: str = "http://localhost:3000"
+    
     # Email
     smtp_host: str = "localhost"
     smtp_port: int = 578
@@ -27,6 +85,51 @@ class Settings(BaseSettings):
     smtp_password: str = ""
     smtp_from_email: str = "kelunipaz100@gmail.com"
     smtp_from_name: str = "Maktoobayn"
+    smtp_timeout: float = 30.0
+    email_transport: str = "asyncio"  # asyncio (native streams) or thread (smtplib in a thread pool)
+    email_thread_pool_size: int = 4
+    
+    # SMTP connection pool
+    smtp_pool_enabled: bool = True
+    smtp_pool_size: int = 4
+    smtp_pool_idle_timeout: float = 60.0
+    smtp_pool_max_messages: int = 100  # recycle a session after this many sends
+    smtp_pool_health_check_seconds: float = 10.0  # NOOP sessions idle longer than this
+    
+    # Email outbox
+    email_outbox_in_process: bool = True  # run delivery workers inside the API process
+    email_outbox_workers: int = 2
+    email_outbox_batch_size: int = 10  # messages leased per worker round trip
+    email_outbox_poll_interval: float = 1.0
+    email_outbox_max_attempts: int = 5
+    email_outbox_backoff_seconds: float = 30.0
+    email_outbox_backoff_max_seconds: float = 3600.0
+    email_outbox_lease_seconds: int = 300
+    
+    # Bulk invitations
+    bulk_invite_max_rows: int = 10000
+    
+    # Activity log (audit trail), written in batches off the request path
+    activity_log_enabled: bool = True
+    activity_log_buffer_size: int = 10000  # events held in memory; further events are dropped
+    activity_log_batch_size: int = 500  # rows per multi-row INSERT
+    activity_log_flush_interval: float = 1.0  # seconds between flushes of a partial batch
+    activity_log_retention_months: int = 12  # monthly raw-event partitions kept before being dropped
+    activity_rollup_retention_days: int = 730  # daily per-team/per-action summaries outlive the raw events
+    activity_log_maintenance_interval: float = 3600.0  # seconds between partition pruning runs
+    
+    # Team event streams (GET /team/{team_id}/events); fan-out publishes events to every worker via Redis
+    team_events_heartbeat_seconds: float = 15.0  # comment frames keep proxies from closing idle streams
+    team_events_history_size: int = 256  # events kept per team for Last-Event-ID resume
+    team_events_history_teams: int = 10000  # teams with history kept in memory
+    team_events_max_queued: int = 1000  # undelivered events per stream before it is reset
+    team_events_retry_ms: int = 3000  # client reconnect delay sent in the stream's retry field
+    team_events_redis_fanout: bool = False
+    team_events_redis_channel: str = "team-events"
+    
+    # Roster exports (GET /team/export)
+    export_batch_size: int = 1000  # rows fetched per server-side cursor round trip and encoded per chunk
+    export_gzip_level: int = 6
     
     # Rate Limiting
     redis_url: str = "redis://localhost:6379/0"
@@ -35,6 +138,14 @@ class Settings(BaseSettings):
     def cors_origins(self) -> List[str]:
         return [origin.strip() for origin in self.allowed_origins.split(",")]
     
+    @property
+    def replica_urls(self) -> List[str]:
+        return [url.strip() for url in self.database_replica_urls.split(",") if url.strip()]
+    
+    @property
+    def trusted_proxies(self) -> List[str]:
+        return [proxy.strip() for proxy in self.auth_trusted_proxies.split(",") if proxy.strip()]
+    
     class Config:
         env_file = "C:\\Users\\Dell\\take2\\invite-system\\backend\\.env.local"
         extra = "ignore"
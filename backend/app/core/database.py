@@ -1,21 +1,295 @@
-from sqlalchemy import create_engine
+import asyncio
+import itertools
+import logging
+import time
+from typing import AsyncIterator, Dict, List, Optional
+from fastapi import Request
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 from app.core.config import settings
+from app.core.metrics import metrics
+from app.core.sql_stats import instrument_engine
 
-engine = create_engine(
-    settings.database_url,
-    connect_args={"check_same_thread": False} if "sqlite" in settings.database_url else {}
+logger = logging.getLogger(__name__)
+
+pool_checkouts = metrics.counter(
+    "db_pool_checkouts_total",
+    "Connections handed out by the pool",
+    ("pool",)
+)
+pool_wait_seconds = metrics.counter(
+    "db_pool_wait_seconds_total",
+    "Time spent waiting for a pooled connection",
+    ("pool",)
+)
+pool_timeouts = metrics.counter(
+    "db_pool_timeouts_total",
+    "Checkouts that gave up after db_pool_timeout",
+    ("pool",)
+)
+pool_checked_out = metrics.gauge("db_pool_checked_out", "Connections currently in use", ("pool",))
+pool_overflow = metrics.gauge("db_pool_overflow", "Connections open beyond pool_size", ("pool",))
+pool_size = metrics.gauge("db_pool_size", "Configured pool_size", ("pool",))
+pool_idle = metrics.gauge("db_pool_idle", "Open connections waiting in the pool", ("pool",))
+read_sessions = metrics.counter(
+    "db_read_sessions_total",
+    "Read-only sessions by where they were routed and why",
+    ("target", "reason")
 )
+replica_lag = metrics.gauge("db_replica_lag_seconds", "Last measured replication lag; -1 if unreachable", ("replica",))
+
+
+class _PoolStatsMixin:
+    """Records checkout counts, wait time and occupancy for a QueuePool"""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            record = super()._do_get()
+        except PoolTimeoutError:
+            pool_timeouts.inc(pool=self.logging_name)
+            raise
+        finally:
+            pool_wait_seconds.inc(time.perf_counter() - started, pool=self.logging_name)
+        pool_checkouts.inc(pool=self.logging_name)
+        self._record_usage()
+        return record
+
+    def _do_return_conn(self, record):
+        super()._do_return_conn(record)
+        self._record_usage()
+
+    def _record_usage(self):
+        pool_checked_out.set(self.checkedout(), pool=self.logging_name)
+        pool_overflow.set(max(self.overflow(), 0), pool=self.logging_name)
+
+
+class InstrumentedQueuePool(_PoolStatsMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_PoolStatsMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def _is_sqlite_memory(url) -> bool:
+    return url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")
+
+
+def engine_options(url: str, name: str, is_async: bool = False) -> dict:
+    """create_engine keyword arguments for `url`, driven by the db_pool_* settings"""
+    parsed = make_url(url)
+    if _is_sqlite_memory(parsed):
+        # One shared in-memory database; keep the dialect's default pool
+        return {"connect_args": {"check_same_thread": False}} if not is_async else {}
+    
+    options = {
+        "poolclass": InstrumentedAsyncQueuePool if is_async else InstrumentedQueuePool,
+        "pool_logging_name": name,
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+    }
+    if parsed.get_backend_name() == "sqlite":
+        if not is_async:
+            options["connect_args"] = {"check_same_thread": False}
+    else:
+        options["pool_recycle"] = settings.db_pool_recycle
+        options["pool_pre_ping"] = settings.db_pool_pre_ping
+    return options
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    cursor.execute(f"PRAGMA journal_mode={settings.sqlite_journal_mode}")
+    cursor.execute(f"PRAGMA synchronous={settings.sqlite_synchronous}")
+    cursor.execute(f"PRAGMA busy_timeout={int(settings.sqlite_busy_timeout_ms)}")
+    cursor.execute(f"PRAGMA mmap_size={int(settings.sqlite_mmap_size)}")
+    cursor.close()
+
+
+def _configure(sync_engine):
+    if sync_engine.dialect.name == "sqlite":
+        event.listen(sync_engine, "connect", _set_sqlite_pragmas)
+    instrument_engine(sync_engine)
+    return sync_engine
+
+
+# Sync engine for Alembic, the outbox worker and other off-request tooling
+engine = _configure(create_engine(settings.database_url, **engine_options(settings.database_url, "sync")))
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgres": "postgresql+asyncpg",
+}
+
+
+def to_async_url(url: str) -> str:
+    """Swap a sync database URL's driver for its asyncio counterpart"""
+    scheme, sep, rest = url.partition("://")
+    dialect = scheme.split("+", 1)[0]
+    if dialect in ASYNC_DRIVERS:
+        return f"{ASYNC_DRIVERS[dialect]}{sep}{rest}"
+    return url
+
+
+# Async engine used by the API routers
+ASYNC_DATABASE_URL = settings.async_database_url or to_async_url(settings.database_url)
+async_engine = create_async_engine(ASYNC_DATABASE_URL, **engine_options(ASYNC_DATABASE_URL, "async", is_async=True))
+_configure(async_engine.sync_engine)
+
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 Base = declarative_base()
 
 
-def get_db():
-    db = SessionLocal()
-    try:
+# Postgres: 0 when the standby has replayed everything it received, otherwise the
+# age of the last replayed transaction. Other backends have no replication to measure.
+REPLICA_LAG_QUERIES = {
+    "postgresql": (
+        "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+        "ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+    ),
+}
+
+
+class Replica:
+    def __init__(self, name: str, url: str):
+        self.name = name
+        async_url = to_async_url(url)
+        self.engine = create_async_engine(async_url, **engine_options(async_url, name, is_async=True))
+        _configure(self.engine.sync_engine)
+        self.sessionmaker = async_sessionmaker(self.engine, autoflush=False, expire_on_commit=False)
+        self.lag: Optional[float] = None  # seconds; None until measured or while unreachable
+
+    async def measure_lag(self) -> Optional[float]:
+        query = REPLICA_LAG_QUERIES.get(self.engine.dialect.name, "SELECT 0")
+        try:
+            async with self.engine.connect() as conn:
+                lag = await conn.scalar(text(query))
+            self.lag = float(lag or 0.0)
+        except Exception as e:
+            if self.lag is not None:
+                logger.warning(f"Read replica {self.name} unreachable: {e}")
+            self.lag = None
+        replica_lag.set(self.lag if self.lag is not None else -1, replica=self.name)
+        return self.lag
+
+
+class ReplicaRouter:
+    """Routes read-only sessions to replicas while keeping reads consistent enough.
+
+    A read goes to the primary when the user committed a write on this worker
+    within the last `sticky_seconds` (so they see their own changes), and when
+    no replica is within `max_lag_seconds` of the primary. Lag is measured by
+    a background task every `check_interval` seconds; a replica is not used
+    until its first successful check, or while it is unreachable.
+    """
+
+    def __init__(self, urls: List[str], sticky_seconds: float, max_lag_seconds: float, check_interval: float):
+        self.replicas = [Replica(f"replica{i}", url) for i, url in enumerate(urls)]
+        self.sticky_seconds = sticky_seconds
+        self.max_lag_seconds = max_lag_seconds
+        self.check_interval = check_interval
+        self._last_write: Dict[int, float] = {}
+        self._round_robin = itertools.cycle(self.replicas) if self.replicas else None
+        self._monitor: Optional[asyncio.Task] = None
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.replicas)
+
+    def mark_write(self, user_id: Optional[int]) -> None:
+        if user_id is None or not self.enabled:
+            return
+        now = time.monotonic()
+        self._last_write[user_id] = now
+        if len(self._last_write) > 10000:
+            self._last_write = {
+                uid: at for uid, at in self._last_write.items() if now - at < self.sticky_seconds
+            }
+
+    def choose(self, user_id: Optional[int]) -> Optional[Replica]:
+        """The replica to read from, or None for the primary"""
+        if not self.enabled:
+            return None
+        wrote_at = self._last_write.get(user_id) if user_id is not None else None
+        if wrote_at is not None and time.monotonic() - wrote_at < self.sticky_seconds:
+            read_sessions.inc(target="primary", reason="sticky")
+            return None
+        for _ in range(len(self.replicas)):
+            replica = next(self._round_robin)
+            if replica.lag is not None and replica.lag <= self.max_lag_seconds:
+                read_sessions.inc(target="replica", reason="healthy")
+                return replica
+        read_sessions.inc(target="primary", reason="lagging")
+        return None
+
+    def start(self) -> None:
+        if self.enabled and self._monitor is None:
+            self._monitor = asyncio.create_task(self._watch_lag(), name="replica-lag-monitor")
+
+    async def stop(self) -> None:
+        if self._monitor is not None:
+            self._monitor.cancel()
+            await asyncio.gather(self._monitor, return_exceptions=True)
+            self._monitor = None
+        for replica in self.replicas:
+            await replica.engine.dispose()
+
+    async def _watch_lag(self) -> None:
+        while True:
+            await asyncio.gather(*(replica.measure_lag() for replica in self.replicas))
+            await asyncio.sleep(self.check_interval)
+
+
+# Global router; without database_replica_urls every read uses the primary
+replica_router = ReplicaRouter(
+    settings.replica_urls,
+    sticky_seconds=settings.db_replica_sticky_seconds,
+    max_lag_seconds=settings.db_replica_max_lag_seconds,
+    check_interval=settings.db_replica_lag_check_interval
+)
+
+
+def _collect_pool_stats() -> None:
+    """Refresh the pool gauges at scrape time, including pools idle since their last checkout"""
+    pools = [engine.pool, async_engine.pool] + [replica.engine.pool for replica in replica_router.replicas]
+    for pool in pools:
+        if isinstance(pool, _PoolStatsMixin):
+            pool._record_usage()
+            pool_size.set(pool.size(), pool=pool.logging_name)
+            pool_idle.set(pool.checkedin(), pool=pool.logging_name)
+
+
+metrics.on_collect(_collect_pool_stats)
+
+
+async def get_db(request: Request) -> AsyncIterator[AsyncSession]:
+    async with AsyncSessionLocal() as db:
+        if replica_router.enabled:
+            # Pin the user's reads to the primary for a while after they commit
+            event.listen(
+                db.sync_session,
+                "after_commit",
+                lambda session: replica_router.mark_write(getattr(request.state, "user_id", None))
+            )
         yield db
-    finally:
-        db.close()
\ No newline at end of file
+
+
+async def get_read_db(request: Request) -> AsyncIterator[AsyncSession]:
+    """Session for read-only routes: a replica when one is fresh enough, else the primary.
+
+    Depends on `request.state.user_id`, so declare it after get_current_user.
+    """
+    replica = replica_router.choose(getattr(request.state, "user_id", None))
+    async with (replica.sessionmaker if replica is not None else AsyncSessionLocal)() as db:
+        yield db
\ No newline at end of file
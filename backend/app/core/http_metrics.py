@@ -0,0 +1,46 @@
+import time
+
+from app.core.metrics import metrics
+
+request_duration = metrics.histogram(
+    "http_request_duration_seconds",
+    "Time from receiving a request to sending the last body chunk",
+    ("method", "route")
+)
+requests_total = metrics.counter("http_requests_total", "HTTP responses sent", ("method", "route", "status"))
+requests_in_progress = metrics.gauge("http_requests_in_progress", "HTTP requests currently being served")
+
+
+class HTTPMetricsMiddleware:
+    """ASGI middleware recording per-route latency and status counts.
+
+    Routes are labelled by their path template (`/team/members/{member_id}`),
+    never the raw path, so label cardinality stays bounded; requests that
+    match no route share the "unmatched" label.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        started = time.perf_counter()
+        status_code = 500
+        
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+        
+        requests_in_progress.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            requests_in_progress.dec()
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            request_duration.observe(time.perf_counter() - started, method=scope["method"], route=route)
+            requests_total.inc(method=scope["method"], route=route, status=str(status_code))
\ No newline at end of file
@@ -0,0 +1,193 @@
+import bisect
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+
+LabelValues = Tuple[str, ...]
+
+
+class Metric:
+    """Base class for in-process metrics keyed by label values.
+
+    Updates are plain dict operations without locks: under the GIL a lost
+    increment is possible only in rare thread races, which is an acceptable
+    trade for keeping instrumentation off the hot path's profile.
+    """
+
+    type = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._values: Dict[LabelValues, float] = {}
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> Iterator[Tuple[LabelValues, float]]:
+        return iter(list(self._values.items()))
+
+
+class Counter(Metric):
+    type = "counter"
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+
+class Gauge(Metric):
+    type = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._function: Optional[Callable[[], float]] = None
+
+    def set(self, value: float, **labels) -> None:
+        self._values[self._key(labels)] = value
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels) -> None:
+        self.inc(-amount, **labels)
+
+    def set_function(self, function: Callable[[], float]) -> None:
+        """Read the value from `function` at collection time (unlabelled gauges only)"""
+        self._function = function
+
+    def samples(self) -> Iterator[Tuple[LabelValues, float]]:
+        if self._function is not None:
+            return iter([((), float(self._function()))])
+        return super().samples()
+
+
+class Histogram(Metric):
+    """Observations counted into fixed buckets.
+
+    Each observation increments one (non-cumulative) bucket, the sum and the
+    count; buckets are only accumulated when rendered.
+    """
+
+    type = "histogram"
+
+    DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Tuple[str, ...] = (),
+        buckets: Tuple[float, ...] = DEFAULT_BUCKETS
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [bucket counts..., +Inf count, sum]
+        self._series: Dict[LabelValues, List[float]] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        series = self._series.get(key)
+        if series is None:
+            series = self._series.setdefault(key, [0.0] * (len(self.buckets) + 2))
+        series[bisect.bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def count(self, **labels) -> float:
+        series = self._series.get(self._key(labels))
+        return sum(series[:-1]) if series else 0.0
+
+    def samples(self) -> Iterator[Tuple[LabelValues, float]]:
+        """(label values, count) per series; see `render` for the buckets"""
+        return iter([(key, sum(series[:-1])) for key, series in list(self._series.items())])
+
+    def series(self) -> Iterator[Tuple[LabelValues, List[float], float]]:
+        """(label values, cumulative bucket counts including +Inf, sum) per series"""
+        for key, series in list(self._series.items()):
+            cumulative, total = [], 0.0
+            for bucket_count in series[:-1]:
+                total += bucket_count
+                cumulative.append(total)
+            yield key, cumulative, series[-1]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Tuple[str, ...], values: LabelValues, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+        self._collect_hooks: List[Callable[[], None]] = []
+
+    def _register(self, metric: Metric) -> Metric:
+        existing = self._metrics.get(metric.name)
+        if existing is not None:
+            return existing
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Tuple[str, ...] = (),
+        buckets: Tuple[float, ...] = Histogram.DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def on_collect(self, hook: Callable[[], None]) -> None:
+        """Run `hook` before every collection, e.g. to refresh labelled gauges"""
+        self._collect_hooks.append(hook)
+
+    def collect(self) -> Iterator[Metric]:
+        for hook in self._collect_hooks:
+            hook()
+        return iter(list(self._metrics.values()))
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format (0.0.4)"""
+        lines = []
+        for metric in self.collect():
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            if isinstance(metric, Histogram):
+                for key, cumulative, total in metric.series():
+                    bounds = [*metric.buckets, float("inf")]
+                    for bound, bucket_count in zip(bounds, cumulative):
+                        labels = _labels(metric.labelnames, key, f'le="{_number(bound)}"')
+                        lines.append(f"{metric.name}_bucket{labels} {_number(bucket_count)}")
+                    labels = _labels(metric.labelnames, key)
+                    lines.append(f"{metric.name}_sum{labels} {_number(total)}")
+                    lines.append(f"{metric.name}_count{labels} {_number(cumulative[-1])}")
+            else:
+                for key, value in metric.samples():
+                    lines.append(f"{metric.name}{_labels(metric.labelnames, key)} {_number(value)}")
+        return "\n".join(lines) + "\n"
+
+
+# Global registry shared by all modules
+metrics = MetricsRegistry()
@@ -0,0 +1,209 @@
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+import tracemalloc
+import uuid
+from collections import Counter, OrderedDict
+from typing import List, Optional
+
+from fastapi import HTTPException, Request
+from fastapi.security import HTTPAuthorizationCredentials
+
+from app.api.deps import get_current_admin_user, get_current_user
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = b"x-profile"
+PROFILE_MODES = ("cpu", "memory")
+
+
+class StackSampler:
+    """Samples every thread's Python stack at a fixed interval from a helper thread.
+
+    Produces collapsed stacks ("thread;outer;...;inner count" per line), the
+    format read by speedscope and flamegraph.pl. The event loop thread also
+    runs other requests while sampling, so their frames can appear as well;
+    time in bcrypt or other executor threads shows up under those threads.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        names = {}
+        while not self._stop.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                # Skip ourselves and pool workers parked waiting for a job
+                if thread_id == own_id or (frame.f_code.co_name == "wait" and frame.f_code.co_filename == threading.__file__):
+                    continue
+                if thread_id not in names:
+                    thread = threading._active.get(thread_id)
+                    names[thread_id] = thread.name if thread is not None else str(thread_id)
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                stack.append(names[thread_id])
+                self.samples[";".join(reversed(stack))] += 1
+
+    def collapsed(self) -> str:
+        return "\n".join(f"{stack} {count}" for stack, count in self.samples.most_common()) + "\n"
+
+
+def _allocation_report(before: tracemalloc.Snapshot, after: tracemalloc.Snapshot, limit: int) -> str:
+    stats = after.compare_to(before, "lineno")
+    lines = [f"Top {limit} allocation sites by net growth during the request", ""]
+    for stat in stats[:limit]:
+        frame = stat.traceback[0]
+        lines.append(
+            f"{stat.size_diff / 1024:+10.1f} KiB {stat.count_diff:+8d} blocks  {frame.filename}:{frame.lineno}"
+        )
+    return "\n".join(lines) + "\n"
+
+
+class ProfileStore:
+    """The most recent profiles, kept in memory and optionally written to disk"""
+
+    def __init__(self, max_profiles: int, directory: Optional[str]):
+        self.max_profiles = max_profiles
+        self.directory = directory
+        self._profiles: "OrderedDict[str, dict]" = OrderedDict()
+
+    def add(self, profile_id: str, mode: str, path: str, body: str) -> None:
+        filename = f"{profile_id}.{'collapsed.txt' if mode == 'cpu' else 'tracemalloc.txt'}"
+        self._profiles[profile_id] = {
+            "id": profile_id,
+            "mode": mode,
+            "path": path,
+            "created_at": time.time(),
+            "filename": filename,
+            "body": body
+        }
+        if len(self._profiles) > self.max_profiles:
+            self._profiles.popitem(last=False)
+        if self.directory:
+            try:
+                os.makedirs(self.directory, exist_ok=True)
+                with open(os.path.join(self.directory, filename), "w") as f:
+                    f.write(body)
+            except OSError as e:
+                logger.warning(f"Could not write profile {profile_id}: {e}")
+
+    def get(self, profile_id: str) -> Optional[dict]:
+        return self._profiles.get(profile_id)
+
+    def list(self) -> List[dict]:
+        return [
+            {key: value for key, value in profile.items() if key != "body"}
+            for profile in reversed(self._profiles.values())
+        ]
+
+
+# Global store served by /debug/profiles
+profile_store = ProfileStore(settings.profiling_max_stored, settings.profiling_dir)
+
+
+async def _is_admin(scope) -> bool:
+    """Run the regular admin dependency chain against the request's bearer token"""
+    request = Request(scope)
+    scheme, _, credentials = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not credentials:
+        return False
+    try:
+        async with AsyncSessionLocal() as db:
+            user = await get_current_user(
+                request, HTTPAuthorizationCredentials(scheme=scheme, credentials=credentials), db
+            )
+        await get_current_admin_user(user)
+    except HTTPException:
+        return False
+    return True
+
+
+class ProfilingMiddleware:
+    """Profiles single requests that ask for it with an `X-Profile: cpu|memory` header.
+
+    Only admins can profile (the bearer token must pass get_current_admin_user)
+    and only one request is profiled at a time. The response carries
+    `X-Profile-Status` and, when stored, `X-Profile-Id`; download the profile
+    from /debug/profiles/{id}. Requests without the header only pay for one
+    header lookup.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self._busy = asyncio.Lock()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.profiling_enabled:
+            await self.app(scope, receive, send)
+            return
+        mode = next((value.decode().strip().lower() for name, value in scope["headers"] if name == PROFILE_HEADER), None)
+        if mode is None:
+            await self.app(scope, receive, send)
+            return
+    
+        if mode not in PROFILE_MODES:
+            status_value = "unknown-mode"
+        elif not await _is_admin(scope):
+            status_value = "forbidden"
+        elif self._busy.locked():
+            status_value = "busy"
+        else:
+            async with self._busy:
+                await self._profile(scope, receive, send, mode)
+            return
+        await self.app(scope, receive, self._with_headers(send, [(b"x-profile-status", status_value.encode())]))
+
+    @staticmethod
+    def _with_headers(send, extra: list):
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start":
+                message = {**message, "headers": list(message.get("headers", [])) + extra}
+            await send(message)
+        return send_with_headers
+
+    async def _profile(self, scope, receive, send, mode: str) -> None:
+        profile_id = uuid.uuid4().hex[:16]
+        send = self._with_headers(send, [(b"x-profile-status", b"stored"), (b"x-profile-id", profile_id.encode())])
+    
+        if mode == "cpu":
+            sampler = StackSampler(settings.profiling_sample_interval)
+            sampler.start()
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                sampler.stop()
+            body = sampler.collapsed()
+        else:
+            was_tracing = tracemalloc.is_tracing()
+            if not was_tracing:
+                tracemalloc.start(settings.profiling_tracemalloc_frames)
+            before = tracemalloc.take_snapshot()
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                after = tracemalloc.take_snapshot()
+                if not was_tracing:
+                    tracemalloc.stop()
+            body = _allocation_report(before, after, settings.profiling_tracemalloc_top)
+    
+        profile_store.add(profile_id, mode, scope["path"], body)
+        logger.info(f"Stored {mode} profile {profile_id} for {scope['method']} {scope['path']}")
\ No newline at end of file
@@ -0,0 +1,72 @@
+import asyncio
+import logging
+from typing import Callable, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+
+class RedisFanout:
+    """Publishes to one Redis pub/sub channel and listens to it in a background task.
+
+    Every message received is passed to `on_message`. The listener reconnects
+    after a one-second backoff when the connection drops; `on_gap` runs once
+    it is subscribed (again) and after every failure, since anything published
+    while disconnected is unknown, so callers drop state that relied on it.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        channel: str,
+        name: str,
+        on_message: Callable[[bytes], None],
+        on_gap: Callable[[], None]
+    ):
+        self.url = url
+        self.channel = channel
+        self.name = name
+        self.on_message = on_message
+        self.on_gap = on_gap
+        self._redis = None
+        self._listener: Optional[asyncio.Task] = None
+
+    @property
+    def connected(self) -> bool:
+        return self._redis is not None
+
+    async def publish(self, data: Union[str, bytes]) -> None:
+        await self._redis.publish(self.channel, data)
+
+    async def start(self) -> None:
+        if self._listener is not None:
+            return
+        import redis.asyncio as redis
+
+        self._redis = redis.from_url(self.url)
+        self._listener = asyncio.create_task(self._listen(), name=f"{self.name}-listener")
+
+    async def stop(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            await asyncio.gather(self._listener, return_exceptions=True)
+            self._listener = None
+        if self._redis is not None:
+            await self._redis.aclose()
+            self._redis = None
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                pubsub = self._redis.pubsub()
+                await pubsub.subscribe(self.channel)
+                self.on_gap()
+                async for message in pubsub.listen():
+                    if message.get("type") != "message":
+                        continue
+                    self.on_message(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"{self.name} listener lost Redis connection: {e}")
+                self.on_gap()
+                await asyncio.sleep(1.0)
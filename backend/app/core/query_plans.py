@@ -0,0 +1,80 @@
+"""
+EXPLAIN QUERY PLAN check for the team hot-path queries.
+
+Fails when a hot-path query stops using its intended index, e.g. after a
+migration drops it or a router predicate changes shape so the planner falls
+back to a full table scan, or when a paginated query needs a sort step:
+
+    alembic upgrade head && python -m app.core.query_plans
+"""
+
+import sys
+from datetime import datetime
+from typing import List, Tuple
+
+from sqlalchemy import Select
+from sqlalchemy.engine import Engine
+
+from app.core.database import engine
+
+
+def hot_path_queries() -> List[Tuple[str, Select, str]]:
+    """(label, statement, index the plan must use) for each hot-path query"""
+    # Imported here so the routers aren't loaded just to import this module
+    from app.api.team import (
+        active_members_query,
+        members_page_query,
+        pending_invitations_page_query,
+        pending_invitations_query
+    )
+
+    invitation_key = ["i", datetime(2030, 1, 1).isoformat(), 1]
+    return [
+        ("pending invitations", pending_invitations_query(1), "ix_invitations_team_id_pending"),
+        ("pending invitation page", pending_invitations_page_query(1, invitation_key).limit(51), "ix_invitations_team_id_pending"),
+        ("active members", active_members_query(1), "ix_users_team_id_is_active"),
+        ("member page", members_page_query(1, ["m", 1]).limit(51), "ix_users_team_id_is_active"),
+    ]
+
+
+def explain(bind: Engine, statement) -> List[str]:
+    """Return the `detail` column of SQLite's EXPLAIN QUERY PLAN for `statement`"""
+    sql = statement.compile(dialect=bind.dialect, compile_kwargs={"literal_binds": True})
+    with bind.connect() as connection:
+        return [row[-1] for row in connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}")]
+
+
+def check_query_plans(bind: Engine = engine) -> List[str]:
+    """Return a description of every hot-path query not served by its index"""
+    problems = []
+    for label, statement, index_name in hot_path_queries():
+        plan = explain(bind, statement)
+        if not any(index_name in step for step in plan):
+            problems.append(f"{label}: expected {index_name}, got {' | '.join(plan)}")
+        elif any("TEMP B-TREE" in step for step in plan):
+            # The index no longer yields rows in the requested order
+            problems.append(f"{label}: sorts in a temp b-tree, got {' | '.join(plan)}")
+    return problems
+
+
+def main() -> int:
+    if engine.dialect.name != "sqlite":
+        print(f"Query plan check supports SQLite only (configured: {engine.dialect.name})")
+        return 0
+    
+    problems = check_query_plans()
+    for label, statement, _ in hot_path_queries():
+        print(f"{label}: {' | '.join(explain(engine, statement))}")
+    
+    if problems:
+        print()
+        for problem in problems:
+            print(f"❌ {problem}")
+        return 1
+    
+    print("✅ All hot-path queries use their indexes")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -1,9 +1,16 @@
+import asyncio
+import hashlib
+import os
+import time
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Optional, Union
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import HTTPException, status
 from app.core.config import settings
+from app.core.metrics import metrics
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
@@ -48,37 +55,141 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
-def verify_token(token: str, token_type: str = "access") -> dict:
+# bcrypt is deliberately slow, so hashing runs on a bounded worker pool
+# instead of the event loop thread.
+_hash_executor: Optional[Executor] = None
+_hash_workers = 0
+_pending_hashes = 0
+
+admission_rejected = metrics.counter(
+    "auth_admission_rejected_total",
+    "Password-path requests rejected by admission control",
+    ("reason",)
+)
+hash_seconds = metrics.histogram(
+    "password_hash_seconds",
+    "bcrypt hash/verify time, including any wait for a free worker",
+    ("operation",),
+    buckets=(0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1.0, 2.0, 5.0)
+)
+
+
+def _get_hash_executor() -> Executor:
+    global _hash_executor, _hash_workers
+    if _hash_executor is None:
+        _hash_workers = settings.password_hash_workers or os.cpu_count() or 1
+        if settings.password_hash_executor == "process":
+            _hash_executor = ProcessPoolExecutor(max_workers=_hash_workers)
+        else:
+            _hash_executor = ThreadPoolExecutor(max_workers=_hash_workers, thread_name_prefix="bcrypt")
+    return _hash_executor
+
+
+def pending_hash_count() -> int:
+    """bcrypt jobs currently running or queued"""
+    return _pending_hashes
+
+
+def hash_capacity() -> int:
+    """Jobs the hash pool accepts before rejecting: workers plus queue depth"""
+    workers = _hash_workers or settings.password_hash_workers or os.cpu_count() or 1
+    return workers + settings.password_hash_queue_depth
+
+
+async def _run_hash_job(operation: str, func, *args):
+    global _pending_hashes
+    executor = _get_hash_executor()
+    if _pending_hashes >= hash_capacity():
+        admission_rejected.inc(reason="queue_full")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server is busy, please try again shortly",
+            headers={"Retry-After": str(settings.password_hash_retry_after_seconds)}
+        )
+    
+    _pending_hashes += 1
+    started = time.perf_counter()
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        
-        # Check token type
-        if payload.get("type") != token_type:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid token type"
-            )
-        
-        # Check expiration
-        exp = payload.get("exp")
-        if exp is None:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Token missing expiration"
-            )
-        
-        if datetime.utcnow().timestamp() > exp:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Token expired"
-            )
-        
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, func, *args)
+    finally:
+        _pending_hashes -= 1
+        hash_seconds.observe(time.perf_counter() - started, operation=operation)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await _run_hash_job("verify", verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    return await _run_hash_job("hash", get_password_hash, password)
+
+
+def shutdown_password_hasher() -> None:
+    global _hash_executor
+    if _hash_executor is not None:
+        _hash_executor.shutdown(wait=False)
+        _hash_executor = None
+
+
+# Verified access/refresh payloads keyed by a digest of the token, so repeat
+# callers skip the HMAC check and JSON decode. Entries are only returned
+# while the token is unexpired.
+_token_cache: "OrderedDict[bytes, dict]" = OrderedDict()
+
+
+def _token_digest(token: str) -> bytes:
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+
+def _decode_token(token: str) -> dict:
+    key = _token_digest(token)
+    payload = _token_cache.get(key)
+    if payload is not None:
+        _token_cache.move_to_end(key)
         return payload
+    
+    try:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
     except JWTError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials"
         )
+    
+    if settings.token_cache_max_entries > 0 and payload.get("exp") is not None:
+        _token_cache[key] = payload
+        if len(_token_cache) > settings.token_cache_max_entries:
+            _token_cache.popitem(last=False)
+    return payload
+
+
+def verify_token(token: str, token_type: str = "access") -> dict:
+    payload = _decode_token(token)
+    
+    # Check token type
+    if payload.get("type") != token_type:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid token type"
+        )
+    
+    # Check expiration
+    exp = payload.get("exp")
+    if exp is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token missing expiration"
+        )
+    
+    if datetime.utcnow().timestamp() > exp:
+        _token_cache.pop(_token_digest(token), None)
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token expired"
+        )
+    
+    return payload
 
 
 def create_invitation_token(email: str, team_id: str, role: str) -> str:
@@ -86,7 +197,9 @@ def create_invitation_token(email: str, team_id: str, role: str) -> str:
         "email": email,
         "team_id": team_id,
         "role": role,
-        "type": "invitation"
+        "type": "invitation",
+        # Unique per invitation: the token column is unique and bulk invites map ids back by token
+        "jti": os.urandom(8).hex()
     }
     expire = datetime.utcnow() + timedelta(days=7)  # Invitations expire in 7 days
     data.update({"exp": expire})
@@ -0,0 +1,173 @@
+import logging
+import time
+from collections import Counter as StatementCounter
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+from app.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+queries_total = metrics.counter("db_queries_total", "SQL statements executed while serving requests", ("route",))
+query_seconds = metrics.counter("db_query_seconds_total", "Time spent in SQL statements per route", ("route",))
+slow_queries = metrics.counter("db_slow_queries_total", "Statements slower than sql_slow_query_ms")
+budget_exceeded = metrics.counter(
+    "db_query_budget_exceeded_total",
+    "Requests that issued more statements than their route's query budget",
+    ("route",)
+)
+repeated_statements = metrics.counter(
+    "db_repeated_statements_total",
+    "Requests that ran one statement sql_repeated_statement_threshold or more times (likely N+1)",
+    ("route",)
+)
+
+EXPLAIN_PREFIXES = {
+    "sqlite": "EXPLAIN QUERY PLAN ",
+    "postgresql": "EXPLAIN ",
+}
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised when sql_query_budget_strict is set, so a test client surfaces the regression"""
+
+
+class RequestQueryStats:
+    """SQL statements issued on behalf of one request"""
+
+    __slots__ = ("count", "seconds", "statements", "budget")
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.statements = StatementCounter()
+        self.budget: Optional[int] = None
+
+
+_current: ContextVar[Optional[RequestQueryStats]] = ContextVar("request_query_stats", default=None)
+
+
+def current_query_stats() -> Optional[RequestQueryStats]:
+    return _current.get()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # Kept on the execution context, so a statement that raises leaves nothing behind on the connection
+    if context is not None and not conn.info.get("explaining"):
+        context._query_started_at = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # Diagnostic EXPLAINs are not the request's queries: no counts, timings or slow-query log
+    started = getattr(context, "_query_started_at", None)
+    if started is None or conn.info.get("explaining"):
+        return
+    elapsed = time.perf_counter() - started
+    stats = _current.get()
+    if stats is not None:
+        stats.count += 1
+        stats.seconds += elapsed
+        stats.statements[statement] += 1
+    
+    if settings.sql_slow_query_ms and elapsed * 1000 >= settings.sql_slow_query_ms and not executemany:
+        slow_queries.inc()
+        logger.warning(
+            f"Slow query ({elapsed * 1000:.1f} ms): {statement} {parameters!r}\n"
+            f"Plan: {_explain(conn, statement, parameters)}"
+        )
+
+
+def _explain(conn, statement: str, parameters) -> str:
+    prefix = EXPLAIN_PREFIXES.get(conn.dialect.name)
+    if prefix is None or not statement.lstrip().upper().startswith(("SELECT", "WITH")):
+        return "-"
+    conn.info["explaining"] = True
+    try:
+        rows = conn.exec_driver_sql(prefix + statement, parameters).all()
+        return " | ".join(str(row[-1]) for row in rows)
+    except Exception as e:
+        return f"unavailable ({e})"
+    finally:
+        conn.info["explaining"] = False
+
+
+def instrument_engine(sync_engine: Engine) -> None:
+    """Count and time every statement run through `sync_engine` (or an async engine's sync_engine)"""
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def query_budget(max_queries: int):
+    """Route dependency declaring how many statements a request may issue.
+    
+        @router.get("/members", dependencies=[Depends(query_budget(3))])
+    
+    Exceeding it logs a warning, or raises QueryBudgetExceeded when
+    sql_query_budget_strict is set (e.g. in CI).
+    """
+    async def declare_budget():
+        stats = _current.get()
+        if stats is not None:
+            stats.budget = max_queries
+    return declare_budget
+
+
+class SQLStatsMiddleware:
+    """ASGI middleware collecting RequestQueryStats for each HTTP request.
+
+    Reports them in a `Server-Timing: db;dur=…;desc="N queries"` response
+    header and in the db_queries_total / db_query_seconds_total metrics, and
+    checks query budgets and repeated statements once the response is sent.
+    Statements issued while a streaming body is sent count towards the
+    metrics but not the header.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+    
+        stats = RequestQueryStats()
+        token = _current.set(stats)
+    
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((
+                    b"server-timing",
+                    f'db;dur={stats.seconds * 1000:.1f};desc="{stats.count} queries"'.encode()
+                ))
+                message = {**message, "headers": headers}
+            await send(message)
+    
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+        self._record(scope, stats)
+
+    def _record(self, scope, stats: RequestQueryStats) -> None:
+        route = getattr(scope.get("route"), "path", None) or "unmatched"
+        if not stats.count:
+            return
+        queries_total.inc(stats.count, route=route)
+        query_seconds.inc(stats.seconds, route=route)
+    
+        statement, repeats = stats.statements.most_common(1)[0]
+        if repeats >= settings.sql_repeated_statement_threshold:
+            repeated_statements.inc(route=route)
+            logger.warning(f"{route} ran the same statement {repeats} times (possible N+1): {statement}")
+    
+        if stats.budget is not None and stats.count > stats.budget:
+            budget_exceeded.inc(route=route)
+            message = f"{route} issued {stats.count} queries, over its budget of {stats.budget}"
+            if settings.sql_query_budget_strict:
+                raise QueryBudgetExceeded(message)
+            logger.warning(message)
\ No newline at end of file
@@ -0,0 +1,97 @@
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.models.user import User
+
+cache_requests = metrics.counter(
+    "user_cache_requests_total",
+    "Authenticated-user cache lookups",
+    ("result",)
+)
+
+
+class CachedUser:
+    """The authorization-relevant slice of a User row"""
+
+    __slots__ = ("id", "role", "team_id", "is_active", "authz_version", "expires_at")
+
+    def __init__(
+        self,
+        id: int,
+        role: str,
+        team_id: Optional[int],
+        is_active: bool,
+        authz_version: int = 0,
+        expires_at: float = 0.0
+    ):
+        self.id = id
+        self.role = role
+        self.team_id = team_id
+        self.is_active = is_active
+        self.authz_version = authz_version
+        self.expires_at = expires_at
+
+    def __repr__(self):
+        return f"<CachedUser(id={self.id}, role='{self.role}', team_id={self.team_id})>"
+
+
+class UserCache:
+    """TTL + LRU cache of CachedUser entries keyed by user id"""
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[int, CachedUser]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, user_id: int) -> Optional[CachedUser]:
+        entry = self._entries.get(user_id)
+        if entry is not None and entry.expires_at > time.monotonic():
+            self._entries.move_to_end(user_id)
+            self.hits += 1
+            cache_requests.inc(result="hit")
+            return entry
+        if entry is not None:
+            del self._entries[user_id]
+        self.misses += 1
+        cache_requests.inc(result="miss")
+        return None
+
+    def put(self, user: User) -> CachedUser:
+        entry = CachedUser(
+            id=user.id,
+            role=user.role,
+            team_id=user.team_id,
+            is_active=user.is_active,
+            authz_version=user.authz_version or 0,
+            expires_at=time.monotonic() + self.ttl_seconds
+        )
+        self._entries[user.id] = entry
+        self._entries.move_to_end(user.id)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return entry
+
+    def invalidate(self, user_id: int) -> None:
+        self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Global cache used by get_current_user
+user_cache = UserCache(settings.user_cache_max_entries, settings.user_cache_ttl_seconds)
+
+metrics.gauge("user_cache_hit_ratio", "Share of user cache lookups served from memory").set_function(user_cache.hit_rate)
+metrics.gauge("user_cache_entries", "Users currently cached").set_function(user_cache.__len__)
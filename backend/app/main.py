@@ -1,13 +1,27 @@
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse, PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
+from app.core.database import async_engine, replica_router
+from app.core.security import shutdown_password_hasher
+from app.core.authz import authz_versions
+from app.core.sql_stats import SQLStatsMiddleware
+from app.core.http_metrics import HTTPMetricsMiddleware
+from app.core.metrics import metrics
+from app.core.profiling import ProfilingMiddleware
 from app.api.auth import router as auth_router
 from app.api.team import router as team_router
+from app.api.debug import router as debug_router
+from app.services.outbox import outbox_dispatcher
+from app.services.email import email_service
+from app.services.activity import activity_log
+from app.services.team_events import team_events
 
 app = FastAPI(
     title=settings.app_name,
     version=settings.app_version,
-    debug=settings.debug
+    debug=settings.debug,
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware
@@ -19,14 +33,48 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Opt-in single-request profiling for admins (X-Profile header); added before
+# the instrumentation below so it runs inside it and profiles the endpoint only
+app.add_middleware(ProfilingMiddleware)
+# Per-request SQL counts and timings (Server-Timing header, metrics, query budgets)
+app.add_middleware(SQLStatsMiddleware)
+# Outermost, so its latency covers the other middleware too
+app.add_middleware(HTTPMetricsMiddleware)
+
 # Include routers
 app.include_router(auth_router, prefix="/auth", tags=["Authentication"])
 app.include_router(team_router, prefix="/team", tags=["Team Management"])
+app.include_router(debug_router, prefix="/debug", tags=["Debugging"])
+
+@app.on_event("startup")
+async def start_background_workers():
+    if settings.email_outbox_in_process:
+        outbox_dispatcher.start()
+    await authz_versions.start()
+    await team_events.start()
+    activity_log.start()
+    replica_router.start()
+
+@app.on_event("shutdown")
+async def stop_background_workers():
+    await outbox_dispatcher.stop()
+    await email_service.close()
+    shutdown_password_hasher()
+    await authz_versions.stop()
+    await team_events.stop()
+    await activity_log.stop()
+    await replica_router.stop()
+    await async_engine.dispose()
 
 @app.get("/")
 async def root():
     return {"message": "Team Management API", "version": settings.app_version}
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics_endpoint():
+    """Prometheus scrape target"""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
 @app.get("/health")
 async def health_check():
     return {"status": "healthy"}
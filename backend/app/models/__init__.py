@@ -2,5 +2,7 @@ from .user import User
 from .team import Team
 from .invitation import Invitation
 from .activity_log import ActivityLog
+from .activity_rollup import ActivityDailyRollup
+from .email_outbox import EmailOutbox
 
-__all__ = ["User", "Team", "Invitation", "ActivityLog"]
\ No newline at end of file
+__all__ = ["User", "Team", "Invitation", "ActivityLog", "ActivityDailyRollup", "EmailOutbox"]
\ No newline at end of file
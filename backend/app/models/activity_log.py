@@ -5,6 +5,9 @@ from app.core.database import Base
 
 
 class ActivityLog(Base):
+    # Events are stored in monthly partitions (activity_logs_YYYYMM): on Postgres
+    # this is their partitioned parent, on SQLite it stays empty. Written by
+    # app.services.activity_store, not through this model.
     __tablename__ = "activity_logs"
 
     id = Column(Integer, primary_key=True, index=True)
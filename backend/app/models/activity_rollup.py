@@ -0,0 +1,15 @@
+from sqlalchemy import Column, Integer, String, Date, ForeignKey
+from app.core.database import Base
+
+
+class ActivityDailyRollup(Base):
+    """Events per team, day and action, maintained by the activity log writer"""
+    __tablename__ = "activity_daily_rollups"
+
+    team_id = Column(Integer, ForeignKey("teams.id"), primary_key=True)
+    day = Column(Date, primary_key=True)  # UTC
+    action = Column(String(100), primary_key=True)
+    event_count = Column(Integer, default=0, server_default="0", nullable=False)
+
+    def __repr__(self):
+        return f"<ActivityDailyRollup(team_id={self.team_id}, day={self.day}, action='{self.action}')>"
\ No newline at end of file
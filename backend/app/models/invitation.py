@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Index, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
@@ -18,6 +18,17 @@ class Invitation(Base):
     accepted_at = Column(DateTime(timezone=True), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
+    __table_args__ = (
+        # Pending invitations per team: team_id = ? AND is_used = false AND expires_at > ?,
+        # ordered by (expires_at, id) for keyset pagination
+        Index(
+            "ix_invitations_team_id_pending",
+            "team_id", "expires_at", "id",
+            sqlite_where=text("is_used = 0"),
+            postgresql_where=text("is_used = false")
+        ),
+    )
+
     # Relationships
     team = relationship("Team", back_populates="invitations")
     inviter = relationship("User", foreign_keys=[invited_by], back_populates="sent_invitations")
@@ -13,6 +13,11 @@ class Team(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     is_active = Column(Boolean, default=True)
+    # Denormalised counters, updated in the same transaction as the change they track
+    member_count = Column(Integer, default=0, server_default="0", nullable=False)  # active members
+    admin_count = Column(Integer, default=0, server_default="0", nullable=False)  # active admins
+    # Bumped with every change visible in the team's listings; the listings' ETags derive from it
+    version = Column(Integer, default=0, server_default="0", nullable=False)
 
     # Relationships
     creator = relationship("User", foreign_keys=[created_by], back_populates="created_teams")
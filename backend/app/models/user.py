@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
@@ -18,6 +18,13 @@ class User(Base):
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     last_login = Column(DateTime(timezone=True), nullable=True)
     is_active = Column(Boolean, default=True)
+    authz_version = Column(Integer, default=0, server_default="0", nullable=False)  # bumped on role change/removal
+
+    __table_args__ = (
+        Index("ix_users_team_id_is_active", "team_id", "is_active", "id"),  # member listings, keyset by id
+        Index("ix_users_team_id_role_is_active", "team_id", "role", "is_active"),  # admin counts
+        Index("ix_users_email_lower", func.lower(email)),  # case-insensitive existing-user checks on invite
+    )
 
     # Relationships
     team = relationship("Team", foreign_keys=[team_id], back_populates="members")
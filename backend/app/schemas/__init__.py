@@ -2,6 +2,7 @@ from .auth import *
 from .user import *
 from .team import *
 from .invitation import *
+from .activity import *
 
 __all__ = [
     "Token",
@@ -9,11 +10,23 @@ __all__ = [
     "UserLogin",
     "UserRegister",
     "UserResponse",
+    "UserPage",
+    "user_read",
     "UserCreate",
     "UserUpdate",
     "TeamResponse",
     "TeamCreate",
     "InvitationResponse",
+    "InvitationPage",
+    "invitation_read",
     "InvitationCreate",
-    "AcceptInvitation"
+    "AcceptInvitation",
+    "BulkInvitationItem",
+    "BulkInvitationCreate",
+    "BulkInvitationResult",
+    "BulkInvitationResponse",
+    "ActivitySummaryItem",
+    "ActivitySummaryPage",
+    "ActivityEventResponse",
+    "ActivityEventPage"
 ]
\ No newline at end of file
@@ -0,0 +1,34 @@
+from pydantic import BaseModel
+from datetime import date, datetime
+from typing import List, Optional
+
+
+class ActivitySummaryItem(BaseModel):
+    day: date
+    action: str
+    count: int
+
+
+class ActivitySummaryPage(BaseModel):
+    team_id: int
+    items: List[ActivitySummaryItem]  # newest day first
+    next_cursor: Optional[str] = None
+
+
+class ActivityEventResponse(BaseModel):
+    id: int
+    user_id: Optional[int] = None
+    action: str
+    details: Optional[str] = None  # JSON
+    ip_address: Optional[str] = None
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class ActivityEventPage(BaseModel):
+    team_id: int
+    day: date
+    items: List[ActivityEventResponse]  # newest first
+    next_cursor: Optional[str] = None
\ No newline at end of file
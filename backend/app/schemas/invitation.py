@@ -1,6 +1,6 @@
 from pydantic import BaseModel, EmailStr
 from datetime import datetime
-from typing import Optional
+from typing import Any, List, Optional
 
 
 class InvitationBase(BaseModel):
@@ -26,7 +26,47 @@ class InvitationResponse(InvitationBase):
         from_attributes = True
 
 
+# Read path counterpart of InvitationResponse; see user_read in app.schemas.user
+INVITATION_READ_FIELDS = tuple(InvitationResponse.model_fields)
+
+
+def invitation_read(invitation: Any) -> dict:
+    return {name: getattr(invitation, name) for name in INVITATION_READ_FIELDS}
+
+
+class InvitationPage(BaseModel):
+    items: List[InvitationResponse]
+    next_cursor: Optional[str] = None  # pass back as `cursor` for the next page; null on the last page
+
+
 class AcceptInvitation(BaseModel):
     password: str
     first_name: str
-    last_name: str
\ No newline at end of file
+    last_name: str
+
+
+class BulkInvitationItem(BaseModel):
+    # Validated per row by the bulk endpoint so one bad address doesn't reject the batch
+    email: str
+    role: str = "member"
+
+
+class BulkInvitationCreate(BaseModel):
+    team_id: int
+    invitations: List[BulkInvitationItem]
+
+
+class BulkInvitationResult(BaseModel):
+    row: int
+    email: str
+    status: str  # invited, skipped, invalid
+    detail: Optional[str] = None
+    invitation_id: Optional[int] = None
+
+
+class BulkInvitationResponse(BaseModel):
+    team_id: int
+    invited: int
+    skipped: int
+    invalid: int
+    results: List[BulkInvitationResult]
\ No newline at end of file
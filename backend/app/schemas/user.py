@@ -1,5 +1,5 @@
 from pydantic import BaseModel, EmailStr
-from typing import Optional
+from typing import Any, List, Optional
 from datetime import datetime
 
 
@@ -31,4 +31,19 @@ class UserResponse(UserBase):
     is_active: bool
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+
+# Read path: rows loaded from the database were validated when they were written,
+# so listings build plain dicts with UserResponse's fields instead of running
+# model_validate (and its email validation) per row. Serialise with ORJSONResponse.
+USER_READ_FIELDS = tuple(UserResponse.model_fields)
+
+
+def user_read(user: Any) -> dict:
+    return {name: getattr(user, name) for name in USER_READ_FIELDS}
+
+
+class UserPage(BaseModel):
+    items: List[UserResponse]
+    next_cursor: Optional[str] = None  # pass back as `cursor` for the next page; null on the last page
\ No newline at end of file
@@ -0,0 +1,145 @@
+import asyncio
+import json
+import logging
+import time
+from collections import deque
+from datetime import datetime
+from typing import Deque, Optional
+
+from fastapi import Request
+
+from app.core.config import settings
+from app.core.database import async_engine
+from app.core.metrics import metrics
+from app.services.activity_store import prune_expired, write_events
+
+logger = logging.getLogger(__name__)
+
+events_logged = metrics.counter("activity_log_events_total", "Activity events accepted into the buffer")
+events_dropped = metrics.counter(
+    "activity_log_dropped_total",
+    "Activity events discarded instead of written",
+    ("reason",)
+)
+batches_written = metrics.counter("activity_log_batches_total", "Multi-row activity log INSERTs committed")
+
+
+class ActivityLogWriter:
+    """Audit trail writer that keeps INSERTs off the request path.
+
+    `log()` only appends to an in-memory buffer. A background task drains it
+    with one multi-row INSERT per batch, as soon as `batch_size` events are
+    waiting or every `flush_interval` seconds otherwise. When the buffer is
+    full (the database is slow or down), new events are dropped and counted
+    rather than slowing requests down; `stop()` flushes whatever is left.
+    Rows go to the monthly partition of their timestamp and are counted into
+    the daily rollups in the same transaction (see app.services.activity_store);
+    expired partitions are pruned every `maintenance_interval` seconds.
+    """
+
+    def __init__(self, max_buffer: int = None, batch_size: int = None, flush_interval: float = None):
+        self.max_buffer = max_buffer or settings.activity_log_buffer_size
+        self.batch_size = batch_size or settings.activity_log_batch_size
+        self.flush_interval = flush_interval or settings.activity_log_flush_interval
+        self.maintenance_interval = settings.activity_log_maintenance_interval
+        self._next_maintenance = 0.0
+        self._buffer: Deque[dict] = deque()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+
+    def log(
+        self,
+        action: str,
+        request: Optional[Request] = None,
+        user_id: Optional[int] = None,
+        team_id: Optional[int] = None,
+        details: Optional[dict] = None
+    ) -> None:
+        """Record an event; never blocks and never raises"""
+        if not settings.activity_log_enabled:
+            return
+        if len(self._buffer) >= self.max_buffer:
+            events_dropped.inc(reason="buffer_full")
+            return
+        
+        self._buffer.append({
+            "user_id": user_id,
+            "team_id": team_id,
+            "action": action,
+            "details": json.dumps(details) if details else None,
+            "ip_address": request.client.host if request is not None and request.client else None,
+            "user_agent": request.headers.get("user-agent") if request is not None else None,
+            "created_at": datetime.utcnow()
+        })
+        events_logged.inc()
+        if len(self._buffer) >= self.batch_size and self._wakeup is not None:
+            self._wakeup.set()
+
+    def pending(self) -> int:
+        return len(self._buffer)
+
+    def start(self) -> None:
+        if self._task is not None:
+            return
+        self._stopping = False
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run(), name="activity-log-writer")
+
+    async def stop(self) -> None:
+        """Stop the background task and write out everything still buffered"""
+        self._stopping = True
+        if self._task is not None:
+            self._wakeup.set()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        while self._buffer:
+            if not await self.flush():
+                break
+
+    async def flush(self) -> bool:
+        """Write one batch; returns False if the INSERT failed"""
+        batch = [self._buffer.popleft() for _ in range(min(self.batch_size, len(self._buffer)))]
+        if not batch:
+            return True
+        try:
+            async with async_engine.begin() as conn:
+                await conn.run_sync(write_events, batch)
+        except Exception as e:
+            events_dropped.inc(len(batch), reason="write_error")
+            logger.error(f"Failed to write {len(batch)} activity log events: {e}")
+            return False
+        batches_written.inc()
+        return True
+    
+    async def maintain(self) -> None:
+        """Drop partitions past their retention; safe to run from several workers"""
+        try:
+            async with async_engine.begin() as conn:
+                dropped = await conn.run_sync(prune_expired)
+        except Exception as e:
+            logger.error(f"Activity log maintenance failed: {e}")
+            return
+        if dropped:
+            logger.info(f"Dropped expired activity log partitions: {', '.join(dropped)}")
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            if time.monotonic() >= self._next_maintenance:
+                self._next_maintenance = time.monotonic() + self.maintenance_interval
+                await self.maintain()
+            while self._buffer and not self._stopping:
+                await self.flush()
+                if len(self._buffer) < self.batch_size:
+                    break
+
+
+# Global writer used by the routers and auth dependencies
+activity_log = ActivityLogWriter()
+
+metrics.gauge("activity_log_buffer_size", "Activity events waiting to be written").set_function(activity_log.pending)
\ No newline at end of file
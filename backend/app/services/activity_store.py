@@ -0,0 +1,207 @@
+import argparse
+import logging
+import re
+from collections import Counter, defaultdict
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Set
+
+from sqlalchemy import (
+    Column, DateTime, Index, Integer, MetaData, String, Table, Text, delete, func, insert, inspect, select, text
+)
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Connection
+from sqlalchemy.schema import CreateIndex, CreateTable
+
+from app.core.config import settings
+from app.core.database import engine
+from app.models.activity_rollup import ActivityDailyRollup
+
+logger = logging.getLogger(__name__)
+
+# Raw activity events live in one table per calendar month (UTC), so retention
+# is a DROP TABLE instead of a DELETE over millions of rows. On Postgres the
+# monthly tables are native range partitions of activity_logs; on SQLite they
+# are standalone tables. Either way they are written and read by name, so the
+# same statements work on both.
+PARTITION_PREFIX = "activity_logs_"
+_partition_name = re.compile(rf"^{PARTITION_PREFIX}(\d{{4}})(\d{{2}})$")
+_partition_metadata = MetaData()
+_known_partitions: Set[str] = set()
+
+
+def month_start(day: date) -> date:
+    return date(day.year, day.month, 1)
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"{PARTITION_PREFIX}{month:%Y%m}"
+
+
+def partition_table(month: date) -> Table:
+    """Table object for the partition holding `month`; built once per month"""
+    name = partition_name(month)
+    table = _partition_metadata.tables.get(name)
+    if table is None:
+        # No foreign keys: the audit trail must survive users and teams being deleted
+        table = Table(
+            name, _partition_metadata,
+            Column("id", Integer, primary_key=True),
+            Column("user_id", Integer, nullable=True),
+            Column("team_id", Integer, nullable=True),
+            Column("action", String(100), nullable=False),
+            Column("details", Text, nullable=True),
+            Column("ip_address", String(45), nullable=True),
+            Column("user_agent", Text, nullable=True),
+            Column("created_at", DateTime(timezone=True), nullable=False, server_default=func.now()),
+            Index(f"ix_{name}_team_id_created_at", "team_id", "created_at")
+        )
+    return table
+
+
+def ensure_partition(conn: Connection, month: date) -> None:
+    """Create the partition for `month` unless this process already knows it exists"""
+    month = month_start(month)
+    name = partition_name(month)
+    if name in _known_partitions:
+        return
+    if conn.dialect.name == "postgresql":
+        # Inherits columns, primary key and indexes from the partitioned parent
+        conn.execute(text(
+            f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF activity_logs "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+        ))
+    else:
+        table = partition_table(month)
+        conn.execute(CreateTable(table, if_not_exists=True))
+        for index in table.indexes:
+            conn.execute(CreateIndex(index, if_not_exists=True))
+    _known_partitions.add(name)
+
+
+def partition_exists(conn: Connection, month: date) -> bool:
+    name = partition_name(month_start(month))
+    return name in _known_partitions or inspect(conn).has_table(name)
+
+
+def list_partitions(conn: Connection) -> Dict[date, str]:
+    """Existing partitions keyed by the first day of their month"""
+    partitions = {}
+    for name in inspect(conn).get_table_names():
+        match = _partition_name.match(name)
+        if match:
+            partitions[date(int(match.group(1)), int(match.group(2)), 1)] = name
+    return partitions
+
+
+def _rollup_upsert(dialect_name: str):
+    """INSERT … ON CONFLICT adding to an existing (team, day, action) count"""
+    dialect_insert = postgresql_insert if dialect_name == "postgresql" else sqlite_insert
+    statement = dialect_insert(ActivityDailyRollup)
+    return statement.on_conflict_do_update(
+        index_elements=["team_id", "day", "action"],
+        set_={"event_count": ActivityDailyRollup.event_count + statement.excluded.event_count}
+    )
+
+
+def write_events(conn: Connection, events: List[dict]) -> None:
+    """Insert a batch into its monthly partitions and fold it into the daily rollups.
+    
+    Runs in the caller's transaction, so the raw rows and the rollup counts
+    are committed (or lost) together.
+    """
+    by_month = defaultdict(list)
+    for event in events:
+        by_month[month_start(event["created_at"])].append(event)
+    for month, rows in by_month.items():
+        ensure_partition(conn, month)
+        conn.execute(insert(partition_table(month)), rows)
+    
+    # Events without a team (e.g. rejected tokens) are only kept raw
+    counts = Counter(
+        (event["team_id"], event["created_at"].date(), event["action"])
+        for event in events if event["team_id"] is not None
+    )
+    if counts:
+        conn.execute(_rollup_upsert(conn.dialect.name), [
+            {"team_id": team_id, "day": day, "action": action, "event_count": count}
+            for (team_id, day, action), count in counts.items()
+        ])
+
+
+def prune_expired(conn: Connection, today: Optional[date] = None) -> List[str]:
+    """Drop partitions and rollups older than their retention; returns dropped partitions"""
+    today = today or datetime.utcnow().date()
+    oldest_kept = add_months(month_start(today), -settings.activity_log_retention_months)
+    dropped = []
+    for month, name in sorted(list_partitions(conn).items()):
+        if month >= oldest_kept:
+            continue
+        if conn.dialect.name == "postgresql":
+            conn.execute(text(f"ALTER TABLE activity_logs DETACH PARTITION {name}"))
+        conn.execute(text(f"DROP TABLE IF EXISTS {name}"))
+        _known_partitions.discard(name)
+        dropped.append(name)
+    
+    conn.execute(delete(ActivityDailyRollup).where(
+        ActivityDailyRollup.day < today - timedelta(days=settings.activity_rollup_retention_days)
+    ))
+    
+    # Create next month's partition ahead of time, keeping the DDL off the first flush after midnight
+    ensure_partition(conn, add_months(month_start(today), 1))
+    return dropped
+
+
+def rebuild_rollups(conn: Connection, start: date, end: date) -> int:
+    """Recount the rollups for days start..end (inclusive) from the raw partitions"""
+    rebuilt = 0
+    partitions = list_partitions(conn)
+    day = start
+    while day <= end:
+        conn.execute(delete(ActivityDailyRollup).where(ActivityDailyRollup.day == day))
+        month = month_start(day)
+        if month in partitions:
+            table = partition_table(month)
+            rows = conn.execute(
+                select(table.c.team_id, table.c.action, func.count())
+                .where(
+                    table.c.team_id.is_not(None),
+                    table.c.created_at >= datetime.combine(day, datetime.min.time()),
+                    table.c.created_at < datetime.combine(day + timedelta(days=1), datetime.min.time())
+                )
+                .group_by(table.c.team_id, table.c.action)
+            ).all()
+            if rows:
+                conn.execute(insert(ActivityDailyRollup), [
+                    {"team_id": team_id, "day": day, "action": action, "event_count": count}
+                    for team_id, action, count in rows
+                ])
+                rebuilt += len(rows)
+        day += timedelta(days=1)
+    return rebuilt
+
+
+if __name__ == "__main__":
+    # Maintenance: python -m app.services.activity_store prune
+    #              python -m app.services.activity_store rebuild-rollups --start 2026-10-01 [--end 2026-10-17]
+    parser = argparse.ArgumentParser(description="Manage activity log partitions and daily rollups")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+    subcommands.add_parser("prune", help="drop partitions and rollups past their retention")
+    rebuild = subcommands.add_parser("rebuild-rollups", help="recount daily rollups from the raw partitions")
+    rebuild.add_argument("--start", type=date.fromisoformat, required=True)
+    rebuild.add_argument("--end", type=date.fromisoformat, default=None)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    
+    with engine.begin() as conn:
+        if args.command == "prune":
+            dropped = prune_expired(conn)
+            logger.info(f"Dropped {len(dropped)} partition(s): {', '.join(dropped) or '-'}")
+        else:
+            rows = rebuild_rollups(conn, args.start, args.end or datetime.utcnow().date())
+            logger.info(f"Rebuilt {rows} rollup row(s)")
\ No newline at end of file
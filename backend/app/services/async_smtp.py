@@ -0,0 +1,248 @@
+import asyncio
+import base64
+import logging
+import smtplib
+import ssl
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Union
+
+from app.services.smtp_pool import RECONNECT_ERRORS, PooledConnection, PoolTimeout
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncSMTPClient:
+    """Minimal SMTP client on asyncio streams.
+
+    Speaks just enough ESMTP for transactional mail (EHLO, STARTTLS, AUTH
+    PLAIN/LOGIN, MAIL/RCPT/DATA, NOOP, QUIT) and raises the same
+    `smtplib` exceptions as the blocking client, so callers can handle
+    both transports alike. STARTTLS needs Python 3.11+ (`StreamWriter.start_tls`).
+    """
+
+    def __init__(self, host: str, port: int, timeout: float = 30.0, local_hostname: str = "localhost"):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.local_hostname = local_hostname
+        self.extensions: Dict[str, str] = {}
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+
+    async def connect(self) -> None:
+        try:
+            self._reader, self._writer = await asyncio.wait_for(
+                asyncio.open_connection(self.host, self.port),
+                timeout=self.timeout
+            )
+        except asyncio.TimeoutError:
+            raise TimeoutError(f"Timed out connecting to {self.host}:{self.port}")
+        code, message = await self._read_reply()
+        if code != 220:
+            await self.close()
+            raise smtplib.SMTPConnectError(code, message)
+        await self.ehlo()
+
+    async def _read_reply(self) -> tuple[int, bytes]:
+        lines = []
+        while True:
+            try:
+                line = await asyncio.wait_for(self._reader.readline(), timeout=self.timeout)
+            except asyncio.TimeoutError:
+                raise TimeoutError(f"Timed out waiting for {self.host}")
+            if not line:
+                raise smtplib.SMTPServerDisconnected("Connection unexpectedly closed")
+            lines.append(line[4:].strip())
+            if line[3:4] != b"-":
+                return int(line[:3]), b"\n".join(lines)
+
+    async def command(self, line: str) -> tuple[int, bytes]:
+        if self._writer is None:
+            raise smtplib.SMTPServerDisconnected("Not connected")
+        self._writer.write(f"{line}\r\n".encode())
+        await self._writer.drain()
+        return await self._read_reply()
+
+    async def _expect(self, line: str, *codes: int) -> bytes:
+        code, message = await self.command(line)
+        if code not in codes:
+            raise smtplib.SMTPResponseException(code, message)
+        return message
+
+    async def ehlo(self) -> None:
+        message = await self._expect(f"EHLO {self.local_hostname}", 250)
+        self.extensions = {}
+        for line in message.decode(errors="replace").split("\n")[1:]:
+            name, _, params = line.partition(" ")
+            self.extensions[name.upper()] = params
+
+    async def starttls(self, context: Optional[ssl.SSLContext] = None) -> None:
+        if "STARTTLS" not in self.extensions:
+            raise smtplib.SMTPNotSupportedError("STARTTLS extension not supported by server")
+        await self._expect("STARTTLS", 220)
+        await self._writer.start_tls(context or ssl.create_default_context(), server_hostname=self.host)
+        await self.ehlo()
+
+    async def login(self, username: str, password: str) -> None:
+        methods = self.extensions.get("AUTH", "").upper().split()
+        if "PLAIN" in methods or not methods:
+            token = base64.b64encode(f"\0{username}\0{password}".encode()).decode()
+            code, message = await self.command(f"AUTH PLAIN {token}")
+        else:
+            await self._expect("AUTH LOGIN", 334)
+            await self._expect(base64.b64encode(username.encode()).decode(), 334)
+            code, message = await self.command(base64.b64encode(password.encode()).decode())
+        if code not in (235, 503):
+            raise smtplib.SMTPAuthenticationError(code, message)
+
+    async def noop(self) -> tuple[int, bytes]:
+        return await self.command("NOOP")
+
+    async def sendmail(self, from_addr: str, to_addrs: Union[str, List[str]], msg: str) -> dict:
+        if isinstance(to_addrs, str):
+            to_addrs = [to_addrs]
+
+        await self._expect(f"MAIL FROM:<{from_addr}>", 250)
+        refused = {}
+        for recipient in to_addrs:
+            code, message = await self.command(f"RCPT TO:<{recipient}>")
+            if code not in (250, 251):
+                refused[recipient] = (code, message)
+        if len(refused) == len(to_addrs):
+            await self.command("RSET")
+            raise smtplib.SMTPRecipientsRefused(refused)
+
+        await self._expect("DATA", 354)
+        data = smtplib.quotedata(msg)
+        if not data.endswith("\r\n"):
+            data += "\r\n"
+        self._writer.write(data.encode("utf-8") + b".\r\n")
+        await self._writer.drain()
+        code, message = await self._read_reply()
+        if code != 250:
+            await self.command("RSET")
+            raise smtplib.SMTPDataError(code, message)
+        return refused
+
+    async def close(self) -> None:
+        if self._writer is None:
+            return
+        writer, self._writer = self._writer, None
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except Exception:
+            pass
+
+    async def quit(self) -> None:
+        try:
+            await self.command("QUIT")
+        except Exception:
+            pass
+        await self.close()
+
+
+async def _async_noop(client: AsyncSMTPClient) -> bool:
+    code, _ = await client.noop()
+    return code == 250
+
+
+class AsyncSMTPConnectionPool:
+    """asyncio counterpart of SMTPConnectionPool with the same recycling rules"""
+
+    def __init__(
+        self,
+        connect: Callable[[], Awaitable[AsyncSMTPClient]],
+        max_size: int = 4,
+        idle_timeout: float = 60.0,
+        max_messages: int = 100,
+        health_check_interval: float = 10.0,
+        acquire_timeout: Optional[float] = 30.0
+    ):
+        self._connect = connect
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.max_messages = max_messages
+        self.health_check_interval = health_check_interval
+        self.acquire_timeout = acquire_timeout
+        self._slots = asyncio.Semaphore(max_size)
+        self._idle: List[PooledConnection] = []
+        self.connections_opened = 0
+
+    async def _open(self) -> PooledConnection:
+        connection = PooledConnection(await self._connect())
+        self.connections_opened += 1
+        return connection
+
+    async def _discard(self, connection: PooledConnection) -> None:
+        await connection.client.quit()
+
+    async def _is_usable(self, connection: PooledConnection) -> bool:
+        idle_for = time.monotonic() - connection.last_used
+        if idle_for > self.idle_timeout or connection.messages_sent >= self.max_messages:
+            return False
+        if idle_for < self.health_check_interval:
+            return True
+        try:
+            return await _async_noop(connection.client)
+        except Exception:
+            return False
+
+    async def _checkout(self) -> PooledConnection:
+        try:
+            await asyncio.wait_for(self._slots.acquire(), timeout=self.acquire_timeout)
+        except asyncio.TimeoutError:
+            raise PoolTimeout(f"No SMTP connection available after {self.acquire_timeout}s")
+        try:
+            while self._idle:
+                connection = self._idle.pop()
+                if await self._is_usable(connection):
+                    return connection
+                await self._discard(connection)
+            return await self._open()
+        except BaseException:
+            self._slots.release()
+            raise
+
+    async def _checkin(self, connection: PooledConnection, discard: bool = False) -> None:
+        try:
+            if discard or connection.messages_sent >= self.max_messages:
+                await self._discard(connection)
+            else:
+                connection.last_used = time.monotonic()
+                self._idle.append(connection)
+        finally:
+            self._slots.release()
+
+    async def run(self, operation: Callable[[AsyncSMTPClient], Awaitable[Any]]) -> Any:
+        """Await `operation(client)` on a pooled session, reconnecting once if it was dropped"""
+        for attempt in range(2):
+            connection = await self._checkout()
+            reused = connection.messages_sent > 0
+            try:
+                result = await operation(connection.client)
+            except RECONNECT_ERRORS as e:
+                await self._checkin(connection, discard=True)
+                if reused and attempt == 0:
+                    logger.info(f"Pooled SMTP session dropped ({e}); reconnecting")
+                    continue
+                raise
+            except smtplib.SMTPException:
+                # SMTP-level errors (e.g. refused recipients) leave the session usable
+                await self._checkin(connection)
+                raise
+            except BaseException:
+                # Cancelled or failed mid-conversation; the session state is unknown
+                await self._checkin(connection, discard=True)
+                raise
+            connection.messages_sent += 1
+            await self._checkin(connection)
+            return result
+
+    async def sendmail(self, from_addr: str, to_addrs, msg: str) -> dict:
+        return await self.run(lambda client: client.sendmail(from_addr, to_addrs, msg))
+
+    async def close(self) -> None:
+        idle, self._idle = self._idle, []
+        for connection in idle:
+            await self._discard(connection)
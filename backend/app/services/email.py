@@ -7,9 +7,26 @@ from app.core.config import settings
 import logging
 import yagmail
 import traceback
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from app.core.metrics import metrics
+from app.services.smtp_pool import SMTPConnectionPool
+from app.services.async_smtp import AsyncSMTPClient, AsyncSMTPConnectionPool
 
 logger = logging.getLogger(__name__)
 
+send_attempts = metrics.counter("email_send_attempts_total", "Delivery attempts per sending method", ("method",))
+send_successes = metrics.counter("email_send_success_total", "Emails delivered per sending method", ("method",))
+send_fallbacks = metrics.counter("email_send_fallbacks_total", "Emails delivered by a method other than the first choice")
+send_failures = metrics.counter("email_send_failures_total", "Emails no method could deliver")
+send_seconds = metrics.histogram(
+    "email_send_duration_seconds",
+    "Time per delivery attempt",
+    ("method", "result"),
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+)
+
 class EmailService:
     def __init__(self):
         self.smtp_host = settings.smtp_host
@@ -18,6 +35,125 @@ class EmailService:
         self.smtp_password = settings.smtp_password
         self.from_email = settings.smtp_from_email
         self.from_name = settings.smtp_from_name
+        self._smtp_pool: Optional[SMTPConnectionPool] = None
+        self._yagmail: Optional[yagmail.SMTP] = None
+        self._yagmail_pool: Optional[SMTPConnectionPool] = None
+        self._async_smtp_pool: Optional[AsyncSMTPConnectionPool] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    async def _run_blocking(self, func, *args):
+        """Run a blocking smtplib/yagmail call off the event loop"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=settings.email_thread_pool_size,
+                thread_name_prefix="email"
+            )
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+
+    def _create_pool(self, connect) -> SMTPConnectionPool:
+        return SMTPConnectionPool(
+            connect=connect,
+            max_size=settings.smtp_pool_size,
+            idle_timeout=settings.smtp_pool_idle_timeout,
+            max_messages=settings.smtp_pool_max_messages if settings.smtp_pool_enabled else 1,
+            health_check_interval=settings.smtp_pool_health_check_seconds,
+            acquire_timeout=settings.smtp_timeout
+        )
+
+    def _open_smtp_connection(self) -> smtplib.SMTP:
+        """Open an authenticated STARTTLS session to the configured SMTP host"""
+        context = ssl.create_default_context()
+        
+        # Outlook/Office365 specific optimizations
+        if "outlook" in self.smtp_host.lower() or "office365" in self.smtp_host.lower():
+            print(f"📧 Using Outlook-optimized SMTP settings for {self.smtp_host}")
+        
+        server = smtplib.SMTP(self.smtp_host, self.smtp_port, timeout=settings.smtp_timeout)
+        try:
+            # Enable debug for troubleshooting
+            server.set_debuglevel(0)
+            
+            # Start TLS
+            server.starttls(context=context)
+            
+            # Authenticate
+            if self.smtp_username and self.smtp_password:
+                print(f"📧 Authenticating with {self.smtp_username}")
+                server.login(self.smtp_username, self.smtp_password)
+                print(f"✅ SMTP authentication successful")
+        except Exception:
+            server.close()
+            raise
+        return server
+
+    def _open_yagmail_connection(self) -> smtplib.SMTP:
+        """Open an authenticated SSL session to the YagMail (Gmail) host"""
+        yag = self._get_yagmail()
+        server = smtplib.SMTP_SSL(
+            yag.host,
+            int(yag.port),
+            timeout=settings.smtp_timeout,
+            context=ssl.create_default_context()
+        )
+        try:
+            server.login(self.smtp_username, self.smtp_password)
+        except Exception:
+            server.close()
+            raise
+        return server
+
+    async def _open_async_smtp_connection(self) -> AsyncSMTPClient:
+        """Open an authenticated STARTTLS session on asyncio streams"""
+        client = AsyncSMTPClient(self.smtp_host, self.smtp_port, timeout=settings.smtp_timeout)
+        await client.connect()
+        try:
+            await client.starttls(ssl.create_default_context())
+            if self.smtp_username and self.smtp_password:
+                await client.login(self.smtp_username, self.smtp_password)
+        except BaseException:
+            await client.close()
+            raise
+        return client
+
+    def _get_smtp_pool(self) -> SMTPConnectionPool:
+        if self._smtp_pool is None:
+            self._smtp_pool = self._create_pool(self._open_smtp_connection)
+        return self._smtp_pool
+
+    def _get_yagmail(self) -> yagmail.SMTP:
+        # Only used to compose messages; sessions come from the YagMail pool
+        if self._yagmail is None:
+            self._yagmail = yagmail.SMTP(self.smtp_username, self.smtp_password)
+        return self._yagmail
+
+    def _get_yagmail_pool(self) -> SMTPConnectionPool:
+        if self._yagmail_pool is None:
+            self._yagmail_pool = self._create_pool(self._open_yagmail_connection)
+        return self._yagmail_pool
+
+    def _get_async_smtp_pool(self) -> AsyncSMTPConnectionPool:
+        if self._async_smtp_pool is None:
+            self._async_smtp_pool = AsyncSMTPConnectionPool(
+                connect=self._open_async_smtp_connection,
+                max_size=settings.smtp_pool_size,
+                idle_timeout=settings.smtp_pool_idle_timeout,
+                max_messages=settings.smtp_pool_max_messages if settings.smtp_pool_enabled else 1,
+                health_check_interval=settings.smtp_pool_health_check_seconds,
+                acquire_timeout=settings.smtp_timeout
+            )
+        return self._async_smtp_pool
+
+    async def close(self) -> None:
+        """Close pooled SMTP sessions and the blocking-send thread pool"""
+        if self._async_smtp_pool is not None:
+            await self._async_smtp_pool.close()
+        for pool in (self._smtp_pool, self._yagmail_pool):
+            if pool is not None:
+                await self._run_blocking(pool.close)
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
 
     async def send_email(
         self, 
@@ -43,6 +179,8 @@ class EmailService:
             
             {text_content or html_content[:200]}...
             """)
+            send_attempts.inc(method="development")
+            send_successes.inc(method="development")
             return True, "Development mode - email logged"
 
         # Try multiple email sending methods
@@ -58,21 +196,29 @@ class EmailService:
                 ("SMTP (Standard)", self._send_with_smtp),
             ]
         
-        for method_name, send_method in methods:
+        for attempt, (method_name, send_method) in enumerate(methods):
+            send_attempts.inc(method=method_name)
+            started = time.perf_counter()
             try:
                 print(f"📧 Attempting to send email using {method_name}...")
                 success = await send_method(to_email, subject, html_content, text_content)
+                send_seconds.observe(time.perf_counter() - started, method=method_name, result="sent" if success else "failed")
                 if success:
+                    send_successes.inc(method=method_name)
+                    if attempt > 0:
+                        send_fallbacks.inc()
                     logger.info(f"Email sent successfully to {to_email} using {method_name}")
                     print(f"✅ Email sent successfully to {to_email} using {method_name}")
                     return True, f"Sent via {method_name}"
             except Exception as e:
+                send_seconds.observe(time.perf_counter() - started, method=method_name, result="error")
                 error_msg = f"{method_name} failed: {str(e)}"
                 logger.warning(error_msg)
                 print(f"⚠️ {error_msg}")
                 continue
         
         # All methods failed
+        send_failures.inc()
         error_msg = "All email sending methods failed"
         logger.error(f"Failed to send email to {to_email}: {error_msg}")
         print(f"❌ Failed to send email to {to_email}")
@@ -81,23 +227,26 @@ class EmailService:
     async def _send_with_yagmail(self, to_email: str, subject: str, html_content: str, text_content: str = None) -> bool:
         """Send email using YagMail (easier Gmail integration)"""
         try:
-            yag = yagmail.SMTP(self.smtp_username, self.smtp_password)
-            
-            # Use HTML content or fallback to text
-            content = html_content if html_content else text_content
-            
-            yag.send(
-                to=to_email,
-                subject=subject,
-                contents=content
-            )
-            yag.close()
+            await self._run_blocking(self._send_with_yagmail_blocking, to_email, subject, html_content, text_content)
             return True
         except Exception as e:
             print(f"YagMail error: {str(e)}")
             traceback.print_exc()
             raise
 
+    def _send_with_yagmail_blocking(self, to_email: str, subject: str, html_content: str, text_content: str = None) -> None:
+        yag = self._get_yagmail()
+        
+        # Use HTML content or fallback to text
+        content = html_content if html_content else text_content
+        
+        recipients, message = yag.prepare_send(
+            to=to_email,
+            subject=subject,
+            contents=content
+        )
+        self._get_yagmail_pool().sendmail(yag.user, recipients, message)
+
     async def _send_with_smtp(self, to_email: str, subject: str, html_content: str, text_content: str = None) -> bool:
         """Send email using standard SMTP (optimized for Outlook)"""
         try:
@@ -119,29 +268,15 @@ class EmailService:
             html_part = MIMEText(html_content, "html", "utf-8")
             message.attach(html_part)
 
-            # Send email with enhanced error handling
-            context = ssl.create_default_context()
-            
-            # Outlook/Office365 specific optimizations
-            if "outlook" in self.smtp_host.lower() or "office365" in self.smtp_host.lower():
-                print(f"📧 Using Outlook-optimized SMTP settings for {self.smtp_host}")
-            
-            with smtplib.SMTP(self.smtp_host, self.smtp_port) as server:
-                # Enable debug for troubleshooting
-                server.set_debuglevel(0)
-                
-                # Start TLS
-                server.starttls(context=context)
-                
-                # Authenticate
-                if self.smtp_username and self.smtp_password:
-                    print(f"📧 Authenticating with {self.smtp_username}")
-                    server.login(self.smtp_username, self.smtp_password)
-                    print(f"✅ SMTP authentication successful")
-                
-                # Send email
-                server.sendmail(self.from_email, to_email, message.as_string())
-                print(f"✅ Email sent successfully via SMTP")
+            # Send email over a pooled, already authenticated session without
+            # blocking the event loop
+            if settings.email_transport == "asyncio":
+                await self._get_async_smtp_pool().sendmail(self.from_email, to_email, message.as_string())
+            else:
+                await self._run_blocking(
+                    self._get_smtp_pool().sendmail, self.from_email, to_email, message.as_string()
+                )
+            print(f"✅ Email sent successfully via SMTP")
                 
             return True
         except smtplib.SMTPAuthenticationError as e:
@@ -167,10 +302,11 @@ class EmailService:
         to_email: str, 
         sister_name: str, 
         invitation_link: str,
+        team_name: str
     ) -> tuple[bool, Optional[str]]:
         """Send a mehram check"""
         
-        subject = f"You've Been Registered As A Mehram{team_name}!"
+        subject = f"You've Been Registered As A Mehram for {team_name}!"
         
         # Text version
         text_content = f"""
@@ -0,0 +1,260 @@
+import asyncio
+import json
+import logging
+import random
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from sqlalchemy import and_, insert, or_
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.email_outbox import EmailOutbox
+from app.services.email import email_service
+
+logger = logging.getLogger(__name__)
+
+PENDING = "pending"
+SENDING = "sending"
+SENT = "sent"
+FAILED = "failed"
+
+# Errors that retrying cannot fix: a payload that does not fit the sender's
+# signature, undecodable JSON or an unknown message kind
+PERMANENT_ERRORS = (TypeError, ValueError, KeyError)
+
+
+def enqueue_email(
+    db: Session,
+    kind: str,
+    to_email: str,
+    payload: dict,
+    invitation_id: Optional[int] = None
+) -> EmailOutbox:
+    """Add an email to the outbox; it is delivered once the caller's transaction commits"""
+    message = EmailOutbox(
+        kind=kind,
+        to_email=to_email,
+        payload=json.dumps(payload),
+        status=PENDING,
+        attempts=0,
+        invitation_id=invitation_id,
+        next_attempt_at=datetime.utcnow()
+    )
+    db.add(message)
+    return message
+
+
+def enqueue_emails(db: Session, messages: List[dict]) -> None:
+    """Add many emails to the outbox with a single batched INSERT.
+
+    Each message is a dict with `kind`, `to_email`, `payload` and optionally
+    `invitation_id`, as accepted by `enqueue_email`.
+    """
+    if not messages:
+        return
+    now = datetime.utcnow()
+    db.execute(insert(EmailOutbox), [
+        {
+            "kind": message["kind"],
+            "to_email": message["to_email"],
+            "payload": json.dumps(message["payload"]),
+            "status": PENDING,
+            "attempts": 0,
+            "invitation_id": message.get("invitation_id"),
+            "next_attempt_at": now
+        }
+        for message in messages
+    ])
+
+
+def _due_filter(now: datetime):
+    # Pending messages whose backoff has elapsed, plus messages whose worker
+    # died mid-send and never released its lease.
+    return or_(
+        and_(EmailOutbox.status == PENDING, EmailOutbox.next_attempt_at <= now),
+        and_(EmailOutbox.status == SENDING, EmailOutbox.locked_until < now)
+    )
+
+
+def claim_messages(db: Session, limit: int = 1) -> List[EmailOutbox]:
+    """Lease up to `limit` due messages for this worker.
+
+    Each row is claimed with a conditional UPDATE so that several workers,
+    in this process or in others, never deliver the same message twice.
+    """
+    now = datetime.utcnow()
+    candidate_ids = [
+        row.id for row in db.query(EmailOutbox.id)
+        .filter(_due_filter(now))
+        .order_by(EmailOutbox.next_attempt_at)
+        .limit(limit)
+        .all()
+    ]
+
+    claimed_ids = []
+    for message_id in candidate_ids:
+        updated = db.query(EmailOutbox).filter(
+            EmailOutbox.id == message_id,
+            _due_filter(now)
+        ).update({
+            EmailOutbox.status: SENDING,
+            EmailOutbox.locked_until: now + timedelta(seconds=settings.email_outbox_lease_seconds),
+            EmailOutbox.attempts: EmailOutbox.attempts + 1
+        }, synchronize_session=False)
+        if updated:
+            claimed_ids.append(message_id)
+    db.commit()
+
+    if not claimed_ids:
+        return []
+    return db.query(EmailOutbox).filter(EmailOutbox.id.in_(claimed_ids)).all()
+
+
+def mark_sent(db: Session, message_id: int) -> None:
+    db.query(EmailOutbox).filter(EmailOutbox.id == message_id).update({
+        EmailOutbox.status: SENT,
+        EmailOutbox.sent_at: datetime.utcnow(),
+        EmailOutbox.locked_until: None,
+        EmailOutbox.last_error: None
+    }, synchronize_session=False)
+    db.commit()
+
+
+def mark_failed(db: Session, message_id: int, attempts: int, error: str, permanent: bool = False) -> None:
+    """Schedule a retry with exponential backoff, or give up after max attempts or a permanent error"""
+    if permanent or attempts >= settings.email_outbox_max_attempts:
+        values = {EmailOutbox.status: FAILED}
+    else:
+        delay = min(
+            settings.email_outbox_backoff_seconds * (2 ** (attempts - 1)),
+            settings.email_outbox_backoff_max_seconds
+        )
+        delay *= random.uniform(0.8, 1.2)
+        values = {
+            EmailOutbox.status: PENDING,
+            EmailOutbox.next_attempt_at: datetime.utcnow() + timedelta(seconds=delay)
+        }
+    values[EmailOutbox.locked_until] = None
+    values[EmailOutbox.last_error] = error
+    db.query(EmailOutbox).filter(EmailOutbox.id == message_id).update(values, synchronize_session=False)
+    db.commit()
+
+
+def _with_session(func, *args):
+    db = SessionLocal()
+    try:
+        return func(db, *args)
+    finally:
+        db.close()
+
+
+async def deliver(message: EmailOutbox) -> tuple[bool, Optional[str]]:
+    """Render and send a single outbox message"""
+    payload = json.loads(message.payload)
+    if message.kind == "team_invitation":
+        return await email_service.send_team_invitation(**payload)
+    if message.kind == "email":
+        return await email_service.send_email(**payload)
+    raise ValueError(f"Unknown outbox message kind: {message.kind}")
+
+
+class OutboxDispatcher:
+    """Pool of delivery workers draining the email outbox table"""
+
+    def __init__(self, workers: int = None, poll_interval: float = None):
+        self.workers = workers or settings.email_outbox_workers
+        self.poll_interval = poll_interval or settings.email_outbox_poll_interval
+        self._tasks: List[asyncio.Task] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._stopping = False
+
+    def start(self) -> None:
+        if self._tasks:
+            return
+        self._stopping = False
+        self._wakeup = asyncio.Event()
+        self._tasks = [
+            asyncio.create_task(self._worker(i), name=f"email-outbox-{i}")
+            for i in range(self.workers)
+        ]
+        logger.info(f"Started {self.workers} email outbox workers")
+
+    async def stop(self) -> None:
+        self._stopping = True
+        if self._wakeup:
+            self._wakeup.set()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def notify(self) -> None:
+        """Wake idle workers after new messages were committed"""
+        if self._wakeup:
+            self._wakeup.set()
+
+    async def run_forever(self) -> None:
+        self.start()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def _worker(self, worker_id: int) -> None:
+        while not self._stopping:
+            try:
+                messages = await run_in_threadpool(
+                    _with_session, claim_messages, settings.email_outbox_batch_size
+                )
+            except Exception as e:
+                logger.error(f"Email outbox worker {worker_id} failed to claim messages: {e}")
+                messages = []
+
+            if not messages:
+                await self._idle()
+                continue
+
+            # Sends in a batch overlap; the SMTP pool bounds actual concurrency
+            await asyncio.gather(*(self._process(message) for message in messages))
+
+    async def _idle(self) -> None:
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+        except asyncio.TimeoutError:
+            pass
+        self._wakeup.clear()
+
+    async def _process(self, message: EmailOutbox) -> None:
+        permanent = False
+        try:
+            success, detail = await deliver(message)
+        except PERMANENT_ERRORS as e:
+            success, detail, permanent = False, f"{type(e).__name__}: {e}", True
+        except Exception as e:
+            success, detail = False, str(e)
+
+        try:
+            if success:
+                await run_in_threadpool(_with_session, mark_sent, message.id)
+                logger.info(f"Outbox message {message.id} delivered to {message.to_email}")
+            else:
+                await run_in_threadpool(
+                    _with_session, mark_failed, message.id, message.attempts, detail or "", permanent
+                )
+                logger.warning(
+                    f"Outbox message {message.id} to {message.to_email} failed "
+                    f"({'permanently' if permanent else f'attempt {message.attempts}'}): {detail}"
+                )
+        except Exception as e:
+            # The lease expires and another worker picks the message up again
+            logger.error(f"Failed to record outbox status for message {message.id}: {e}")
+
+
+# Global dispatcher used by the API process
+outbox_dispatcher = OutboxDispatcher()
+
+
+if __name__ == "__main__":
+    # Standalone delivery process: python -m app.services.outbox
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(outbox_dispatcher.run_forever())
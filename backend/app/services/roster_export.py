@@ -0,0 +1,75 @@
+import csv
+import io
+import zlib
+from datetime import datetime
+from typing import AsyncIterator, Iterable, List, Optional
+
+import orjson
+from sqlalchemy import Select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+
+EXPORT_FORMATS = {
+    "csv": "text/csv",  # Starlette appends "; charset=utf-8" to text types
+    "ndjson": "application/x-ndjson",
+}
+EXPORT_COLUMNS = (
+    "type", "id", "email", "first_name", "last_name", "role", "status", "created_at", "last_login", "expires_at"
+)
+# Spreadsheet apps evaluate cells starting with these; names and emails are user-supplied
+_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+async def stream_rows(db: AsyncSession, query: Select, row_type: str) -> AsyncIterator[List[dict]]:
+    """Yield `query`'s rows as export dicts, one batch of export_batch_size at a time.
+    
+    Rows come from a server-side cursor (yield_per), so only the current batch
+    is held in memory however large the team is.
+    """
+    result = await db.stream(query.execution_options(yield_per=settings.export_batch_size))
+    async for partition in result.mappings().partitions():
+        yield [{"type": row_type, **row} for row in partition]
+
+
+def _cell(value) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    value = str(value)
+    return "'" + value if value.startswith(_FORMULA_PREFIXES) else value
+
+
+def encode_csv(rows: Iterable[dict], header: bool = False) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(EXPORT_COLUMNS)
+    writer.writerows([_cell(row.get(column)) for column in EXPORT_COLUMNS] for row in rows)
+    return buffer.getvalue().encode()
+
+
+def encode_ndjson(rows: Iterable[dict], header: bool = False) -> bytes:
+    return b"".join(
+        orjson.dumps({column: row.get(column) for column in EXPORT_COLUMNS}) + b"\n" for row in rows
+    )
+
+
+async def encode_export(batches: AsyncIterator[List[dict]], export_format: str) -> AsyncIterator[bytes]:
+    """One encoded chunk per batch; the CSV header goes out before the first row"""
+    encode = encode_csv if export_format == "csv" else encode_ndjson
+    if export_format == "csv":
+        yield encode([], header=True)
+    async for rows in batches:
+        yield encode(rows)
+
+
+async def gzip_chunks(chunks: AsyncIterator[bytes], level: Optional[int] = None) -> AsyncIterator[bytes]:
+    """Compress a byte stream on the fly into a single gzip member"""
+    compressor = zlib.compressobj(settings.export_gzip_level if level is None else level, zlib.DEFLATED, 31)
+    async for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
\ No newline at end of file
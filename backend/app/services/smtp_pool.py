@@ -0,0 +1,152 @@
+import logging
+import smtplib
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Errors that mean the session is gone and a fresh connection may succeed
+RECONNECT_ERRORS = (smtplib.SMTPServerDisconnected, ConnectionError, TimeoutError)
+
+
+class PoolTimeout(Exception):
+    """Raised when no SMTP connection becomes available in time"""
+
+
+class PooledConnection:
+    __slots__ = ("client", "created_at", "last_used", "messages_sent")
+
+    def __init__(self, client: Any):
+        now = time.monotonic()
+        self.client = client
+        self.created_at = now
+        self.last_used = now
+        self.messages_sent = 0
+
+
+def _smtp_noop(client: smtplib.SMTP) -> bool:
+    code, _ = client.noop()
+    return code == 250
+
+
+def _smtp_close(client: smtplib.SMTP) -> None:
+    try:
+        client.quit()
+    except Exception:
+        try:
+            client.close()
+        except Exception:
+            pass
+
+
+class SMTPConnectionPool:
+    """Bounded pool of authenticated SMTP sessions.
+
+    Idle sessions are reused LIFO, checked with NOOP once they have been idle
+    for `health_check_interval` seconds, closed after `idle_timeout` seconds
+    or `max_messages` sends, and transparently replaced when the server has
+    dropped them. With `max_messages=1` every send gets its own session,
+    which is the unpooled behaviour.
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[], Any],
+        max_size: int = 4,
+        idle_timeout: float = 60.0,
+        max_messages: int = 100,
+        health_check_interval: float = 10.0,
+        acquire_timeout: Optional[float] = 30.0,
+        noop: Callable[[Any], bool] = _smtp_noop,
+        close: Callable[[Any], None] = _smtp_close
+    ):
+        self._connect = connect
+        self._noop = noop
+        self._close = close
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.max_messages = max_messages
+        self.health_check_interval = health_check_interval
+        self.acquire_timeout = acquire_timeout
+        self._slots = threading.BoundedSemaphore(max_size)
+        self._idle: deque = deque()
+        self._lock = threading.Lock()
+        self.connections_opened = 0
+
+    def _open(self) -> PooledConnection:
+        connection = PooledConnection(self._connect())
+        self.connections_opened += 1
+        return connection
+
+    def _discard(self, connection: PooledConnection) -> None:
+        self._close(connection.client)
+
+    def _is_usable(self, connection: PooledConnection, now: float) -> bool:
+        idle_for = now - connection.last_used
+        if idle_for > self.idle_timeout or connection.messages_sent >= self.max_messages:
+            return False
+        if idle_for < self.health_check_interval:
+            return True
+        try:
+            return self._noop(connection.client)
+        except Exception:
+            return False
+
+    def _checkout(self) -> PooledConnection:
+        if not self._slots.acquire(timeout=self.acquire_timeout):
+            raise PoolTimeout(f"No SMTP connection available after {self.acquire_timeout}s")
+        try:
+            while True:
+                with self._lock:
+                    connection = self._idle.pop() if self._idle else None
+                if connection is None:
+                    return self._open()
+                if self._is_usable(connection, time.monotonic()):
+                    return connection
+                self._discard(connection)
+        except Exception:
+            self._slots.release()
+            raise
+
+    def _checkin(self, connection: PooledConnection, discard: bool = False) -> None:
+        try:
+            if discard or connection.messages_sent >= self.max_messages:
+                self._discard(connection)
+            else:
+                connection.last_used = time.monotonic()
+                with self._lock:
+                    self._idle.append(connection)
+        finally:
+            self._slots.release()
+
+    def run(self, operation: Callable[[Any], Any]) -> Any:
+        """Run `operation(client)` on a pooled session, reconnecting once if it was dropped"""
+        for attempt in range(2):
+            connection = self._checkout()
+            reused = connection.messages_sent > 0
+            try:
+                result = operation(connection.client)
+            except RECONNECT_ERRORS as e:
+                self._checkin(connection, discard=True)
+                if reused and attempt == 0:
+                    logger.info(f"Pooled SMTP session dropped ({e}); reconnecting")
+                    continue
+                raise
+            except Exception:
+                self._checkin(connection)
+                raise
+            connection.messages_sent += 1
+            self._checkin(connection)
+            return result
+
+    def sendmail(self, from_addr: str, to_addrs, msg: str) -> dict:
+        return self.run(lambda client: client.sendmail(from_addr, to_addrs, msg))
+
+    def close(self) -> None:
+        """Close every idle session"""
+        with self._lock:
+            idle, self._idle = list(self._idle), deque()
+        for connection in idle:
+            self._discard(connection)
@@ -0,0 +1,117 @@
+import argparse
+import logging
+from typing import List, Optional
+
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.database import SessionLocal
+from app.models.team import Team
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+
+def counter_update(team_id: int, members: int = 0, admins: int = 0):
+    """UPDATE applying counter deltas in SQL, so concurrent writers never lose an increment.
+
+    Also bumps the team version: every counted change alters the listings.
+    """
+    values = {"version": Team.version + 1}
+    if members:
+        values["member_count"] = Team.member_count + members
+    if admins:
+        values["admin_count"] = Team.admin_count + admins
+    return update(Team).where(Team.id == team_id).values(**values)
+
+
+async def adjust_team_counters(db: AsyncSession, team_id: int, **deltas) -> None:
+    """Apply counter deltas inside the caller's transaction"""
+    if any(deltas.values()):
+        await db.execute(counter_update(team_id, **deltas))
+
+
+async def bump_team_version(db: AsyncSession, team_id: Optional[int]) -> None:
+    """Invalidate the team's listing ETags for a change that moves no counter"""
+    if team_id is not None:
+        await db.execute(update(Team).where(Team.id == team_id).values(version=Team.version + 1))
+
+
+async def release_admin(db: AsyncSession, team_id: int, members: int = 0) -> bool:
+    """Decrement admin_count unless that would leave the team without an admin.
+
+    The check and the decrement are one conditional UPDATE, so two admins
+    demoting each other concurrently cannot both succeed. Returns False when
+    the team is down to its last admin.
+    """
+    result = await db.execute(
+        counter_update(team_id, members=members, admins=-1).where(Team.admin_count > 1)
+    )
+    return result.rowcount == 1
+
+
+def _actual_counts():
+    members = select(func.count()).select_from(User).where(
+        User.team_id == Team.id,
+        User.is_active == True
+    ).scalar_subquery()
+    admins = select(func.count()).select_from(User).where(
+        User.team_id == Team.id,
+        User.role == "admin",
+        User.is_active == True
+    ).scalar_subquery()
+    return members, admins
+
+
+def reconcile_team_counters(db: Session, dry_run: bool = False) -> List[dict]:
+    """Recount every team and repair counters that drifted"""
+    members, admins = _actual_counts()
+    rows = db.execute(select(
+        Team.id,
+        Team.member_count, members,
+        Team.admin_count, admins
+    )).all()
+    
+    drift = [
+        {
+            "team_id": team_id,
+            "member_count": (stored_members, actual_members),
+            "admin_count": (stored_admins, actual_admins)
+        }
+        for team_id, stored_members, actual_members, stored_admins, actual_admins in rows
+        if (stored_members, stored_admins) != (actual_members, actual_admins)
+    ]
+    
+    if drift and not dry_run:
+        # Recount inside the UPDATE itself so writes since the read above aren't clobbered
+        db.execute(
+            update(Team)
+            .where(Team.id.in_([entry["team_id"] for entry in drift]))
+            .values(
+                member_count=members,
+                admin_count=admins,
+                version=Team.version + 1
+            )
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+    return drift
+
+
+if __name__ == "__main__":
+    # Repair drifted counters: python -m app.services.team_counters [--dry-run]
+    parser = argparse.ArgumentParser(description="Recount team member and admin counters")
+    parser.add_argument("--dry-run", action="store_true", help="report drift without fixing it")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    
+    with SessionLocal() as db:
+        drift = reconcile_team_counters(db, dry_run=args.dry_run)
+    for entry in drift:
+        team_id = entry.pop("team_id")
+        changes = ", ".join(
+            f"{name} {stored} -> {actual}" for name, (stored, actual) in entry.items() if stored != actual
+        )
+        logger.info(f"Team {team_id}: {changes}")
+    logger.info(f"{len(drift)} team(s) {'drifted' if args.dry_run else 'repaired'}")
\ No newline at end of file
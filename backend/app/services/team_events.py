@@ -0,0 +1,150 @@
+import asyncio
+import logging
+import uuid
+from collections import OrderedDict, deque
+from typing import Deque, Dict, List, Optional, Set, Tuple
+
+import orjson
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.core.pubsub import RedisFanout
+
+logger = logging.getLogger(__name__)
+
+events_published = metrics.counter("team_events_published_total", "Team events published by this worker", ("type",))
+subscribers_dropped = metrics.counter(
+    "team_events_subscribers_dropped_total",
+    "Event streams closed because the client fell too far behind"
+)
+subscriber_gauge = metrics.gauge("team_events_subscribers", "Open team event streams on this worker")
+
+RESET_EVENT = "stream.reset"
+
+
+class TeamEvent:
+    """One membership change, serialised once and shared by every subscriber"""
+
+    __slots__ = ("id", "team_id", "type", "data", "frame")
+
+    def __init__(self, event_id: str, team_id: int, event_type: str, data: dict):
+        self.id = event_id
+        self.team_id = team_id
+        self.type = event_type
+        self.data = data
+        self.frame = (
+            f"id: {event_id}\nevent: {event_type}\ndata: ".encode()
+            + orjson.dumps({"team_id": team_id, **data})
+            + b"\n\n"
+        )
+
+
+class Subscription:
+    def __init__(self, team_id: int, max_queued: int):
+        self.team_id = team_id
+        self.queue: "asyncio.Queue[TeamEvent]" = asyncio.Queue(max_queued)
+        self.overflowed = False
+
+
+class TeamEventHub:
+    """In-process fan-out of team membership events to open SSE streams.
+
+    Each team keeps its last `history_size` events so a reconnecting client
+    can resume after its Last-Event-ID. Event ids are opaque; a client whose
+    id is no longer (or was never) in the history gets a `stream.reset`
+    event and should refetch the listings. When Redis fan-out is enabled,
+    events are published on a channel so streams on every worker see
+    changes made by any of them.
+    """
+
+    def __init__(self, history_size: int, max_queued: int, redis_url: Optional[str], channel: str):
+        self.history_size = history_size
+        self.max_queued = max_queued
+        self.origin = uuid.uuid4().hex
+        self._history: "OrderedDict[int, Deque[TeamEvent]]" = OrderedDict()
+        self._subscribers: Dict[int, Set[Subscription]] = {}
+        # Events missed while disconnected are unknown; resumes from before the gap will reset
+        self._fanout = RedisFanout(
+            redis_url, channel, "team-event", self._on_message, self._history.clear
+        ) if redis_url else None
+
+    async def publish(self, team_id: Optional[int], event_type: str, data: dict) -> None:
+        """Deliver an event locally and fan it out; call after the change is committed"""
+        if team_id is None:
+            return
+        event = TeamEvent(uuid.uuid4().hex[:16], team_id, event_type, data)
+        self._deliver(event)
+        events_published.inc(type=event_type)
+        if self._fanout is not None and self._fanout.connected:
+            try:
+                await self._fanout.publish(orjson.dumps({
+                    "origin": self.origin, "id": event.id, "team_id": team_id, "type": event_type, "data": data
+                }))
+            except Exception as e:
+                logger.warning(f"Failed to publish team event {event_type} for team {team_id}: {e}")
+
+    def _deliver(self, event: TeamEvent) -> None:
+        history = self._history.get(event.team_id)
+        if history is None:
+            history = self._history[event.team_id] = deque(maxlen=self.history_size)
+            # Bound memory across teams too; the least recently active team forgets first
+            if len(self._history) > settings.team_events_history_teams:
+                self._history.popitem(last=False)
+        else:
+            self._history.move_to_end(event.team_id)
+        history.append(event)
+    
+        for subscription in self._subscribers.get(event.team_id, ()):
+            if subscription.overflowed:
+                continue
+            try:
+                subscription.queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # Never block publishers on a slow client; its stream resets instead
+                subscription.overflowed = True
+                subscribers_dropped.inc()
+
+    def subscribe(self, team_id: int, last_event_id: Optional[str] = None) -> Tuple[Subscription, List[TeamEvent], bool]:
+        """Register a stream; returns it, the events to replay, and whether the client must reset"""
+        subscription = Subscription(team_id, self.max_queued)
+        self._subscribers.setdefault(team_id, set()).add(subscription)
+        subscriber_gauge.inc()
+    
+        if not last_event_id:
+            return subscription, [], False
+        history = list(self._history.get(team_id, ()))
+        for position, event in enumerate(history):
+            if event.id == last_event_id:
+                return subscription, history[position + 1:], False
+        return subscription, [], True
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        subscribers = self._subscribers.get(subscription.team_id)
+        if subscribers is None or subscription not in subscribers:
+            return
+        subscribers.discard(subscription)
+        if not subscribers:
+            del self._subscribers[subscription.team_id]
+        subscriber_gauge.dec()
+
+    def _on_message(self, data: bytes) -> None:
+        payload = orjson.loads(data)
+        if payload["origin"] != self.origin:
+            self._deliver(TeamEvent(payload["id"], payload["team_id"], payload["type"], payload["data"]))
+
+    async def start(self) -> None:
+        if self._fanout is not None:
+            await self._fanout.start()
+
+    async def stop(self) -> None:
+        if self._fanout is not None:
+            await self._fanout.stop()
+
+
+# Global hub; Redis fan-out makes events from every worker visible on every stream
+team_events = TeamEventHub(
+    history_size=settings.team_events_history_size,
+    max_queued=settings.team_events_max_queued,
+    redis_url=settings.redis_url if settings.team_events_redis_fanout else None,
+    channel=settings.team_events_redis_channel
+)
\ No newline at end of file
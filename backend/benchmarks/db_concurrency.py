@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+SQLite read/write concurrency benchmark
+
+Runs writer processes (a last_login update plus a batch of invitation
+inserts per transaction) alongside async reader tasks (team member listings)
+against a scratch SQLite file, once per journal mode, and reports read
+throughput and latency while writes are in flight.
+
+    python benchmarks/db_concurrency.py --seconds 5 --writers 4 --readers 16
+
+Each mode runs in its own interpreter because the engine reads its pragmas
+from settings at import time.
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+
+
+def write_loop(worker: int, args, team_id: int, deadline: float, writes, errors) -> None:
+    """One writer process: a last_login update plus a batch of invitations per transaction"""
+    from sqlalchemy import insert, update
+    from app.core.database import SessionLocal, engine
+    from app.models import Invitation, User
+
+    engine.dispose(close=False)  # don't share the parent's connections across fork
+    sequence = 0
+    while time.time() < deadline:
+        sequence += 1
+        db = SessionLocal()
+        try:
+            db.execute(
+                update(User)
+                .where(User.id == (sequence * args.writers + worker) % args.users + 1)
+                .values(last_login=datetime.utcnow())
+            )
+            db.execute(insert(Invitation), [
+                {
+                    "email": f"w{worker}-{sequence}-{row}@example.com",
+                    "role": "member",
+                    "team_id": team_id,
+                    "token": f"bench-{worker}-{sequence}-{row}",
+                    "expires_at": datetime.utcnow() + timedelta(days=7),
+                    "is_used": False,
+                    "invited_by": 1
+                }
+                for row in range(args.batch)
+            ])
+            time.sleep(args.hold)  # request work inside the transaction
+            db.commit()
+            with writes.get_lock():
+                writes.value += 1
+        except Exception:
+            db.rollback()
+            with errors.get_lock():
+                errors.value += 1
+        finally:
+            db.close()
+
+
+async def run_mode(args) -> dict:
+    from sqlalchemy import insert, select
+    from app.core.database import AsyncSessionLocal, Base, async_engine, engine
+    from app.core.metrics import metrics
+    from app.models import Team, User
+
+    Base.metadata.create_all(engine)
+    async with AsyncSessionLocal() as db:
+        team = Team(name="Bench", created_by=1)
+        db.add(team)
+        await db.flush()
+        await db.execute(insert(User), [
+            {
+                "email": f"user{i}@example.com",
+                "password_hash": "x",
+                "first_name": "Bench",
+                "last_name": str(i),
+                "role": "member",
+                "team_id": team.id,
+                "is_active": True
+            }
+            for i in range(args.users)
+        ])
+        await db.commit()
+        team_id = team.id
+
+    # Writers run in separate processes, like separate uvicorn workers
+    deadline = time.time() + args.seconds
+    writes = multiprocessing.Value("i", 0)
+    write_errors = multiprocessing.Value("i", 0)
+    writers = [
+        multiprocessing.Process(target=write_loop, args=(i, args, team_id, deadline, writes, write_errors))
+        for i in range(args.writers)
+    ]
+    for process in writers:
+        process.start()
+
+    read_latencies = []
+    read_errors = 0
+
+    async def reader():
+        nonlocal read_errors
+        while time.time() < deadline:
+            started = time.perf_counter()
+            try:
+                async with AsyncSessionLocal() as db:
+                    (await db.scalars(select(User).where(
+                        User.team_id == team_id,
+                        User.is_active == True
+                    ))).all()
+                read_latencies.append(time.perf_counter() - started)
+            except Exception:
+                read_errors += 1
+
+    await asyncio.gather(*(reader() for _ in range(args.readers)))
+    for process in writers:
+        process.join()
+    await async_engine.dispose()
+
+    read_latencies.sort()
+    return {
+        "reads_per_second": len(read_latencies) / args.seconds,
+        "read_p50_ms": statistics.median(read_latencies) * 1000 if read_latencies else 0.0,
+        "read_p99_ms": read_latencies[int(len(read_latencies) * 0.99) - 1] * 1000 if read_latencies else 0.0,
+        "read_max_ms": read_latencies[-1] * 1000 if read_latencies else 0.0,
+        "writes_per_second": writes.value / args.seconds,
+        "errors": write_errors.value + read_errors,
+        "pool_wait_seconds": metrics.counter("db_pool_wait_seconds_total", "").value(pool="async")
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--readers", type=int, default=16)
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--batch", type=int, default=200, help="invitations inserted per write transaction")
+    parser.add_argument("--hold", type=float, default=0.002, help="seconds each write transaction stays open")
+    parser.add_argument("--modes", default="delete,wal", help="journal modes to compare")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(asyncio.run(run_mode(args))))
+        return
+
+    results = {}
+    for mode in args.modes.split(","):
+        with tempfile.TemporaryDirectory() as scratch:
+            env = {
+                **os.environ,
+                "DATABASE_URL": f"sqlite:///{os.path.join(scratch, 'bench.db')}",
+                "SQLITE_JOURNAL_MODE": mode,
+                "EMAIL_OUTBOX_IN_PROCESS": "false"
+            }
+            output = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), "--child", *sys.argv[1:]],
+                env=env, cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+            ).stdout
+        results[mode] = json.loads(output.strip().splitlines()[-1])
+
+    print(f"{'mode':>7} {'reads/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8} {'writes/s':>9} {'errors':>7}")
+    for mode, r in results.items():
+        print(
+            f"{mode:>7} {r['reads_per_second']:9.0f} {r['read_p50_ms']:8.2f} {r['read_p99_ms']:8.2f} "
+            f"{r['read_max_ms']:8.2f} {r['writes_per_second']:9.0f} {r['errors']:7d}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Roster export memory benchmark
+
+Compares exporting a whole team by loading every member and invitation and
+rendering one JSON array (what paging /team/members into a single document
+amounts to) with the streaming /team/export body (server-side cursor, one
+encoded chunk per batch), on a scratch SQLite team of 10k/100k rows split
+evenly between members and pending invitations. Peak traced memory should
+stay flat for the streaming export as the team grows.
+
+    python benchmarks/export.py --sizes 10000,100000
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+SCRATCH = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(SCRATCH, 'bench.db')}"
+
+import orjson  # noqa: E402
+from sqlalchemy import delete, insert, select  # noqa: E402
+
+from app.api.team import _roster_batches  # noqa: E402
+from app.core.database import AsyncSessionLocal, Base, SessionLocal, engine  # noqa: E402
+from app.models import Invitation, Team, User  # noqa: E402
+from app.schemas.invitation import invitation_read  # noqa: E402
+from app.schemas.user import user_read  # noqa: E402
+from app.services.roster_export import encode_export, gzip_chunks  # noqa: E402
+
+
+def seed(rows: int) -> int:
+    with SessionLocal() as db:
+        db.execute(delete(Invitation))
+        db.execute(delete(User))
+        db.execute(delete(Team))
+        members = rows // 2
+        team = Team(name="Bench", created_by=1, member_count=members)
+        db.add(team)
+        db.flush()
+        db.execute(insert(User), [
+            {
+                "email": f"member{i}@example.com",
+                "password_hash": "$2b$12$" + "x" * 53,
+                "first_name": "Bench",
+                "last_name": f"Member {i}",
+                "role": "member",
+                "team_id": team.id,
+                "is_active": True
+            }
+            for i in range(members)
+        ])
+        expires_at = datetime.utcnow() + timedelta(days=7)
+        db.execute(insert(Invitation), [
+            {
+                "email": f"invitee{i}@example.com",
+                "role": "member",
+                "team_id": team.id,
+                "token": f"token-{i}-" + "x" * 200,
+                "expires_at": expires_at + timedelta(seconds=i),
+                "is_used": False,
+                "invited_by": 1
+            }
+            for i in range(rows - members)
+        ])
+        db.commit()
+        return team.id
+
+
+async def materialised(team_id: int) -> int:
+    async with AsyncSessionLocal() as db:
+        members = (await db.scalars(select(User).where(User.team_id == team_id, User.is_active == True))).all()
+        invitations = (await db.scalars(select(Invitation).where(Invitation.team_id == team_id))).all()
+        body = orjson.dumps([user_read(m) for m in members] + [invitation_read(i) for i in invitations])
+        return len(body)
+
+
+async def streamed(team_id: int, export_format: str, gzipped: bool) -> int:
+    async with AsyncSessionLocal() as db:
+        body = encode_export(_roster_batches(db, team_id, "all"), export_format)
+        if gzipped:
+            body = gzip_chunks(body)
+        size = 0
+        async for chunk in body:
+            size += len(chunk)
+        return size
+
+
+def measure(func, *args):
+    """Wall time, peak traced allocation and body size of one run"""
+    tracemalloc.start()
+    started = time.perf_counter()
+    size = asyncio.run(func(*args))
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed * 1000, peak / 1024 / 1024, size / 1024 / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="10000,100000")
+    args = parser.parse_args()
+
+    Base.metadata.create_all(engine)
+    variants = (
+        ("json array", materialised, ()),
+        ("csv stream", streamed, ("csv", False)),
+        ("ndjson stream", streamed, ("ndjson", False)),
+        ("csv.gz stream", streamed, ("csv", True)),
+    )
+    print(f"{'rows':>7} {'variant':>14} {'ms':>9} {'peak MiB':>9} {'body MiB':>9}")
+    for size in (int(s) for s in args.sizes.split(",")):
+        team_id = seed(size)
+        for label, func, extra in variants:
+            ms, peak, body = measure(func, team_id, *extra)
+            print(f"{size:>7} {label:>14} {ms:9.1f} {peak:9.1f} {body:9.1f}")
+
+
+if __name__ == "__main__":
+    main()
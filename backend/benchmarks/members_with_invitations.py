@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+members-with-invitations listing benchmark
+
+Compares the previous implementation (two ORM entity queries, full User and
+Invitation rows, dicts built in Python, then jsonable_encoder) with the
+single UNION ALL projection query, on a scratch SQLite team of 1k/10k/100k
+rows split evenly between members and pending invitations. Both variants
+read the whole listing so the comparison isolates the query shape; the last
+column shows one 50-row page of the paginated endpoint.
+
+    python benchmarks/members_with_invitations.py --sizes 1000,10000,100000
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+SCRATCH = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(SCRATCH, 'bench.db')}"
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from sqlalchemy import delete, insert  # noqa: E402
+
+from app.api.team import listing_items, members_with_invitations_query  # noqa: E402
+from app.core.database import Base, SessionLocal, engine  # noqa: E402
+from app.models import Invitation, Team, User  # noqa: E402
+
+
+def seed(rows: int) -> int:
+    with SessionLocal() as db:
+        db.execute(delete(Invitation))
+        db.execute(delete(User))
+        db.execute(delete(Team))
+        members = rows // 2
+        team = Team(name="Bench", created_by=1, member_count=members)
+        db.add(team)
+        db.flush()
+        db.execute(insert(User), [
+            {
+                "email": f"member{i}@example.com",
+                "password_hash": "$2b$12$" + "x" * 53,
+                "first_name": "Bench",
+                "last_name": f"Member {i}",
+                "role": "member",
+                "team_id": team.id,
+                "is_active": True
+            }
+            for i in range(members)
+        ])
+        expires_at = datetime.utcnow() + timedelta(days=7)
+        db.execute(insert(Invitation), [
+            {
+                "email": f"invitee{i}@example.com",
+                "role": "member",
+                "team_id": team.id,
+                "token": f"token-{i}-" + "x" * 200,
+                "expires_at": expires_at + timedelta(seconds=i),
+                "is_used": False,
+                "invited_by": 1
+            }
+            for i in range(rows - members)
+        ])
+        db.commit()
+        return team.id
+
+
+def before(team_id: int) -> str:
+    """The listing as implemented before the projection query"""
+    with SessionLocal() as db:
+        members = db.query(User).filter(User.team_id == team_id, User.is_active == True).all()
+        pending_invitations = db.query(Invitation).filter(
+            Invitation.team_id == team_id,
+            Invitation.is_used == False,
+            Invitation.expires_at > datetime.utcnow()
+        ).all()
+        result = []
+        for member in members:
+            result.append({
+                "id": member.id, "email": member.email, "first_name": member.first_name,
+                "last_name": member.last_name, "role": member.role, "status": "active",
+                "type": "member", "joined_at": member.created_at, "invitation_id": None
+            })
+        for invitation in pending_invitations:
+            result.append({
+                "id": None, "email": invitation.email, "first_name": None, "last_name": None,
+                "role": invitation.role, "status": "pending", "type": "invitation", "joined_at": None,
+                "invitation_id": invitation.id, "invited_at": invitation.created_at,
+                "expires_at": invitation.expires_at
+            })
+        body = {
+            "team_id": team_id,
+            "members_and_invitations": result,
+            "total_members": len(members),
+            "pending_invitations": len(pending_invitations)
+        }
+        return json.dumps(jsonable_encoder(body))
+
+
+def after(team_id: int, limit: int) -> str:
+    """The projection query, serialised the way the endpoint does"""
+    with SessionLocal() as db:
+        rows = db.execute(members_with_invitations_query(team_id, None, limit)).all()
+        result = listing_items(rows[:limit])
+        return json.dumps({
+            "team_id": team_id,
+            "members_and_invitations": result,
+            "total_members": rows[0].total_members,
+            "pending_invitations": rows[0].pending_invitations
+        })
+
+
+def measure(func, *args, repeat: int = 3):
+    """Best-of-`repeat` wall time and the peak traced allocation of one run"""
+    func(*args)
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - started)
+    tracemalloc.start()
+    func(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best * 1000, peak / 1024 / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="1000,10000,100000")
+    parser.add_argument("--page-size", type=int, default=50)
+    args = parser.parse_args()
+
+    Base.metadata.create_all(engine)
+    print(f"{'rows':>7} {'before ms':>10} {'before MiB':>11} {'after ms':>9} {'after MiB':>10} {'page ms':>8}")
+    for size in (int(s) for s in args.sizes.split(",")):
+        team_id = seed(size)
+        before_ms, before_mib = measure(before, team_id)
+        after_ms, after_mib = measure(after, team_id, size)
+        page_ms, _ = measure(after, team_id, args.page_size)
+        print(f"{size:>7} {before_ms:10.1f} {before_mib:11.1f} {after_ms:9.1f} {after_mib:10.1f} {page_ms:8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Member listing serialisation benchmark
+
+Serialises one page of N members the way /team/members used to (model_validate
+per row, FastAPI's response_model validation, stdlib json) and the way it does
+now (plain read-model dicts rendered by ORJSONResponse), and checks both
+produce the same JSON document.
+
+    python benchmarks/serialization.py --members 10000
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+
+from fastapi.responses import JSONResponse, ORJSONResponse  # noqa: E402
+from fastapi.routing import serialize_response  # noqa: E402
+from fastapi.utils import create_response_field  # noqa: E402
+
+from app.models import User  # noqa: E402
+from app.schemas.user import UserPage, UserResponse, user_read  # noqa: E402
+
+
+def make_members(count: int) -> list:
+    joined = datetime(2026, 1, 1, 9, 30, 15, 123456)
+    return [
+        User(
+            id=i,
+            email=f"member{i}@example.com",
+            first_name="Bench",
+            last_name=f"Member {i}",
+            role="admin" if i % 20 == 0 else "member",
+            team_id=1,
+            created_at=joined + timedelta(minutes=i),
+            last_login=None if i % 3 else joined + timedelta(days=1, minutes=i),
+            is_active=True
+        )
+        for i in range(1, count + 1)
+    ]
+
+
+def before(members: list) -> bytes:
+    page = UserPage(items=[UserResponse.model_validate(member) for member in members], next_cursor=None)
+    field = create_response_field("Response_get_team_members", UserPage, mode="serialization")
+    content = asyncio.run(serialize_response(field=field, response_content=page))
+    return JSONResponse(content).body
+
+
+def after(members: list) -> bytes:
+    return ORJSONResponse({"items": [user_read(member) for member in members], "next_cursor": None}).body
+
+
+def timed(func, members: list, repeat: int):
+    best, body = float("inf"), None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        body = func(members)
+        best = min(best, time.perf_counter() - started)
+    return best, body
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--members", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    members = make_members(args.members)
+    before_seconds, before_body = timed(before, members, args.repeat)
+    after_seconds, after_body = timed(after, members, args.repeat)
+    assert json.loads(before_body) == json.loads(after_body), "responses differ"
+
+    print(f"{args.members} members")
+    print(f"before: {before_seconds * 1000:8.1f} ms  {len(before_body) / 1024:8.0f} KiB")
+    print(f" after: {after_seconds * 1000:8.1f} ms  {len(after_body) / 1024:8.0f} KiB")
+    print()
+    print(f"🚀 Speedup: {before_seconds / after_seconds:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+SMTP connection pool benchmark
+
+Starts a local SMTP stand-in and measures messages/sec when every send opens
+its own session (the old behaviour) versus reusing pooled sessions.
+
+    python benchmarks/smtp_pool.py --messages 500 --concurrency 4 --handshake-delay 0.05
+
+--handshake-delay emulates the TCP+TLS+AUTH round trips of a real provider.
+"""
+
+import argparse
+import os
+import smtplib
+import socketserver
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.smtp_pool import SMTPConnectionPool  # noqa: E402
+
+
+class SMTPStandInHandler(socketserver.StreamRequestHandler):
+    """Just enough SMTP for smtplib: EHLO/HELO, MAIL, RCPT, DATA, NOOP, RSET, QUIT"""
+
+    handshake_delay = 0.0
+
+    def reply(self, line: str) -> None:
+        self.wfile.write(f"{line}\r\n".encode())
+
+    def handle(self):
+        time.sleep(self.handshake_delay)
+        self.reply("220 stand-in ESMTP")
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode(errors="replace").strip().upper()
+            if command.startswith(("EHLO", "HELO")):
+                self.reply("250 stand-in")
+            elif command == "DATA":
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                while self.rfile.readline() not in (b".\r\n", b".\n", b""):
+                    pass
+                self.reply("250 OK queued")
+            elif command == "QUIT":
+                self.reply("221 Bye")
+                return
+            else:
+                self.reply("250 OK")
+
+
+class SMTPStandIn(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+def run(pool: SMTPConnectionPool, messages: int, concurrency: int) -> float:
+    body = "Subject: benchmark\r\n\r\nhello"
+
+    def send(_):
+        pool.sendmail("bench@example.com", ["to@example.com"], body)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(send, range(messages)))
+    elapsed = time.perf_counter() - start
+    pool.close()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--handshake-delay", type=float, default=0.05)
+    args = parser.parse_args()
+
+    SMTPStandInHandler.handshake_delay = args.handshake_delay
+    server = SMTPStandIn(("127.0.0.1", 0), SMTPStandInHandler)
+    host, port = server.server_address
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    def connect():
+        return smtplib.SMTP(host, port, timeout=10)
+
+    print(f"📡 SMTP stand-in on {host}:{port} (handshake delay {args.handshake_delay * 1000:.0f} ms)")
+    print(f"📨 {args.messages} messages, concurrency {args.concurrency}")
+    print()
+
+    results = {}
+    for label, max_messages in (("unpooled", 1), ("pooled", 100)):
+        pool = SMTPConnectionPool(connect, max_size=args.concurrency, max_messages=max_messages)
+        elapsed = run(pool, args.messages, args.concurrency)
+        results[label] = args.messages / elapsed
+        print(
+            f"{label:>9}: {results[label]:8.1f} msg/s  "
+            f"({elapsed:.2f}s, {pool.connections_opened} connections opened)"
+        )
+
+    print()
+    print(f"🚀 Speedup: {results['pooled'] / results['unpooled']:.1f}x")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
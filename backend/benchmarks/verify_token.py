@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+verify_token micro-benchmark
+
+Compares a cache miss (full HMAC verify + JSON decode) with a cache hit
+(digest + dictionary lookup) for the same access token.
+
+    SECRET_KEY=bench python benchmarks/verify_token.py --iterations 50000
+"""
+
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+
+from app.core import security  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=50000)
+    args = parser.parse_args()
+
+    token = security.create_access_token({"sub": "1", "email": "bench@example.com", "role": "admin"})
+
+    def miss():
+        security._token_cache.clear()
+        security.verify_token(token)
+
+    def hit():
+        security.verify_token(token)
+
+    security.verify_token(token)
+    results = {}
+    for label, func in (("miss", miss), ("hit", hit)):
+        seconds = min(timeit.repeat(func, number=args.iterations, repeat=3))
+        results[label] = seconds / args.iterations * 1e6
+        print(f"{label:>5}: {results[label]:8.2f} µs/call")
+
+    print()
+    print(f"🚀 Speedup: {results['miss'] / results['hit']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+import os
+import sys
+import tempfile
+from types import SimpleNamespace
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+# Settings are read at import time, so the environment has to be in place first
+TEST_DIR = tempfile.mkdtemp(prefix="invite-system-tests-")
+os.environ.update({
+    "SECRET_KEY": "test-secret",
+    "DATABASE_URL": f"sqlite:///{os.path.join(TEST_DIR, 'test.db')}",
+    "AUTH_RATE_LIMIT_IP_PER_MINUTE": "0",
+    "AUTH_RATE_LIMIT_EMAIL_PER_MINUTE": "0",
+    "EMAIL_OUTBOX_IN_PROCESS": "false",
+    "SQL_QUERY_BUDGET_STRICT": "true",
+    "SQL_SLOW_QUERY_MS": "0",
+    "TEAM_EVENTS_HEARTBEAT_SECONDS": "0.2",
+})
+
+import pytest  # noqa: E402
+from alembic import command  # noqa: E402
+from alembic.config import Config  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.core import security  # noqa: E402
+from app.core.authz import authz_versions  # noqa: E402
+from app.core.database import Base, SessionLocal, engine  # noqa: E402
+from app.core.user_cache import user_cache  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models.team import Team  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.services import activity_store  # noqa: E402
+from app.services.activity import activity_log  # noqa: E402
+
+PASSWORD = "correct horse battery"
+
+
+def _migrate() -> None:
+    # No ini file: alembic's logging config would disable the app's loggers
+    config = Config()
+    config.set_main_option("script_location", os.path.join(BACKEND_DIR, "alembic"))
+    config.set_main_option("sqlalchemy.url", os.environ["DATABASE_URL"])
+    command.upgrade(config, "head")
+
+
+@pytest.fixture(scope="session")
+def client():
+    _migrate()
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture(autouse=True)
+def clean_database(client):
+    yield
+    activity_log._buffer.clear()
+    with engine.begin() as conn:
+        for table in Base.metadata.tables.values():
+            conn.execute(table.delete())
+        for name in activity_store.list_partitions(conn).values():
+            conn.exec_driver_sql(f"DROP TABLE {name}")
+    activity_store._known_partitions.clear()
+    # SQLite reuses row ids, so per-user caches must not outlive the rows
+    user_cache.clear()
+    authz_versions._versions.clear()
+    security._token_cache.clear()
+
+
+def auth_headers(client, email: str, password: str = PASSWORD) -> dict:
+    response = client.post("/auth/login", json={"email": email, "password": password})
+    assert response.status_code == 200, response.text
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+@pytest.fixture
+def admin(client):
+    """The first registered user, who owns a new team"""
+    response = client.post("/auth/register", json={
+        "email": "admin@example.com", "password": PASSWORD, "first_name": "Ada", "last_name": "Admin"
+    })
+    assert response.status_code == 200, response.text
+    body = response.json()
+    return SimpleNamespace(
+        id=body["user"]["id"],
+        team_id=body["user"]["team_id"],
+        email="admin@example.com",
+        headers={"Authorization": f"Bearer {body['access_token']}"}
+    )
+
+
+@pytest.fixture
+def other_admin(client, admin):
+    """Admin of a second team; registration is closed once the first user exists"""
+    with SessionLocal() as db:
+        user = User(
+            email="other@example.com",
+            password_hash=security.get_password_hash(PASSWORD),
+            first_name="Otto",
+            last_name="Other",
+            role="admin"
+        )
+        db.add(user)
+        db.flush()
+        team = Team(name="Other team", created_by=user.id, member_count=1, admin_count=1)
+        db.add(team)
+        db.flush()
+        user.team_id = team.id
+        db.commit()
+        user_id, team_id = user.id, team.id
+    return SimpleNamespace(id=user_id, team_id=team_id, email="other@example.com", headers=auth_headers(client, "other@example.com"))
+
+
+@pytest.fixture
+def add_member(client, admin):
+    """Invite and accept a member of the admin's team; returns the new user and its headers"""
+    def add(email: str, role: str = "member") -> SimpleNamespace:
+        response = client.post("/team/invite", json={"email": email, "team_id": admin.team_id, "role": role}, headers=admin.headers)
+        assert response.status_code == 200, response.text
+        response = client.post(f"/team/accept-invitation/{response.json()['token']}", json={
+            "password": PASSWORD, "first_name": "Mem", "last_name": "Ber"
+        })
+        assert response.status_code == 200, response.text
+        return SimpleNamespace(id=response.json()["user"]["id"], email=email, headers=auth_headers(client, email))
+    return add
@@ -0,0 +1,61 @@
+import asyncio
+from datetime import datetime
+
+from sqlalchemy import event, select
+
+from app.core.database import async_engine, engine
+from app.services.activity import ActivityLogWriter
+from app.services.activity_store import month_start, partition_table
+
+
+def _stored_actions() -> list:
+    table = partition_table(month_start(datetime.utcnow().date()))
+    with engine.connect() as conn:
+        return conn.execute(select(table.c.action).order_by(table.c.id)).scalars().all()
+
+
+def test_log_only_buffers_and_drops_when_full(client):
+    writer = ActivityLogWriter(max_buffer=3, batch_size=10)
+    for n in range(5):
+        writer.log(f"test.event{n}", team_id=1)
+    assert writer.pending() == 3
+    assert [event["action"] for event in writer._buffer] == ["test.event0", "test.event1", "test.event2"]
+
+
+def test_batches_are_written_with_one_insert_each(client):
+    writer = ActivityLogWriter(batch_size=3)
+    for n in range(7):
+        writer.log(f"test.event{n}", team_id=1)
+    inserts = []
+    
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("INSERT INTO activity_logs_"):
+            inserts.append(len(parameters) if executemany else 1)
+    
+    event.listen(async_engine.sync_engine, "before_cursor_execute", record)
+    try:
+        asyncio.run(writer.stop())
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", record)
+    
+    assert inserts == [3, 3, 1]
+    assert writer.pending() == 0
+    assert _stored_actions() == [f"test.event{n}" for n in range(7)]
+
+
+def test_background_task_flushes_a_full_batch_without_waiting(client):
+    async def scenario():
+        writer = ActivityLogWriter(batch_size=2, flush_interval=60)
+        writer.start()
+        writer.log("test.first", team_id=1)
+        writer.log("test.second", team_id=1)
+        for _ in range(100):
+            if not writer.pending():
+                break
+            await asyncio.sleep(0.01)
+        pending = writer.pending()
+        await writer.stop()
+        return pending
+    
+    assert asyncio.run(scenario()) == 0
+    assert _stored_actions() == ["test.first", "test.second"]
@@ -0,0 +1,75 @@
+from datetime import date, datetime
+
+from sqlalchemy import select
+
+from app.core.database import engine
+from app.models.activity_rollup import ActivityDailyRollup
+from app.services.activity_store import list_partitions, prune_expired, rebuild_rollups, write_events
+
+
+def _event(action: str, created_at: datetime, team_id=1) -> dict:
+    return {
+        "user_id": None, "team_id": team_id, "action": action, "details": None,
+        "ip_address": None, "user_agent": None, "created_at": created_at
+    }
+
+
+def _rollups(conn) -> dict:
+    rows = conn.execute(select(ActivityDailyRollup.day, ActivityDailyRollup.action, ActivityDailyRollup.event_count))
+    return {(day, action): count for day, action, count in rows}
+
+
+def test_events_land_in_monthly_partitions_and_rollups(client):
+    with engine.begin() as conn:
+        write_events(conn, [
+            _event("team.invite", datetime(2026, 9, 30, 23, 59)),
+            _event("team.invite", datetime(2026, 10, 1, 0, 1)),
+            _event("team.invite", datetime(2026, 10, 1, 9, 0)),
+            _event("auth.token_rejected", datetime(2026, 10, 1, 9, 0), team_id=None),
+        ])
+        write_events(conn, [_event("team.invite", datetime(2026, 10, 1, 12, 0))])
+        
+        assert set(list_partitions(conn)) == {date(2026, 9, 1), date(2026, 10, 1)}
+        # Events without a team stay raw-only
+        assert _rollups(conn) == {
+            (date(2026, 9, 30), "team.invite"): 1,
+            (date(2026, 10, 1), "team.invite"): 3,
+        }
+
+
+def test_prune_drops_expired_partitions_and_prepares_the_next(client):
+    with engine.begin() as conn:
+        write_events(conn, [_event("old", datetime(2025, 1, 15)), _event("recent", datetime(2026, 9, 15))])
+        dropped = prune_expired(conn, today=date(2026, 10, 17))
+        
+        assert dropped == ["activity_logs_202501"]
+        assert set(list_partitions(conn)) == {date(2026, 9, 1), date(2026, 11, 1)}
+        # Rollups outlive their raw partitions
+        assert (date(2025, 1, 15), "old") in _rollups(conn)
+
+
+def test_rollups_can_be_rebuilt_from_the_raw_events(client):
+    with engine.begin() as conn:
+        write_events(conn, [_event("team.invite", datetime(2026, 10, 2, hour)) for hour in range(3)])
+        conn.execute(ActivityDailyRollup.__table__.update().values(event_count=99))
+        
+        assert rebuild_rollups(conn, date(2026, 10, 1), date(2026, 10, 3)) == 1
+        assert _rollups(conn) == {(date(2026, 10, 2), "team.invite"): 3}
+
+
+def test_activity_endpoints_read_rollups_and_partitions(client, admin):
+    today = datetime.utcnow()
+    with engine.begin() as conn:
+        write_events(conn, [_event("test.action", today, team_id=admin.team_id) for _ in range(2)])
+    
+    summary = client.get("/team/activity", params={"team_id": admin.team_id, "action": "test.action"}, headers=admin.headers)
+    assert summary.status_code == 200
+    assert [(item["action"], item["count"]) for item in summary.json()["items"]] == [("test.action", 2)]
+    
+    events = client.get("/team/activity/events", params={
+        "team_id": admin.team_id, "day": today.date().isoformat(), "action": "test.action"
+    }, headers=admin.headers)
+    assert events.status_code == 200 and len(events.json()["items"]) == 2
+    
+    past = client.get("/team/activity/events", params={"team_id": admin.team_id, "day": "2001-01-01"}, headers=admin.headers)
+    assert past.status_code == 200 and past.json()["items"] == []
@@ -0,0 +1,68 @@
+from fastapi import HTTPException
+from starlette.requests import Request
+
+from app.core import security
+from app.core.admission import KeyedRateLimiter, _parse_networks, client_ip, password_admission
+
+
+def _request(peer: str, forwarded_for: str = None) -> Request:
+    headers = [(b"x-forwarded-for", forwarded_for.encode())] if forwarded_for else []
+    return Request({"type": "http", "client": (peer, 40000), "headers": headers})
+
+
+def test_rate_limiter_allows_a_burst_then_reports_retry():
+    limiter = KeyedRateLimiter(per_minute=60, burst=2, max_keys=10)
+    assert limiter.take("1.2.3.4") is None
+    assert limiter.take("1.2.3.4") is None
+    retry_after = limiter.take("1.2.3.4")
+    assert retry_after is not None and 0 < retry_after <= 1.0
+    assert limiter.take("5.6.7.8") is None
+
+
+def test_rate_limiter_evicts_least_recent_keys():
+    limiter = KeyedRateLimiter(per_minute=60, burst=1, max_keys=2)
+    for key in ("a", "b", "c"):
+        limiter.take(key)
+    assert list(limiter._buckets) == ["b", "c"]
+    assert KeyedRateLimiter(per_minute=0, burst=0, max_keys=2).take("a") is None
+
+
+def test_login_is_shed_before_hashing_when_the_pool_is_saturated(client, admin, monkeypatch):
+    monkeypatch.setattr(security, "_pending_hashes", security.hash_capacity())
+    response = client.post("/auth/login", json={"email": admin.email, "password": "whatever"})
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+
+
+def test_login_is_rate_limited_per_email(client, admin, monkeypatch):
+    monkeypatch.setattr(password_admission, "by_email", KeyedRateLimiter(per_minute=1, burst=2, max_keys=10))
+    statuses = [
+        client.post("/auth/login", json={"email": " Admin@Example.com", "password": "wrong"}).status_code
+        for _ in range(3)
+    ]
+    assert statuses == [401, 401, 429]
+
+
+def test_client_ip_trusts_forwarded_for_only_from_configured_proxies():
+    proxies = _parse_networks(["10.0.0.0/8", "192.0.2.7"])
+    assert client_ip(_request("10.1.2.3", "198.51.100.9"), proxies) == "198.51.100.9"
+    # A client-supplied entry left of the real client is ignored
+    assert client_ip(_request("10.1.2.3", "1.1.1.1, 198.51.100.9, 192.0.2.7"), proxies) == "198.51.100.9"
+    assert client_ip(_request("10.1.2.3", "10.0.0.5"), proxies) == "10.1.2.3"
+    # Direct callers cannot spoof their address
+    assert client_ip(_request("203.0.113.4", "198.51.100.9"), proxies) == "203.0.113.4"
+    assert client_ip(_request("10.1.2.3", "198.51.100.9"), []) == "10.1.2.3"
+
+
+def test_clients_behind_a_proxy_get_their_own_buckets(monkeypatch):
+    monkeypatch.setattr(password_admission, "by_ip", KeyedRateLimiter(per_minute=1, burst=1, max_keys=10))
+    monkeypatch.setattr(password_admission, "trusted_proxies", _parse_networks(["10.0.0.1"]))
+    
+    def admitted(forwarded_for):
+        try:
+            password_admission.admit(_request("10.0.0.1", forwarded_for))
+        except HTTPException as e:
+            return e.status_code
+        return 200
+    
+    assert [admitted("198.51.100.1"), admitted("198.51.100.2"), admitted("198.51.100.1")] == [200, 200, 429]
@@ -0,0 +1,69 @@
+import asyncio
+import smtplib
+
+import pytest
+
+from app.services.async_smtp import AsyncSMTPClient
+
+
+async def _serve(messages: list, refuse: set = frozenset()):
+    """A minimal SMTP server on asyncio streams recording each DATA payload"""
+    async def handle(reader, writer):
+        writer.write(b"220 test ESMTP\r\n")
+        while True:
+            line = (await reader.readline()).decode().rstrip("\r\n")
+            verb = line.split(" ", 1)[0].upper()
+            if verb == "EHLO":
+                writer.write(b"250-test\r\n250-8BITMIME\r\n250 AUTH PLAIN\r\n")
+            elif verb == "RCPT" and line[9:-1] in refuse:
+                writer.write(b"550 no such user\r\n")
+            elif verb == "DATA":
+                writer.write(b"354 go ahead\r\n")
+                await writer.drain()
+                body = []
+                while (data := await reader.readline()) != b".\r\n":
+                    body.append(data)
+                messages.append(b"".join(body).decode())
+                writer.write(b"250 queued\r\n")
+            elif verb == "QUIT":
+                writer.write(b"221 bye\r\n")
+                await writer.drain()
+                writer.close()
+                return
+            else:
+                writer.write(b"250 ok\r\n" if verb != "AUTH" else b"235 authenticated\r\n")
+            await writer.drain()
+    
+    return await asyncio.start_server(handle, "127.0.0.1", 0)
+
+
+def test_sends_over_asyncio_streams():
+    async def scenario():
+        messages = []
+        server = await _serve(messages)
+        client = AsyncSMTPClient("127.0.0.1", server.sockets[0].getsockname()[1], timeout=2)
+        await client.connect()
+        await client.login("user", "secret")
+        refused = await client.sendmail("from@example.com", ["to@example.com"], "Subject: hi\r\n\r\n.leading dot\r\n")
+        await client.quit()
+        server.close()
+        return client, messages, refused
+    
+    client, messages, refused = asyncio.run(scenario())
+    assert "AUTH" in client.extensions and refused == {}
+    assert messages == ["Subject: hi\r\n\r\n..leading dot\r\n"]
+
+
+def test_refused_recipients_raise_like_smtplib():
+    async def scenario():
+        server = await _serve([], refuse={"nobody@example.com"})
+        client = AsyncSMTPClient("127.0.0.1", server.sockets[0].getsockname()[1], timeout=2)
+        await client.connect()
+        try:
+            await client.sendmail("from@example.com", ["nobody@example.com"], "body")
+        finally:
+            await client.quit()
+            server.close()
+    
+    with pytest.raises(smtplib.SMTPRecipientsRefused):
+        asyncio.run(scenario())
\ No newline at end of file
@@ -0,0 +1,51 @@
+import time
+
+from app.core.authz import AuthzVersionMap
+from app.core.user_cache import user_cache
+from app.models.user import User
+
+
+def test_role_change_rejects_tokens_issued_before_it(client, admin, add_member):
+    member = add_member("member@example.com")
+    me = client.get("/auth/me", headers=member.headers)
+    assert me.status_code == 200 and me.json()["role"] == "member"
+    
+    assert client.put(f"/team/members/{member.id}/role", json={"role": "admin"}, headers=admin.headers).status_code == 200
+    stale = client.get("/auth/me", headers=member.headers)
+    assert stale.status_code == 401
+    assert stale.json()["detail"] == "Token is out of date, please refresh"
+
+
+def test_removed_member_loses_access(client, admin, add_member):
+    member = add_member("member@example.com")
+    assert client.delete(f"/team/members/{member.id}", headers=admin.headers).status_code == 200
+    assert client.get("/team/members", params={"team_id": admin.team_id}, headers=member.headers).status_code == 401
+
+
+def test_versions_expire_even_with_fan_out(monkeypatch):
+    versions = AuthzVersionMap(ttl_seconds=30, max_entries=10, redis_url="redis://unused", channel="test")
+    versions.observe(1, 3)
+    assert versions.get(1) == 3
+    
+    later = time.monotonic() + 31
+    monkeypatch.setattr(time, "monotonic", lambda: later)
+    assert versions.get(1) is None
+
+
+def test_versions_are_bounded_least_recently_used_first():
+    versions = AuthzVersionMap(ttl_seconds=30, max_entries=2, redis_url=None, channel="test")
+    versions.observe(1, 1)
+    versions.observe(2, 1)
+    versions.get(1)
+    versions.observe(3, 1)
+    assert versions.get(1) == 1 and versions.get(2) is None and versions.get(3) == 1
+
+
+def test_forget_all_forces_a_database_read():
+    versions = AuthzVersionMap(ttl_seconds=30, max_entries=10, redis_url=None, channel="test")
+    versions.observe(7, 2)
+    user_cache.put(User(id=7, role="member", team_id=1, is_active=True, authz_version=2))
+    
+    versions.forget_all()
+    assert versions.get(7) is None
+    assert user_cache.get(7) is None
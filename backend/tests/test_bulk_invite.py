@@ -0,0 +1,100 @@
+import json
+import re
+
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.email_outbox import EmailOutbox
+from app.models.invitation import Invitation
+
+
+def _query_count(response) -> int:
+    return int(re.search(r'desc="(\d+) queries"', response.headers["server-timing"]).group(1))
+
+
+def _bulk(client, admin, emails):
+    return client.post("/team/invite/bulk", json={
+        "team_id": admin.team_id, "invitations": [{"email": email} for email in emails]
+    }, headers=admin.headers)
+
+
+def test_bulk_invite_runs_a_constant_number_of_statements(client, admin):
+    _bulk(client, admin, ["warm@example.com"])  # loads the admin into the user cache
+    small = _bulk(client, admin, [f"small{i}@example.com" for i in range(3)])
+    large = _bulk(client, admin, [f"large{i}@example.com" for i in range(300)])
+    
+    assert small.status_code == large.status_code == 200
+    assert large.json()["invited"] == 300
+    assert _query_count(large) == _query_count(small)
+
+
+def test_bulk_invite_maps_ids_to_the_right_rows(client, admin):
+    response = _bulk(client, admin, ["b@example.com", "not-an-email", "a@example.com", "b@example.com"])
+    body = response.json()
+    assert (body["invited"], body["invalid"], body["skipped"]) == (2, 1, 1)
+    
+    with SessionLocal() as db:
+        for result in body["results"]:
+            if result["status"] == "invited":
+                assert db.get(Invitation, result["invitation_id"]).email == result["email"]
+
+
+def test_bulk_invite_csv_skips_existing_members_and_invitations(client, admin):
+    client.post("/team/invite", json={"email": "pending@example.com", "team_id": admin.team_id}, headers=admin.headers)
+    csv_body = "email,role\nadmin@example.com,member\npending@example.com,member\nfresh@example.com,admin\n"
+    response = client.post(
+        "/team/invite/bulk/csv",
+        data={"team_id": str(admin.team_id)},
+        files={"file": ("invites.csv", csv_body, "text/csv")},
+        headers=admin.headers
+    )
+    assert response.status_code == 200, response.text
+    assert [r["status"] for r in response.json()["results"]] == ["skipped", "skipped", "invited"]
+
+
+def test_reinviting_within_the_same_second_gets_a_new_token(client, admin):
+    first = client.post("/team/invite", json={"email": "again@example.com", "team_id": admin.team_id}, headers=admin.headers)
+    with SessionLocal() as db:
+        db.get(Invitation, first.json()["id"]).is_used = True
+        db.commit()
+    second = client.post("/team/invite", json={"email": "again@example.com", "team_id": admin.team_id}, headers=admin.headers)
+    assert second.status_code == 200
+    assert second.json()["token"] != first.json()["token"]
+
+
+def test_single_and_bulk_invites_link_to_the_configured_frontend(client, admin, monkeypatch):
+    monkeypatch.setattr(settings, "frontend_url", "https://app.example.org/")
+    single = client.post("/team/invite", json={"email": "one@example.com", "team_id": admin.team_id}, headers=admin.headers)
+    _bulk(client, admin, ["two@example.com"])
+    
+    with SessionLocal() as db:
+        links = {
+            message.to_email: json.loads(message.payload)["invitation_link"]
+            for message in db.scalars(select(EmailOutbox))
+        }
+        bulk_token = db.scalar(select(Invitation.token).where(Invitation.email == "two@example.com"))
+    assert links == {
+        "one@example.com": f"https://app.example.org/auth/accept-invitation/{single.json()['token']}",
+        "two@example.com": f"https://app.example.org/auth/accept-invitation/{bulk_token}",
+    }
+
+
+def test_addresses_differing_only_in_case_are_one_mailbox(client, admin):
+    client.post("/team/invite", json={"email": "Pending@example.com", "team_id": admin.team_id}, headers=admin.headers)
+    csv_body = "email\nA@Example.com\na@example.com\nADMIN@example.com\npending@EXAMPLE.com\n"
+    response = client.post(
+        "/team/invite/bulk/csv",
+        data={"team_id": str(admin.team_id)},
+        files={"file": ("invites.csv", csv_body, "text/csv")},
+        headers=admin.headers
+    )
+    assert [(r["status"], r.get("detail")) for r in response.json()["results"]] == [
+        ("invited", None),
+        ("skipped", "Duplicate email in batch"),
+        ("skipped", "User with this email already exists"),
+        ("skipped", "An active invitation already exists for this email"),
+    ]
+    
+    single = client.post("/team/invite", json={"email": "a@EXAMPLE.com", "team_id": admin.team_id}, headers=admin.headers)
+    assert single.status_code == 400
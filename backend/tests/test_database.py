@@ -0,0 +1,55 @@
+import asyncio
+
+from sqlalchemy import text
+
+from app.core.database import (
+    ASYNC_DATABASE_URL,
+    InstrumentedAsyncQueuePool,
+    InstrumentedQueuePool,
+    async_engine,
+    engine,
+    engine_options,
+    to_async_url,
+)
+
+
+def test_sync_urls_map_to_async_drivers():
+    assert to_async_url("sqlite:///./team.db") == "sqlite+aiosqlite:///./team.db"
+    assert to_async_url("postgresql://u:p@db/app") == "postgresql+asyncpg://u:p@db/app"
+    assert to_async_url("postgresql+asyncpg://u:p@db/app") == "postgresql+asyncpg://u:p@db/app"
+
+
+def test_routers_run_on_the_async_engine(client, admin):
+    assert ASYNC_DATABASE_URL.startswith("sqlite+aiosqlite://")
+    assert async_engine.dialect.is_async
+    
+    me = client.get("/auth/me", headers=admin.headers)
+    assert me.status_code == 200 and me.json()["email"] == admin.email
+
+
+def test_file_sqlite_connections_use_wal_and_a_busy_timeout():
+    with engine.connect() as conn:
+        assert conn.exec_driver_sql("PRAGMA journal_mode").scalar() == "wal"
+        assert conn.exec_driver_sql("PRAGMA busy_timeout").scalar() == 5000
+        assert conn.exec_driver_sql("PRAGMA synchronous").scalar() == 1  # NORMAL
+    
+    async def async_journal_mode():
+        async with async_engine.connect() as conn:
+            return (await conn.execute(text("PRAGMA journal_mode"))).scalar()
+    
+    assert asyncio.run(async_journal_mode()) == "wal"
+    assert isinstance(engine.pool, InstrumentedQueuePool)
+
+
+def test_pool_options_follow_the_backend():
+    server = engine_options("postgresql+asyncpg://u:p@db/app", "async", is_async=True)
+    assert server["poolclass"] is InstrumentedAsyncQueuePool
+    assert server["pool_size"] == 10 and server["max_overflow"] == 20
+    assert server["pool_recycle"] == 1800 and server["pool_pre_ping"] is True
+    
+    sqlite_file = engine_options("sqlite:///./team.db", "sync")
+    assert sqlite_file["connect_args"] == {"check_same_thread": False}
+    assert "pool_recycle" not in sqlite_file
+    
+    # An in-memory database must stay on the dialect's single shared connection
+    assert "poolclass" not in engine_options("sqlite://", "sync")
@@ -0,0 +1,52 @@
+import pytest
+from conftest import auth_headers
+
+LISTINGS = ("/team/members", "/team/invitations", "/team/members-with-invitations")
+
+
+def _get(client, admin, path, etag=None):
+    headers = dict(admin.headers, **({"If-None-Match": etag} if etag else {}))
+    return client.get(path, params={"team_id": admin.team_id}, headers=headers)
+
+
+@pytest.mark.parametrize("path", LISTINGS)
+def test_unchanged_listing_answers_304_after_one_lookup(client, admin, path):
+    first = _get(client, admin, path)
+    etag = first.headers["etag"]
+    assert first.status_code == 200 and etag.startswith('W/"')
+    
+    again = _get(client, admin, path, etag)
+    assert again.status_code == 304 and again.content == b""
+    assert again.headers["etag"] == etag
+    assert 'desc="1 queries"' in again.headers["server-timing"]
+    assert _get(client, admin, path, f'"stale", {etag.removeprefix("W/")}').status_code == 304
+    assert _get(client, admin, path, '"stale"').status_code == 200
+
+
+def test_changes_move_the_etag(client, admin, add_member):
+    member = add_member("member@example.com")
+    etags = [_get(client, admin, "/team/members").headers["etag"]]
+    
+    client.post("/team/invite", json={"email": "new@example.com", "team_id": admin.team_id}, headers=admin.headers)
+    etags.append(_get(client, admin, "/team/members").headers["etag"])
+    client.put(f"/team/members/{member.id}/role", json={"role": "admin"}, headers=admin.headers)
+    etags.append(_get(client, admin, "/team/members").headers["etag"])
+    client.delete(f"/team/members/{member.id}", headers=admin.headers)
+    etags.append(_get(client, admin, "/team/members").headers["etag"])
+    
+    assert len(set(etags)) == len(etags)
+    assert _get(client, admin, "/team/members", etags[0]).status_code == 200
+
+
+def test_logins_leave_the_etag_alone(client, admin, add_member):
+    member = add_member("member@example.com")
+    etag = _get(client, admin, "/team/members").headers["etag"]
+    auth_headers(client, member.email)
+    assert _get(client, admin, "/team/members", etag).status_code == 304
+
+
+@pytest.mark.parametrize("path", LISTINGS)
+def test_other_teams_listings_and_etags_are_forbidden(client, admin, other_admin, path):
+    response = client.get(path, params={"team_id": admin.team_id}, headers=dict(other_admin.headers, **{"If-None-Match": "*"}))
+    assert response.status_code == 403
+    assert "etag" not in response.headers
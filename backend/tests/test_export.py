@@ -0,0 +1,68 @@
+import csv
+import io
+import zlib
+
+import orjson
+
+from app.core.config import settings
+from app.services.roster_export import EXPORT_COLUMNS, encode_csv
+
+
+def _export(client, admin, **params):
+    headers = {**admin.headers, "Accept-Encoding": params.pop("encoding", "identity")}
+    return client.get("/team/export", params={"team_id": admin.team_id, **params}, headers=headers)
+
+
+def test_csv_export_streams_members_then_invitations(client, admin, add_member, monkeypatch):
+    monkeypatch.setattr(settings, "export_batch_size", 2)
+    for i in range(3):
+        add_member(f"member{i}@example.com")
+    client.post("/team/invite/bulk", json={
+        "team_id": admin.team_id, "invitations": [{"email": f"invitee{i}@example.com"} for i in range(3)]
+    }, headers=admin.headers)
+    
+    response = _export(client, admin)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "text/csv; charset=utf-8"
+    assert response.headers["content-disposition"].startswith(f'attachment; filename="team-{admin.team_id}-all-')
+    assert "content-encoding" not in response.headers
+    
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [row["type"] for row in rows] == ["member"] * 4 + ["invitation"] * 3
+    assert [row["status"] for row in rows] == ["active"] * 4 + ["pending"] * 3
+    assert all(row["expires_at"] for row in rows[4:]) and not rows[0]["expires_at"]
+
+
+def test_ndjson_export_of_invitations_only(client, admin):
+    client.post("/team/invite", json={"email": "invitee@example.com", "team_id": admin.team_id}, headers=admin.headers)
+    response = _export(client, admin, format="ndjson", include="invitations")
+    assert response.headers["content-type"] == "application/x-ndjson"
+    rows = [orjson.loads(line) for line in response.content.splitlines()]
+    assert [(row["type"], row["email"]) for row in rows] == [("invitation", "invitee@example.com")]
+    assert list(rows[0]) == list(EXPORT_COLUMNS)
+
+
+def test_export_is_gzipped_when_accepted(client, admin):
+    with client.stream("GET", "/team/export", params={"team_id": admin.team_id}, headers={
+        **admin.headers, "Accept-Encoding": "br;q=1.0, gzip;q=0.8"
+    }) as response:
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["vary"] == "Accept-Encoding"
+        compressed = b"".join(response.iter_raw())
+    text = zlib.decompress(compressed, 31).decode()
+    assert text.splitlines()[0] == ",".join(EXPORT_COLUMNS)
+    assert admin.email in text
+
+
+def test_spreadsheet_formulas_are_neutralised():
+    row = {"type": "member", "email": "a@example.com", "first_name": "=HYPERLINK(\"x\")", "last_name": "-1+2"}
+    line = next(csv.reader(io.StringIO(encode_csv([row]).decode())))
+    assert line[3:5] == ["'=HYPERLINK(\"x\")", "'-1+2"]
+    assert line[2] == "a@example.com"
+
+
+def test_export_is_for_the_teams_admins_only(client, admin, add_member, other_admin):
+    member = add_member("member@example.com")
+    assert client.get("/team/export", params={"team_id": admin.team_id}, headers=member.headers).status_code == 403
+    assert client.get("/team/export", params={"team_id": admin.team_id}, headers=other_admin.headers).status_code == 403
+    assert _export(client, admin, format="xlsx").status_code == 422
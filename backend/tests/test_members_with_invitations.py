@@ -0,0 +1,49 @@
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+from app.api.team import encode_cursor
+from app.core.database import async_engine
+
+
+@contextmanager
+def _statements():
+    seen = []
+    
+    def record(conn, cursor, statement, parameters, context, executemany):
+        seen.append(statement)
+    
+    event.listen(async_engine.sync_engine, "before_cursor_execute", record)
+    try:
+        yield seen
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", record)
+
+
+def _listing(client, admin, **params):
+    response = client.get("/team/members-with-invitations", params={"team_id": admin.team_id, **params}, headers=admin.headers)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_page_and_totals_come_from_one_projection_only_statement(client, admin, add_member):
+    add_member("member@example.com")
+    client.post("/team/invite", json={"email": "invitee@example.com", "team_id": admin.team_id}, headers=admin.headers)
+    _listing(client, admin)  # loads the admin into the user cache
+    
+    with _statements() as seen:
+        body = _listing(client, admin)
+    listing = [statement for statement in seen if "UNION ALL" in statement]
+    assert len(listing) == 1
+    assert "password_hash" not in listing[0] and "token" not in listing[0]
+    
+    assert (body["total_members"], body["pending_invitations"]) == (2, 1)
+    assert [entry["type"] for entry in body["members_and_invitations"]] == ["member", "member", "invitation"]
+
+
+def test_totals_come_back_with_an_empty_page(client, admin):
+    client.post("/team/invite", json={"email": "invitee@example.com", "team_id": admin.team_id}, headers=admin.headers)
+    past_the_end = encode_cursor(["i", "2999-01-01T00:00:00", 1])
+    body = _listing(client, admin, cursor=past_the_end)
+    assert body["members_and_invitations"] == [] and body["next_cursor"] is None
+    assert (body["total_members"], body["pending_invitations"]) == (1, 1)
@@ -0,0 +1,62 @@
+import re
+
+from app.core.metrics import MetricsRegistry
+
+
+def test_text_exposition_format():
+    registry = MetricsRegistry()
+    requests = registry.counter("requests_total", "Requests", ("route",))
+    latency = registry.histogram("latency_seconds", "Latency", buckets=(0.1, 1.0))
+    depth = registry.gauge("queue_depth", "Depth")
+    depth.set_function(lambda: 3)
+    
+    requests.inc(route='/a"b')
+    requests.inc(2, route='/a"b')
+    for value in (0.05, 0.5, 5):
+        latency.observe(value)
+    assert registry.counter("requests_total", "Requests", ("route",)) is requests
+    
+    assert registry.render().splitlines() == [
+        "# HELP requests_total Requests",
+        "# TYPE requests_total counter",
+        'requests_total{route="/a\\"b"} 3',
+        "# HELP latency_seconds Latency",
+        "# TYPE latency_seconds histogram",
+        'latency_seconds_bucket{le="0.1"} 1',
+        'latency_seconds_bucket{le="1"} 2',
+        'latency_seconds_bucket{le="+Inf"} 3',
+        "latency_seconds_sum 5.55",
+        "latency_seconds_count 3",
+        "# HELP queue_depth Depth",
+        "# TYPE queue_depth gauge",
+        "queue_depth 3",
+    ]
+
+
+def _sample(body: str, name: str, **labels) -> float:
+    for line in body.splitlines():
+        match = re.match(r"^(\w+)(?:\{(.*)\})? (\S+)$", line)
+        if match and match.group(1) == name:
+            found = dict(re.findall(r'(\w+)="([^"]*)"', match.group(2) or ""))
+            if all(found.get(key) == value for key, value in labels.items()):
+                return float(match.group(3))
+    raise AssertionError(f"no sample {name} {labels}")
+
+
+def test_metrics_endpoint_labels_routes_by_template(client, admin, add_member):
+    member = add_member("member@example.com")
+    client.put(f"/team/members/{member.id}/role", json={"role": "admin"}, headers=admin.headers)
+    client.get("/no-such-route")
+    
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    body = response.text
+    
+    assert _sample(body, "http_requests_total", route="/team/members/{member_id}/role", status="200") >= 1
+    assert _sample(body, "http_requests_total", route="unmatched", status="404") >= 1
+    assert f"/team/members/{member.id}/role" not in body
+    assert _sample(body, "password_hash_seconds_count", operation="hash") >= 1
+    assert _sample(body, "db_pool_size", pool="sync") == 10
+    for name in ("email_send_attempts_total", "auth_admission_rejected_total", "http_request_duration_seconds"):
+        assert f"# TYPE {name} " in body
@@ -0,0 +1,78 @@
+import asyncio
+import json
+from datetime import datetime, timedelta
+
+from app.core.database import SessionLocal
+from app.models.email_outbox import EmailOutbox
+from app.services import outbox
+
+
+def _claim(limit: int = 10):
+    with SessionLocal() as db:
+        messages = outbox.claim_messages(db, limit)
+        db.expunge_all()
+        return messages
+
+
+def _status(message_id: int) -> EmailOutbox:
+    with SessionLocal() as db:
+        return db.get(EmailOutbox, message_id)
+
+
+def _enqueue(kind: str, payload: dict) -> int:
+    with SessionLocal() as db:
+        message = outbox.enqueue_email(db, kind=kind, to_email="someone@example.com", payload=payload)
+        db.commit()
+        return message.id
+
+
+def test_invite_queues_an_email_that_delivers(client, admin):
+    response = client.post("/team/invite", json={"email": "new@example.com", "team_id": admin.team_id}, headers=admin.headers)
+    assert response.status_code == 200
+    
+    [message] = _claim()
+    assert message.kind == "team_invitation" and message.invitation_id == response.json()["id"]
+    assert set(json.loads(message.payload)) == {"to_email", "sister_name", "team_name", "invitation_link"}
+    asyncio.run(outbox.OutboxDispatcher()._process(message))
+    
+    stored = _status(message.id)
+    assert stored.status == outbox.SENT, stored.last_error
+    assert stored.attempts == 1
+
+
+def test_claimed_messages_are_leased_until_expiry(client):
+    message_id = _enqueue("email", {"to_email": "x@example.com", "subject": "s", "html_content": "<p>h</p>"})
+    assert [m.id for m in _claim()] == [message_id]
+    assert _claim() == []
+    
+    with SessionLocal() as db:
+        db.get(EmailOutbox, message_id).locked_until = datetime.utcnow() - timedelta(seconds=1)
+        db.commit()
+    [reclaimed] = _claim()
+    assert reclaimed.id == message_id and reclaimed.attempts == 2
+
+
+def test_transient_failures_are_retried_with_backoff(client):
+    message_id = _enqueue("email", {"to_email": "x@example.com", "subject": "s", "html_content": "<p>h</p>"})
+    with SessionLocal() as db:
+        outbox.mark_failed(db, message_id, 1, "smtp timeout")
+    
+    stored = _status(message_id)
+    assert stored.status == outbox.PENDING
+    assert stored.next_attempt_at > datetime.utcnow()
+
+
+def test_payload_and_kind_errors_fail_permanently(client):
+    bad_payload = _enqueue("team_invitation", {"to_email": "x@example.com", "unexpected": True})
+    unknown_kind = _enqueue("carrier_pigeon", {})
+    
+    dispatcher = outbox.OutboxDispatcher()
+    for message in _claim():
+        asyncio.run(dispatcher._process(message))
+    
+    for message_id in (bad_payload, unknown_kind):
+        stored = _status(message_id)
+        assert stored.status == outbox.FAILED
+        assert stored.attempts == 1
+    assert _status(bad_payload).last_error.startswith("TypeError")
+
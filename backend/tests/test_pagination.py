@@ -0,0 +1,66 @@
+import base64
+import json
+
+import pytest
+
+from app.api.team import encode_cursor
+
+
+def _raw_cursor(key) -> str:
+    return base64.urlsafe_b64encode(json.dumps(key).encode()).decode().rstrip("=")
+
+
+def _pages(client, admin, path, items_key, limit):
+    items, cursor = [], None
+    while True:
+        params = {"team_id": admin.team_id, "limit": limit, **({"cursor": cursor} if cursor else {})}
+        body = client.get(path, params=params, headers=admin.headers).json()
+        items += body[items_key]
+        cursor = body["next_cursor"]
+        if not cursor:
+            return items
+
+
+@pytest.fixture
+def roster(client, admin):
+    client.post("/team/invite/bulk", json={
+        "team_id": admin.team_id, "invitations": [{"email": f"invitee{i}@example.com"} for i in range(7)]
+    }, headers=admin.headers)
+
+
+def test_pages_cover_every_row_once(client, admin, add_member, roster):
+    for i in range(4):
+        add_member(f"member{i}@example.com")
+    
+    members = _pages(client, admin, "/team/members", "items", 2)
+    assert [m["id"] for m in members] == sorted({m["id"] for m in members}) and len(members) == 5
+    
+    invitations = _pages(client, admin, "/team/invitations", "items", 3)
+    assert len({i["id"] for i in invitations}) == len(invitations) == 7
+    assert [i["expires_at"] for i in invitations] == sorted(i["expires_at"] for i in invitations)
+    
+    combined = _pages(client, admin, "/team/members-with-invitations", "members_and_invitations", 4)
+    assert [entry["type"] for entry in combined] == ["member"] * 5 + ["invitation"] * 7
+
+
+@pytest.mark.parametrize("path, cursor", [
+    ("/team/members", "not base64 json"),
+    ("/team/members", _raw_cursor(["i", "2030-01-01T00:00:00", 1])),
+    ("/team/members", _raw_cursor(["m", "1"])),
+    ("/team/members", _raw_cursor(["m", True])),
+    ("/team/invitations", _raw_cursor(["i", "2030-01-01T00:00:00+02:00", 1])),
+    ("/team/invitations", _raw_cursor(["i", "2030-01-01T00:00:00"])),
+    ("/team/members-with-invitations", _raw_cursor(["i", "2030-01-01T00:00:00+00:00", 1])),
+    ("/team/members-with-invitations", _raw_cursor(["r", "2030-01-01", "team.invite"])),
+    ("/team/members-with-invitations", _raw_cursor(["e", "2030-01-01T00:00:00", 1])),
+])
+def test_malformed_or_foreign_cursors_are_rejected(client, admin, path, cursor):
+    response = client.get(path, params={"team_id": admin.team_id, "cursor": cursor}, headers=admin.headers)
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor"
+
+
+def test_valid_cursor_from_another_kind_of_listing_is_rejected(client, admin, roster):
+    cursor = encode_cursor(["r", "2030-01-01", "team.invite"])
+    response = client.get("/team/invitations", params={"team_id": admin.team_id, "cursor": cursor}, headers=admin.headers)
+    assert response.status_code == 400
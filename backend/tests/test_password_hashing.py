@@ -0,0 +1,35 @@
+import asyncio
+import threading
+
+import pytest
+from fastapi import HTTPException
+
+from app.core import security
+
+
+def test_bcrypt_runs_off_the_event_loop_thread(monkeypatch):
+    threads = []
+    real_verify = security.verify_password
+    
+    def verify(plain, hashed):
+        threads.append(threading.current_thread().name)
+        return real_verify(plain, hashed)
+    
+    monkeypatch.setattr(security, "verify_password", verify)
+    
+    async def scenario():
+        hashed = await security.get_password_hash_async("hunter22")
+        return await security.verify_password_async("hunter22", hashed), await security.verify_password_async("wrong", hashed)
+    
+    assert asyncio.run(scenario()) == (True, False)
+    assert threads and all(name.startswith("bcrypt") for name in threads)
+    assert security.pending_hash_count() == 0
+
+
+def test_saturated_pool_rejects_with_retry_after(monkeypatch):
+    monkeypatch.setattr(security, "_pending_hashes", security.hash_capacity())
+    with pytest.raises(HTTPException) as excinfo:
+        asyncio.run(security.get_password_hash_async("hunter22"))
+    assert excinfo.value.status_code == 503
+    assert excinfo.value.headers["Retry-After"] == "1"
+
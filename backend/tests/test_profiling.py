@@ -0,0 +1,55 @@
+import pytest
+from conftest import PASSWORD
+
+from app.core.config import settings
+
+
+@pytest.fixture
+def profiling(monkeypatch):
+    monkeypatch.setattr(settings, "profiling_enabled", True)
+
+
+def _login(client, email, headers):
+    return client.post("/auth/login", json={"email": email, "password": PASSWORD}, headers=headers)
+
+
+def test_profile_header_is_ignored_unless_enabled(client, admin):
+    response = _login(client, admin.email, {**admin.headers, "X-Profile": "cpu"})
+    assert response.status_code == 200
+    assert "x-profile-status" not in response.headers
+
+
+def test_only_admins_can_profile(client, admin, add_member, profiling):
+    member = add_member("member@example.com")
+    response = _login(client, member.email, {**member.headers, "X-Profile": "cpu"})
+    assert response.status_code == 200
+    assert response.headers["x-profile-status"] == "forbidden"
+    assert "x-profile-id" not in response.headers
+    assert client.get("/debug/profiles", headers=member.headers).status_code == 403
+    
+    unknown = _login(client, admin.email, {**admin.headers, "X-Profile": "wall"})
+    assert unknown.headers["x-profile-status"] == "unknown-mode"
+
+
+def test_cpu_profile_is_stored_as_collapsed_stacks(client, admin, profiling):
+    response = _login(client, admin.email, {**admin.headers, "X-Profile": "cpu"})
+    assert response.status_code == 200 and response.headers["x-profile-status"] == "stored"
+    profile_id = response.headers["x-profile-id"]
+    
+    listed = client.get("/debug/profiles", headers=admin.headers).json()["profiles"]
+    assert listed[0]["id"] == profile_id and listed[0]["path"] == "/auth/login"
+    
+    download = client.get(f"/debug/profiles/{profile_id}", headers=admin.headers)
+    assert download.headers["content-disposition"] == f'attachment; filename="{profile_id}.collapsed.txt"'
+    lines = download.text.strip().splitlines()
+    # bcrypt runs on the hash pool, so the login's time shows up under its threads
+    assert lines and all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+    assert any(line.startswith("bcrypt") for line in lines)
+
+
+def test_memory_profile_reports_allocation_sites(client, admin, profiling):
+    response = client.get("/team/members", params={"team_id": admin.team_id}, headers={**admin.headers, "X-Profile": "memory"})
+    assert response.status_code == 200
+    download = client.get(f"/debug/profiles/{response.headers['x-profile-id']}", headers=admin.headers)
+    assert download.text.startswith("Top 30 allocation sites")
+    assert client.get("/debug/profiles/missing", headers=admin.headers).status_code == 404
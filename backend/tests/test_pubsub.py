@@ -0,0 +1,40 @@
+import asyncio
+
+import pytest
+
+from app.core.pubsub import RedisFanout
+
+
+class FakePubSub:
+    def __init__(self, messages):
+        self.messages = messages
+
+    async def subscribe(self, channel):
+        pass
+
+    async def listen(self):
+        for message in self.messages:
+            yield message
+        raise ConnectionError("connection reset")
+
+
+class FakeRedis:
+    def __init__(self, *rounds):
+        self.rounds = list(rounds)
+
+    def pubsub(self):
+        return FakePubSub(self.rounds.pop(0) if self.rounds else [])
+
+
+def test_listener_dispatches_messages_and_reports_gaps(monkeypatch):
+    calls = []
+    fanout = RedisFanout("redis://unused", "test", "test", calls.append, lambda: calls.append("gap"))
+    fanout._redis = FakeRedis([{"type": "subscribe", "data": 1}, {"type": "message", "data": b"one"}])
+    
+    async def stop_backoff(_):
+        raise asyncio.CancelledError
+    
+    monkeypatch.setattr(asyncio, "sleep", stop_backoff)
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(fanout._listen())
+    assert calls == ["gap", b"one", "gap"]
@@ -0,0 +1,22 @@
+from sqlalchemy import create_engine, inspect
+
+from app.core.database import Base, engine
+from app.core.query_plans import check_query_plans
+
+
+def test_migrated_schema_serves_hot_paths_from_their_indexes(client):
+    indexes = {index["name"] for index in inspect(engine).get_indexes("invitations")}
+    assert "ix_invitations_team_id_pending" in indexes
+    assert check_query_plans(engine) == []
+
+
+def test_dropping_an_index_is_reported(tmp_path):
+    scratch = create_engine(f"sqlite:///{tmp_path / 'plans.db'}")
+    Base.metadata.create_all(scratch)
+    assert check_query_plans(scratch) == []
+    
+    with scratch.begin() as conn:
+        conn.exec_driver_sql("DROP INDEX ix_users_team_id_is_active")
+    scratch.dispose()  # pysqlite would keep replaying its cached plans
+    problems = check_query_plans(scratch)
+    assert [problem.split(":")[0] for problem in problems] == ["active members", "member page"]
@@ -0,0 +1,43 @@
+from datetime import datetime
+from types import SimpleNamespace
+
+import orjson
+
+from app.core.database import SessionLocal
+from app.models.user import User
+from app.schemas.invitation import InvitationResponse, invitation_read
+from app.schemas.user import UserResponse, user_read
+
+
+def test_read_dicts_serialise_like_the_response_models():
+    user = SimpleNamespace(
+        id=1, email="ada@example.com", first_name="Ada", last_name="Admin", role="admin", team_id=2,
+        created_at=datetime(2026, 10, 1, 12, 30), last_login=None, is_active=True, password_hash="secret"
+    )
+    read = user_read(user)
+    assert "password_hash" not in read
+    assert orjson.loads(orjson.dumps(read)) == UserResponse.model_validate(user).model_dump(mode="json")
+    
+    invitation = SimpleNamespace(
+        id=3, email="invitee@example.com", role="member", team_id=2, token="t",
+        expires_at=datetime(2026, 10, 8), is_used=False, invited_by=1, accepted_at=None,
+        created_at=datetime(2026, 10, 1)
+    )
+    assert orjson.loads(orjson.dumps(invitation_read(invitation))) == (
+        InvitationResponse.model_validate(invitation).model_dump(mode="json")
+    )
+
+
+def test_listings_do_not_revalidate_stored_rows(client, admin):
+    # An address EmailStr would reject today must not break the listing
+    with SessionLocal() as db:
+        db.add(User(
+            email="legacy@localhost", password_hash="x", first_name="Leg", last_name="Acy",
+            role="member", team_id=admin.team_id, is_active=True
+        ))
+        db.commit()
+    
+    response = client.get("/team/members", params={"team_id": admin.team_id}, headers=admin.headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    assert {item["email"] for item in response.json()["items"]} == {admin.email, "legacy@localhost"}
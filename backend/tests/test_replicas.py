@@ -0,0 +1,62 @@
+import asyncio
+import sqlite3
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.core import database
+from app.core.database import ReplicaRouter, SessionLocal
+from app.models.invitation import Invitation
+
+
+@pytest.fixture
+def replica_router(admin, tmp_path, monkeypatch):
+    """A router whose one replica is a snapshot of the primary taken now"""
+    replica_path = tmp_path / "replica.db"
+    source, target = sqlite3.connect(database.engine.url.database), sqlite3.connect(replica_path)
+    source.backup(target)
+    source.close()
+    target.close()
+    
+    router = ReplicaRouter([f"sqlite:///{replica_path}"], sticky_seconds=60, max_lag_seconds=5, check_interval=1)
+    monkeypatch.setattr(database, "replica_router", router)
+    yield router
+    asyncio.run(router.stop())
+
+
+def test_replicas_are_used_once_measured_and_while_fresh(replica_router):
+    router = replica_router
+    replica = router.replicas[0]
+    assert router.choose(1) is None  # lag not measured yet
+    
+    assert asyncio.run(replica.measure_lag()) == 0.0
+    assert router.choose(1) is replica
+    
+    router.mark_write(1)
+    assert router.choose(1) is None
+    assert router.choose(2) is replica
+    
+    replica.lag = 30.0
+    assert router.choose(2) is None
+
+
+def test_reads_stay_on_the_primary_after_the_users_own_write(client, admin, replica_router):
+    router = replica_router
+    asyncio.run(router.replicas[0].measure_lag())
+    
+    # Written behind the replica's back: the snapshot does not have it
+    with SessionLocal() as db:
+        db.add(Invitation(
+            email="direct@example.com", team_id=admin.team_id, token="direct-token",
+            expires_at=datetime.utcnow() + timedelta(days=1), invited_by=admin.id
+        ))
+        db.commit()
+    
+    def invitation_emails():
+        response = client.get("/team/invitations", params={"team_id": admin.team_id}, headers=admin.headers)
+        return sorted(item["email"] for item in response.json()["items"])
+    
+    assert invitation_emails() == []
+    
+    client.post("/team/invite", json={"email": "invitee@example.com", "team_id": admin.team_id}, headers=admin.headers)
+    assert invitation_emails() == ["direct@example.com", "invitee@example.com"]
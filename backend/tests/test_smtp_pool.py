@@ -0,0 +1,62 @@
+import smtplib
+
+import pytest
+
+from app.services.smtp_pool import PoolTimeout, SMTPConnectionPool
+
+
+class FakeSMTP:
+    def __init__(self):
+        self.sent = []
+        self.closed = False
+        self.dropped = False
+
+    def sendmail(self, from_addr, to_addrs, msg):
+        if self.dropped:
+            raise smtplib.SMTPServerDisconnected("gone")
+        self.sent.append(to_addrs)
+        return {}
+
+
+def _pool(**options):
+    clients = []
+
+    def connect():
+        clients.append(FakeSMTP())
+        return clients[-1]
+
+    pool = SMTPConnectionPool(connect, noop=lambda client: True, close=lambda client: setattr(client, "closed", True), **options)
+    return pool, clients
+
+
+def test_sessions_are_reused():
+    pool, clients = _pool()
+    for i in range(3):
+        pool.sendmail("from@example.com", [f"to{i}@example.com"], "body")
+    assert len(clients) == 1 and len(clients[0].sent) == 3
+
+
+def test_dropped_session_is_replaced_transparently():
+    pool, clients = _pool()
+    pool.sendmail("from@example.com", ["a@example.com"], "body")
+    clients[0].dropped = True
+    
+    pool.sendmail("from@example.com", ["b@example.com"], "body")
+    assert len(clients) == 2 and clients[0].closed and clients[1].sent == [["b@example.com"]]
+
+
+def test_sessions_are_recycled_after_max_messages():
+    pool, clients = _pool(max_messages=2)
+    for i in range(5):
+        pool.sendmail("from@example.com", [f"to{i}@example.com"], "body")
+    assert [len(client.sent) for client in clients] == [2, 2, 1]
+    assert clients[0].closed and clients[1].closed and not clients[2].closed
+
+
+def test_exhausted_pool_times_out():
+    pool, _ = _pool(max_size=1, acquire_timeout=0.01)
+    held = pool._checkout()
+    with pytest.raises(PoolTimeout):
+        pool.sendmail("from@example.com", ["a@example.com"], "body")
+    pool._checkin(held)
+    pool.sendmail("from@example.com", ["a@example.com"], "body")
@@ -0,0 +1,82 @@
+import logging
+import re
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+
+from app.core.config import settings
+from app.core.database import engine
+from app.core.sql_stats import (
+    QueryBudgetExceeded,
+    RequestQueryStats,
+    SQLStatsMiddleware,
+    _current,
+    instrument_engine,
+    query_budget,
+)
+
+
+def _app(statements: int, budget: int) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(SQLStatsMiddleware)
+    
+    @app.get("/run", dependencies=[Depends(query_budget(budget))])
+    async def run():
+        with engine.connect() as conn:
+            for _ in range(statements):
+                conn.execute(text("SELECT 1"))
+        return {}
+    
+    return app
+
+
+def _query_count(response) -> int:
+    return int(re.search(r'desc="(\d+) queries"', response.headers["server-timing"]).group(1))
+
+
+def test_server_timing_reports_the_request_queries(client, admin):
+    response = client.get("/team/members", params={"team_id": admin.team_id}, headers=admin.headers)
+    assert response.headers["server-timing"].startswith("db;dur=")
+    assert 1 <= _query_count(response) <= 3
+
+
+def test_strict_budget_raises_when_exceeded():
+    with TestClient(_app(statements=3, budget=2)) as test_client:
+        with pytest.raises(QueryBudgetExceeded):
+            test_client.get("/run")
+    with TestClient(_app(statements=2, budget=2)) as test_client:
+        assert test_client.get("/run").status_code == 200
+
+
+def test_slow_query_explain_is_not_counted(monkeypatch, caplog):
+    monkeypatch.setattr(settings, "sql_slow_query_ms", 1e-9)
+    with caplog.at_level(logging.WARNING, logger="app.core.sql_stats"):
+        with TestClient(_app(statements=1, budget=1)) as test_client:
+            response = test_client.get("/run")
+    
+    assert _query_count(response) == 1
+    slow = [record.getMessage() for record in caplog.records if record.getMessage().startswith("Slow query")]
+    assert len(slow) == 1 and "EXPLAIN" not in slow[0].split("\n")[0]
+    assert "Plan: " in slow[0] and "Plan: -" not in slow[0]
+
+
+def test_failed_statements_leave_no_timing_state_behind(tmp_path):
+    scratch = create_engine(f"sqlite:///{tmp_path / 'stats.db'}")
+    instrument_engine(scratch)
+    stats = RequestQueryStats()
+    token = _current.set(stats)
+    try:
+        with scratch.connect() as conn:
+            for _ in range(3):
+                with pytest.raises(OperationalError):
+                    conn.execute(text("SELECT * FROM missing_table"))
+            conn.execute(text("SELECT 1"))
+            assert not any(key.startswith("query_") for key in conn.info)
+    finally:
+        _current.reset(token)
+        scratch.dispose()
+    
+    assert stats.count == 1 and 0 < stats.seconds < 1
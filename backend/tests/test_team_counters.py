@@ -0,0 +1,60 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import update
+
+from app.core.database import SessionLocal
+from app.models.invitation import Invitation
+from app.models.team import Team
+from app.services.team_counters import reconcile_team_counters
+
+
+def _totals(client, admin):
+    body = client.get("/team/members-with-invitations", params={"team_id": admin.team_id}, headers=admin.headers).json()
+    return body["total_members"], body["pending_invitations"]
+
+
+def _expire_invitations():
+    with SessionLocal() as db:
+        db.execute(update(Invitation).values(expires_at=datetime.utcnow() - timedelta(minutes=1)))
+        db.commit()
+
+
+def test_counters_follow_invites_accepts_and_removals(client, admin, add_member):
+    member = add_member("member@example.com")
+    client.post("/team/invite", json={"email": "pending@example.com", "team_id": admin.team_id}, headers=admin.headers)
+    assert _totals(client, admin) == (2, 1)
+    
+    assert client.delete(f"/team/members/{member.id}", headers=admin.headers).status_code == 200
+    assert _totals(client, admin) == (1, 1)
+    with SessionLocal() as db:
+        assert reconcile_team_counters(db, dry_run=True) == []
+
+
+def test_expired_invitations_leave_the_pending_total(client, admin):
+    client.post("/team/invite", json={"email": "late@example.com", "team_id": admin.team_id}, headers=admin.headers)
+    _expire_invitations()
+    assert _totals(client, admin) == (1, 0)
+    
+    # Re-inviting the lapsed address counts it once, not twice
+    response = client.post("/team/invite", json={"email": "late@example.com", "team_id": admin.team_id}, headers=admin.headers)
+    assert response.status_code == 200
+    assert _totals(client, admin) == (1, 1)
+
+
+def test_last_admin_cannot_be_demoted_or_removed(client, admin, add_member):
+    add_member("member@example.com")
+    assert client.put(f"/team/members/{admin.id}/role", json={"role": "member"}, headers=admin.headers).status_code == 400
+    assert client.delete(f"/team/members/{admin.id}", headers=admin.headers).status_code == 400
+    with SessionLocal() as db:
+        assert db.get(Team, admin.team_id).admin_count == 1
+
+
+def test_reconcile_repairs_drift(client, admin):
+    with SessionLocal() as db:
+        db.execute(update(Team).values(member_count=42, admin_count=0))
+        db.commit()
+        [drift] = reconcile_team_counters(db)
+        assert drift["member_count"] == (42, 1) and drift["admin_count"] == (0, 1)
+        db.expire_all()
+        team = db.get(Team, admin.team_id)
+        assert (team.member_count, team.admin_count) == (1, 1)
@@ -0,0 +1,103 @@
+import asyncio
+
+import pytest
+
+from app.api.team import _team_event_stream
+from app.services.team_events import RESET_EVENT, TeamEventHub, team_events
+
+
+@pytest.fixture(autouse=True)
+def fresh_history():
+    # SQLite reuses team ids, so one test's events must not be replayed in the next
+    team_events._history.clear()
+    yield
+    team_events._history.clear()
+
+
+def _hub(**options) -> TeamEventHub:
+    return TeamEventHub(**{"history_size": 3, "max_queued": 10, "redis_url": None, "channel": "test", **options})
+
+
+def test_subscribers_receive_their_teams_events():
+    async def scenario():
+        hub = _hub()
+        mine, _, _ = hub.subscribe(1)
+        other, _, _ = hub.subscribe(2)
+        await hub.publish(1, "invitation.created", {"email": "a@example.com"})
+        event = mine.queue.get_nowait()
+        hub.unsubscribe(mine)
+        hub.unsubscribe(mine)
+        return event, other.queue.qsize(), hub._subscribers
+    
+    event, other_queued, subscribers = asyncio.run(scenario())
+    assert event.frame == (
+        f"id: {event.id}\nevent: invitation.created\n".encode()
+        + b'data: {"team_id":1,"email":"a@example.com"}\n\n'
+    )
+    assert other_queued == 0
+    assert 1 not in subscribers
+
+
+def test_resume_replays_after_the_last_event_id_or_resets():
+    async def scenario():
+        hub = _hub()
+        for n in range(4):
+            await hub.publish(1, "member.role_changed", {"n": n})
+        ids = [event.id for event in hub._history[1]]
+        return hub, ids
+    
+    hub, ids = asyncio.run(scenario())
+    assert len(ids) == 3  # history_size
+    _, replay, reset = hub.subscribe(1, ids[0])
+    assert [event.data["n"] for event in replay] == [2, 3] and not reset
+    
+    _, replay, reset = hub.subscribe(1, "forgotten-id")
+    assert replay == [] and reset
+
+
+def test_slow_subscribers_are_reset_instead_of_blocking():
+    async def scenario():
+        hub = _hub(max_queued=1)
+        subscription, _, _ = hub.subscribe(1)
+        await hub.publish(1, "invitation.created", {})
+        await hub.publish(1, "invitation.created", {})
+        return subscription.overflowed
+    
+    assert asyncio.run(scenario()) is True
+
+
+def test_stream_replays_heartbeats_and_ends_on_own_removal():
+    async def scenario():
+        await team_events.publish(1, "invitation.created", {"email": "a@example.com"})
+        missed = team_events._history[1][-1]
+        stream = _team_event_stream(1, user_id=7, last_event_id="unknown")
+        frames = [await stream.__anext__() for _ in range(2)]
+        
+        # Nothing published: the stream keeps the connection alive
+        frames.append(await stream.__anext__())
+        
+        await team_events.publish(1, "member.removed", {"member_id": 7})
+        frames += [frame async for frame in stream]
+        return missed, frames
+    
+    missed, frames = asyncio.run(scenario())
+    assert frames[0] == b"retry: 3000\n\n"
+    assert frames[1] == f"event: {RESET_EVENT}\ndata: {{}}\n\n".encode()
+    assert missed.frame not in frames
+    assert frames[2] == b": keep-alive\n\n"
+    assert frames[3].startswith(b"id: ") and b"event: member.removed" in frames[3]
+    assert len(frames) == 4
+    assert 1 not in team_events._subscribers
+
+
+def test_team_changes_are_published(client, admin, add_member):
+    member = add_member("member@example.com")
+    client.put(f"/team/members/{member.id}/role", json={"role": "admin"}, headers=admin.headers)
+    assert [event.type for event in team_events._history[admin.team_id]] == [
+        "invitation.created", "invitation.accepted", "member.role_changed"
+    ]
+
+
+def test_other_teams_events_are_forbidden(client, admin, other_admin):
+    response = client.get(f"/team/{admin.team_id}/events", headers=other_admin.headers)
+    assert response.status_code == 403
@@ -0,0 +1,57 @@
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+from jose import jwt
+
+from app.core import security
+
+
+def test_verified_tokens_skip_decoding_on_repeat(monkeypatch):
+    token = security.create_access_token({"sub": "1"})
+    assert security.verify_token(token)["sub"] == "1"
+    
+    def decode(*args, **kwargs):
+        raise AssertionError("cached token was decoded again")
+    
+    monkeypatch.setattr(security.jwt, "decode", decode)
+    assert security.verify_token(token)["sub"] == "1"
+
+
+def test_cached_tokens_still_expire(monkeypatch):
+    token = security.create_access_token({"sub": "1"}, expires_delta=timedelta(minutes=1))
+    security.verify_token(token)
+    
+    class Later(datetime):
+        @classmethod
+        def utcnow(cls):
+            return datetime.now() + timedelta(days=1)
+    
+    monkeypatch.setattr(security, "datetime", Later)
+    with pytest.raises(HTTPException) as excinfo:
+        security.verify_token(token)
+    assert excinfo.value.detail == "Token expired"
+    assert security._token_digest(token) not in security._token_cache
+
+
+def test_cached_payload_still_checks_the_token_type():
+    token = security.create_refresh_token({"sub": "1"})
+    security.verify_token(token, "refresh")
+    with pytest.raises(HTTPException) as excinfo:
+        security.verify_token(token, "access")
+    assert excinfo.value.detail == "Invalid token type"
+
+
+def test_bad_signatures_are_not_cached():
+    forged = jwt.encode({"sub": "1", "type": "access", "exp": datetime.utcnow() + timedelta(minutes=5)}, "other", algorithm="HS256")
+    with pytest.raises(HTTPException):
+        security.verify_token(forged)
+    assert len(security._token_cache) == 0
+
+
+def test_cache_is_bounded(monkeypatch):
+    monkeypatch.setattr(security.settings, "token_cache_max_entries", 2)
+    tokens = [security.create_access_token({"sub": str(n)}) for n in range(3)]
+    for token in tokens:
+        security.verify_token(token)
+    assert list(security._token_cache) == [security._token_digest(t) for t in tokens[1:]]
@@ -0,0 +1,45 @@
+import time
+from types import SimpleNamespace
+
+from app.core.authz import authz_versions
+from app.core.user_cache import UserCache, user_cache
+
+
+def _user(user_id: int, role: str = "member") -> SimpleNamespace:
+    return SimpleNamespace(id=user_id, role=role, team_id=1, is_active=True, authz_version=0)
+
+
+def test_entries_expire_after_the_ttl(monkeypatch):
+    cache = UserCache(max_entries=10, ttl_seconds=30)
+    cache.put(_user(1))
+    assert cache.get(1).role == "member"
+    
+    later = time.monotonic() + 31
+    monkeypatch.setattr(time, "monotonic", lambda: later)
+    assert cache.get(1) is None
+    assert len(cache) == 0
+
+
+def test_least_recently_used_entries_are_evicted():
+    cache = UserCache(max_entries=2, ttl_seconds=30)
+    cache.put(_user(1))
+    cache.put(_user(2))
+    cache.get(1)
+    cache.put(_user(3))
+    assert cache.get(2) is None
+    assert cache.get(1) is not None and cache.get(3) is not None
+    cache.invalidate(3)
+    assert cache.get(3) is None
+
+
+def test_repeat_requests_are_authorized_from_the_cache(client, admin):
+    # Without a known authz version, get_current_user falls back to the user cache
+    authz_versions._versions.clear()
+    user_cache.clear()
+    assert client.get("/auth/me", headers=admin.headers).status_code == 200
+    assert len(user_cache) == 1
+    
+    authz_versions._versions.clear()
+    hits = user_cache.hits
+    assert client.get("/auth/me", headers=admin.headers).status_code == 200
+    assert user_cache.hits == hits + 1
@@ -102,8 +102,19 @@ export const authApi = {
 // Team API
 export const teamApi = {
   async getMembers(teamId: number): Promise<any> {
-    const response = await apiClient.get(`/team/members-with-invitations?team_id=${teamId}`);
-    return response.data;
+    // The listing is paginated; follow next_cursor and merge the pages
+    let data: any = null;
+    let cursor: string | null = null;
+    do {
+      const response: AxiosResponse<any> = await apiClient.get('/team/members-with-invitations', {
+        params: { team_id: teamId, limit: 200, ...(cursor ? { cursor } : {}) }
+      });
+      data = data
+        ? { ...response.data, members_and_invitations: [...data.members_and_invitations, ...response.data.members_and_invitations] }
+        : response.data;
+      cursor = response.data.next_cursor;
+    } while (cursor);
+    return data;
   },
 
   async inviteMember(inviteData: InviteRequest): Promise<Invitation> {